@@ -1,6 +1,6 @@
 # backend/app/api/v1/api.py
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, users, configurations, signals, trades, dashboard, websockets
+from app.api.v1.endpoints import auth, users, configurations, signals, trades, dashboard, websockets, metrics
 
 api_router = APIRouter()
 
@@ -19,4 +19,7 @@ api_router.include_router(trades.router, prefix="/trades", tags=["Trades"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
 
 # --- Rute Baru untuk Tahap Ini ---
-api_router.include_router(websockets.router, prefix="/ws", tags=["WebSockets"])
\ No newline at end of file
+api_router.include_router(websockets.router, prefix="/ws", tags=["WebSockets"])
+
+# --- Metrik request Binance ---
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
@@ -5,7 +5,7 @@ from app.db.models import User, Trade
 from app.schemas.dashboard import DashboardSummary
 from app.core.security import decrypt_data
 from app.core.account import AdaptedAccountManager
-from app.binance.client import BinanceClient
+from app.binance.async_client import AsyncBinanceClient
 
 router = APIRouter()
 
@@ -67,9 +67,9 @@ async def get_dashboard_summary(current_user: User = Depends(get_current_user)):
         try:
             api_key = decrypt_data(current_user.binance_api_key_encrypted)
             api_secret = decrypt_data(current_user.binance_api_secret_encrypted)
-            client = BinanceClient(api_key, api_secret)
+            client = AsyncBinanceClient(api_key, api_secret)
             manager = AdaptedAccountManager(client)
-            portfolio_summary = manager.get_account_summary()
+            portfolio_summary = await manager.get_account_summary()
             if portfolio_summary:
                 portfolio_value = portfolio_summary.get('total_balance_usdt')
         except Exception as e:
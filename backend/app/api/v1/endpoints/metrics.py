@@ -0,0 +1,23 @@
+# backend/app/api/v1/endpoints/metrics.py
+from typing import Dict, Any
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from app.api.dependencies import get_current_user
+from app.db.models import User
+from app.binance.metrics import get_metrics_registry
+
+router = APIRouter()
+
+@router.get("", response_class=PlainTextResponse)
+async def get_binance_metrics_prometheus():
+    """
+    Metrik request Binance (latensi, status, retry, bobot) dalam format Prometheus.
+    Hanya berisi agregat per endpoint, tanpa data pengguna.
+    """
+    return PlainTextResponse(get_metrics_registry().to_prometheus(), media_type="text/plain; version=0.0.4")
+
+@router.get("/summary")
+async def get_binance_metrics_summary(current_user: User = Depends(get_current_user)) -> Dict[str, Any]:
+    """Ringkasan metrik request Binance per endpoint dalam JSON."""
+    registry = get_metrics_registry()
+    return {"since": registry.started_at, "endpoints": registry.snapshot()}
@@ -1,5 +1,7 @@
 # backend/app/api/v1/endpoints/trades.py
 import asyncio
+from datetime import datetime
+from beanie.odm.operators.update.general import Set
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from typing import List
 
@@ -8,7 +10,7 @@ from app.core.tasks import monitor_signal_for_entry, running_tasks
 from app.db.models import User, NewSignal, Trade
 from app.schemas.trade import TradeActivate, TradeOut
 from app.core.security import decrypt_data
-from app.binance.client import BinanceClient
+from app.binance.async_client import AsyncBinanceClient
 
 router = APIRouter()
 
@@ -82,30 +84,26 @@ async def close_trade_manually(
 
     api_key = decrypt_data(current_user.binance_api_key_encrypted)
     api_secret = decrypt_data(current_user.binance_api_secret_encrypted)
-    client = BinanceClient(api_key, api_secret)
+    client = AsyncBinanceClient(api_key, api_secret)
 
     order_list_id = trade.sell_order_details.get("orderListId", -1)
     
-    # 1. Batalkan OCO order yang ada
-    print(f"Membatalkan OCO {order_list_id} untuk {trade.symbol}...")
-    client.cancel_oco_order(symbol=trade.symbol, order_list_id=order_list_id)
-    await asyncio.sleep(1) # Jeda singkat
-
-    # 2. Lakukan Market Sell
-    print(f"Melakukan market sell untuk {trade.quantity} {trade.symbol}...")
-    sell_result = client.place_market_sell_order(symbol=trade.symbol, quantity=trade.quantity)
-    if not sell_result or sell_result.get('status') != 'FILLED':
+    # 1 & 2. Batalkan OCO lalu langsung Market Sell (tanpa jeda)
+    print(f"Menutup {trade.quantity} {trade.symbol}: membatalkan OCO {order_list_id} lalu market sell...")
+    close_result = await client.replace_oco(symbol=trade.symbol, order_list_id=order_list_id, quantity=trade.quantity)
+    sell_fill = close_result.get("order")
+    if not sell_fill or not sell_fill.is_filled:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to execute market sell on Binance.")
 
     # 3. Hitung biaya dan P/L, lalu update DB
-    exit_price = float(sell_result['cummulativeQuoteQty']) / float(sell_result['executedQty'])
-    sell_fee = sum(float(f['commission']) for f in sell_result.get('fills', []))
+    exit_price = sell_fill.avg_price
+    sell_fee = sum(sell_fill.fees.values())
     net_pl = (exit_price - trade.entry_price) * trade.quantity - (trade.buy_fee + sell_fee)
     
     update_data = {
         "status": "CLOSED_MANUAL",
         "exit_price": exit_price,
-        "sell_order_details": sell_result,
+        "sell_order_details": sell_fill.raw,
         "sell_fee": sell_fee,
         "net_profit_loss": net_pl,
         "closed_at": datetime.utcnow()
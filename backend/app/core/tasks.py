@@ -7,7 +7,7 @@ from datetime import datetime
 from app.core.trader import AdaptedTradingStrategy, AdaptedTrader
 from app.core.security import decrypt_data
 from app.db.models import User, NewSignal, Trade, UserConfiguration
-from app.binance.client import BinanceClient
+from app.binance.async_client import AsyncBinanceClient
 from app.core.websockets import manager # <-- Import manager
 
 # Dictionary untuk melacak task yang sedang berjalan untuk mencegah duplikasi
@@ -38,7 +38,7 @@ async def monitor_signal_for_entry(user_id: str, signal_id: str):
         del running_tasks[task_id]
         return
         
-    client = BinanceClient(api_key, api_secret)
+    client = AsyncBinanceClient(api_key, api_secret)
     strategy = AdaptedTradingStrategy(client)
     trader = AdaptedTrader(client, config.usdt_per_trade)
 
@@ -48,12 +48,12 @@ async def monitor_signal_for_entry(user_id: str, signal_id: str):
             print(f"Task {task_id} dihentikan secara eksternal.")
             break
             
-        is_valid, reason = strategy.evaluate_signal_for_entry(signal)
+        is_valid, reason = await strategy.evaluate_signal_for_entry(signal)
         print(f"[Task: {task_id}] Evaluasi: {is_valid}, Alasan: {reason}")
         
         if is_valid:
             print(f"Kondisi masuk untuk {signal.coin_pair} terpenuhi. Mengeksekusi trade...")
-            execution_result = trader.execute_trade(signal)
+            execution_result = await trader.execute_trade(signal)
             
             if execution_result.get("status") == "SUCCESS":
                 print(f"Trade untuk {signal.coin_pair} berhasil dieksekusi.")
@@ -122,19 +122,19 @@ async def periodic_check_open_trades():
 
                 api_key = decrypt_data(user.binance_api_key_encrypted)
                 api_secret = decrypt_data(user.binance_api_secret_encrypted)
-                client = BinanceClient(api_key, api_secret)
+                client = AsyncBinanceClient(api_key, api_secret)
 
                 order_list_id = trade.sell_order_details.get("orderListId", -1)
                 
                 # Cek status order OCO
-                order_status = client._send_request("GET", "/orderList", {"orderListId": order_list_id}, signed=True)
+                order_status = await client.get_order_list(order_list_id)
                 
                 # Jika order sudah tidak ada (tereksekusi atau dibatalkan)
                 if not order_status or order_status.get('listStatusType') in ['DONE', 'ALL_DONE']:
                     print(f"Trade {trade.symbol} untuk user {user.email} terdeteksi tertutup.")
                     
                     # Dapatkan detail trade penjualan dari riwayat
-                    sell_trade_details = client._send_request("GET", "/myTrades", {"symbol": trade.symbol, "limit": 10}, signed=True)
+                    sell_trade_details = await client.get_my_trades(trade.symbol, limit=10)
                     
                     if sell_trade_details:
                         # Cari trade penjualan terakhir yang relevan
@@ -1,17 +1,16 @@
 # backend/app/core/trader.py
-import time
 from typing import Dict, Any, Tuple
-from app.binance.client import BinanceClient
+from app.binance.async_client import AsyncBinanceClient
 from app.db.models import NewSignal
 
 class AdaptedTradingStrategy:
     """
     Mengadaptasi strategi dari bot orisinal untuk digunakan dalam API.
     """
-    def __init__(self, binance_client: BinanceClient):
+    def __init__(self, binance_client: AsyncBinanceClient):
         self.client = binance_client
 
-    def evaluate_signal_for_entry(self, signal: NewSignal) -> Tuple[bool, str]:
+    async def evaluate_signal_for_entry(self, signal: NewSignal) -> Tuple[bool, str]:
         """
         Mengevaluasi apakah kondisi untuk masuk pasar terpenuhi.
         Mengembalikan (True, "Alasan") jika valid, (False, "Alasan") jika tidak.
@@ -22,7 +21,7 @@ class AdaptedTradingStrategy:
         if not coin_pair or entry_price is None:
             return (False, "Sinyal tidak memiliki coin_pair atau entry_price.")
 
-        current_price = self.client.get_current_price(coin_pair)
+        current_price = await self.client.get_current_price(coin_pair)
         if current_price is None:
             return (False, f"Gagal mendapatkan harga terkini untuk {coin_pair}.")
 
@@ -44,11 +43,11 @@ class AdaptedTrader:
     """
     Mengadaptasi logika eksekusi trade.
     """
-    def __init__(self, client: BinanceClient, usdt_per_trade: float):
+    def __init__(self, client: AsyncBinanceClient, usdt_per_trade: float):
         self.client = client
         self.usdt_per_trade = usdt_per_trade
 
-    def execute_trade(self, signal: NewSignal) -> Dict[str, Any]:
+    async def execute_trade(self, signal: NewSignal) -> Dict[str, Any]:
         """
         Mengeksekusi pembelian dan menempatkan order OCO.
         Mengembalikan dictionary yang berisi hasil eksekusi.
@@ -57,28 +56,19 @@ class AdaptedTrader:
         base_asset = coin_pair.replace("USDT", "")
 
         print(f"Memulai proses pembelian untuk {coin_pair}...")
-        buy_order = self.client.place_market_buy_order(symbol=coin_pair, quote_order_qty=self.usdt_per_trade)
+        fill = await self.client.place_market_buy_order(symbol=coin_pair, quote_order_qty=self.usdt_per_trade)
         
-        if not buy_order or buy_order.get('status') != 'FILLED':
-            return {"status": "FAIL", "reason": "Market buy order gagal dieksekusi.", "details": buy_order}
+        if not fill or not fill.is_filled:
+            return {"status": "FAIL", "reason": "Market buy order gagal dieksekusi.", "details": fill.raw if fill else None}
 
-        # Ekstrak detail dari order yang terisi
-        initial_filled_qty = float(buy_order['executedQty'])
-        avg_price = float(buy_order['cummulativeQuoteQty']) / initial_filled_qty
+        # Detail fill sudah dinormalisasi oleh klien (respons FULL)
+        buy_order = fill.raw
+        fee_asset = next(iter(fill.fees), '')
+        buy_fee = fill.fee_in(fee_asset)
         
-        # Hitung biaya dari 'fills'
-        buy_fee = 0.0
-        fee_asset = ''
-        if 'fills' in buy_order and buy_order['fills']:
-            for fill in buy_order['fills']:
-                buy_fee += float(fill['commission'])
-            fee_asset = buy_order['fills'][0]['commissionAsset']
-        
-        print(f"Berhasil membeli {initial_filled_qty:.6f} {base_asset} @ ~${avg_price:.4f}")
+        print(f"Berhasil membeli {fill.executed_qty:.6f} {base_asset} @ ~${fill.avg_price:.4f}")
         print(f"Total Biaya Pembelian: {buy_fee} {fee_asset}")
 
-        time.sleep(2) # Beri waktu agar balance di Binance terupdate
-
         try:
             tp_price = signal.targets[3]['price']  # Gunakan TP4 sebagai target akhir
             sl_price = signal.stop_losses[0]['price']
@@ -86,9 +76,9 @@ class AdaptedTrader:
             return {"status": "CRITICAL_FAIL", "reason": "Data TP4 atau SL1 tidak ditemukan pada sinyal.", "buy_order": buy_order}
             
         print(f"Menempatkan OCO Order: TP=${tp_price}, SL=${sl_price}")
-        oco_order = self.client.place_oco_sell_order(
+        oco_order = await self.client.place_oco_sell_order(
             symbol=coin_pair,
-            quantity=initial_filled_qty, # Gunakan kuantitas yang sudah dibeli
+            quantity=fill.net_qty, # Kuantitas bersih setelah komisi aset dasar
             take_profit_price=tp_price,
             stop_loss_price=sl_price
         )
@@ -103,6 +93,6 @@ class AdaptedTrader:
             "oco_order": oco_order,
             "buy_fee": buy_fee,
             "fee_asset": fee_asset,
-            "entry_price": avg_price,
-            "quantity": initial_filled_qty,
+            "entry_price": fill.avg_price,
+            "quantity": fill.net_qty,
         }
\ No newline at end of file
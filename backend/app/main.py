@@ -11,6 +11,8 @@ from app.core.config import settings
 from app.core.tasks import periodic_check_open_trades
 from app.core.automation import run_user_autotrade_cycle # <-- Import
 from app.db.models import UserConfiguration # <-- Import
+from app.binance.async_client import AsyncBinanceClient
+from app.binance.price_cache import get_price_cache
 
 
 last_run_timestamps: dict[str, datetime] = {}
@@ -59,9 +61,16 @@ async def lifespan(app: FastAPI):
     # --- BARU: Jalankan Master Scheduler ---
     print("Starting master autotrade scheduler...")
     asyncio.create_task(master_autotrade_scheduler())
+    # --- BARU: Stream harga bersama untuk semua task pengguna ---
+    print("Starting shared price stream...")
+    price_cache = get_price_cache()
+    price_stream_task = asyncio.create_task(price_cache.run())
     yield
     # Logika yang dieksekusi saat shutdown
     print("Shutting down...")
+    price_cache.stop()
+    price_stream_task.cancel()
+    await AsyncBinanceClient.close_shared_session()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -0,0 +1,110 @@
+# Auto Trade Bot/benchmarks/bench_models.py
+"""
+Benchmark model data (telegram/models.py & binance/models.py): membandingkan
+dataclass biasa + `dataclasses.asdict` (cara lama) dengan model slotted +
+`to_dict`/`from_dict` hasil binance/codec.py, memakai korpus di
+benchmarks/message_corpus.py.
+
+Jalankan dari folder tg-auto-trader:
+    python -m benchmarks.bench_models --messages 20000
+"""
+import json
+import argparse
+import dataclasses
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from telegram.parser import TelegramMessageParser
+from telegram.models import TargetInfo, StopLossInfo
+from benchmarks.message_corpus import build_corpus
+
+# Model yang berisi daftar model lain (field -> kelas item)
+NESTED_FIELDS = {"targets": TargetInfo, "stop_losses": StopLossInfo, "targets_hit": TargetInfo, "stop_losses_triggered": StopLossInfo}
+
+
+def legacy_class(cls) -> type:
+    """Dataclass biasa (tanpa slots) dengan field yang sama, seperti model sebelum codec."""
+    specs = []
+    for f in dataclasses.fields(cls):
+        default = {} if f.default is dataclasses.MISSING else {"default": f.default}
+        if f.default_factory is not dataclasses.MISSING:
+            default = {"default_factory": f.default_factory}
+        specs.append((f.name, f.type, dataclasses.field(**default)))
+    return dataclasses.make_dataclass(f"Legacy{cls.__name__}", specs)
+
+
+def legacy_to_dict(message) -> Dict[str, Any]:
+    """BaseMessage.to_dict lama."""
+    d = dataclasses.asdict(message)
+    d['timestamp'] = message.timestamp.isoformat()
+    return d
+
+
+def build_legacy(cls: type, data: Dict[str, Any], legacy_classes: Dict[type, type]):
+    """Objek dataclass biasa dari dict yang sama dengan yang dipakai from_dict."""
+    kwargs = {f.name: data[f.name] for f in dataclasses.fields(cls) if f.init and f.name in data}
+    kwargs['timestamp'] = datetime.fromisoformat(kwargs['timestamp'])
+    for name, item_cls in NESTED_FIELDS.items():
+        if isinstance(kwargs.get(name), list):
+            kwargs[name] = [legacy_classes[item_cls](**item) for item in kwargs[name]]
+    return legacy_classes[cls](**kwargs)
+
+
+def measure(label: str, func: Callable[[], List[Any]], count: int, repeat: int) -> Tuple[float, int, int]:
+    """Waktu terbaik dari `repeat` kali, serta blok & byte yang ditahan oleh hasilnya (tracemalloc)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    result = func()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    stats = snapshot.statistics("filename")
+    blocks = sum(stat.count for stat in stats)
+    size = sum(stat.size for stat in stats)
+    del result
+    print(f"  {label:<34} {count / best:10.0f} model/detik   {blocks / count:6.1f} blok/model   {size / count:7.0f} byte/model")
+    return best, blocks, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark serialisasi model data.")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = [TelegramMessageParser().parse_message(message) for message in build_corpus(args.messages)]
+    count = len(messages)
+    model_classes = {type(message) for message in messages} | {TargetInfo, StopLossInfo}
+    legacy_classes = {cls: legacy_class(cls) for cls in model_classes}
+    dicts = [message.to_dict() for message in messages]
+
+    differences = sum(legacy_to_dict(message) != encoded for message, encoded in zip(messages, dicts))
+    roundtrip_errors = sum(type(message).from_dict(encoded) != message for message, encoded in zip(messages, dicts))
+
+    print(f"Korpus: {count} pesan ({', '.join(sorted(cls.__name__ for cls in model_classes))})\n")
+    print("Decode dict -> objek model (hasil yang ditahan di memori):")
+    measure("dataclass biasa", lambda: [build_legacy(type(message), encoded, legacy_classes) for message, encoded in zip(messages, dicts)], count, args.repeat)
+    measure("model slotted (from_dict)", lambda: [type(message).from_dict(encoded) for message, encoded in zip(messages, dicts)], count, args.repeat)
+
+    print("\nEncode ke dict (dokumen MongoDB/BSON):")
+    legacy_time, _, _ = measure("asdict (lama)", lambda: [legacy_to_dict(message) for message in messages], count, args.repeat)
+    current_time, _, _ = measure("to_dict (codec)", lambda: [message.to_dict() for message in messages], count, args.repeat)
+
+    print("\nEncode ke JSON:")
+    legacy_json, _, _ = measure("asdict + json indent=4 (lama)", lambda: [json.dumps(legacy_to_dict(m), indent=4, ensure_ascii=False) for m in messages], count, args.repeat)
+    current_json, _, _ = measure("to_dict + json ringkas (journal)", lambda: [json.dumps(m.to_dict(), ensure_ascii=False, separators=(',', ':')) for m in messages], count, args.repeat)
+
+    print(f"\nPercepatan to_dict      : {legacy_time / current_time:.2f}x")
+    print(f"Percepatan encode JSON  : {legacy_json / current_json:.2f}x")
+    print(f"Hasil to_dict berbeda dari asdict: {differences}")
+    print(f"Round-trip from_dict(to_dict()) tidak sama: {roundtrip_errors}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# Auto Trade Bot/benchmarks/bench_quantizer.py
+"""
+Micro-benchmark pembulatan harga & kuantitas OCO.
+Membandingkan jalur baseline place_oco_sell_order (scan linear
+exchange_info['symbols'] lewat get_symbol_info, dict filter, lalu
+_format_value dengan math.log/floor per nilai) dengan SymbolQuantizer yang
+dibangun sekali per simbol dan diindeks oleh ExchangeInfoStore.
+
+Exchange info diisi simbol pengisi agar ukurannya mendekati /exchangeInfo
+spot Binance (--filler-symbols). Waktu dilaporkan sebagai median dari
+beberapa ronde (kedua jalur diukur bergantian per ronde). Pembulatan saja
+(tanpa lookup simbol) juga dilaporkan terpisah: Decimal lebih lambat dari
+math.floor, keuntungannya adalah hasil yang tepat.
+
+Jalankan dari folder tg-auto-trader:
+    python -m benchmarks.bench_quantizer
+"""
+import math
+import random
+import timeit
+import argparse
+import statistics
+from binance.exchange_info import ExchangeInfoStore
+
+SYMBOL_INFOS = [
+    {"symbol": "BTCUSDT", "status": "TRADING", "baseAsset": "BTC", "quoteAsset": "USDT", "filters": [
+        {"filterType": "PRICE_FILTER", "minPrice": "0.01000000", "maxPrice": "1000000.00000000", "tickSize": "0.01000000"},
+        {"filterType": "LOT_SIZE", "minQty": "0.00001000", "maxQty": "9000.00000000", "stepSize": "0.00001000"},
+        {"filterType": "NOTIONAL", "minNotional": "5.00000000", "maxNotional": "9000000.00000000", "applyMinToMarket": True}]},
+    {"symbol": "PEPEUSDT", "status": "TRADING", "baseAsset": "PEPE", "quoteAsset": "USDT", "filters": [
+        {"filterType": "PRICE_FILTER", "minPrice": "0.00000001", "maxPrice": "1.00000000", "tickSize": "0.00000001"},
+        {"filterType": "LOT_SIZE", "minQty": "1.00000000", "maxQty": "92141578.00000000", "stepSize": "1.00000000"},
+        {"filterType": "NOTIONAL", "minNotional": "1.00000000", "applyMinToMarket": True}]},
+    {"symbol": "SHIBUSDT", "status": "TRADING", "baseAsset": "SHIB", "quoteAsset": "USDT", "filters": [
+        {"filterType": "PRICE_FILTER", "minPrice": "0.00000001", "maxPrice": "1.00000000", "tickSize": "0.00000001"},
+        {"filterType": "LOT_SIZE", "minQty": "1.00000000", "maxQty": "46116860414.00000000", "stepSize": "1.00000000"},
+        {"filterType": "MIN_NOTIONAL", "minNotional": "5.00000000", "applyToMarket": True}]},
+]
+
+
+def legacy_format_value(value, step_size_str: str):
+    """Salinan BinanceClient._format_value sebelum SymbolQuantizer."""
+    step_size = float(step_size_str)
+    if step_size == 1.0:
+        return str(int(float(value)))
+    precision = abs(int(round(math.log(step_size, 10), 0)))
+    factor = 10 ** precision
+    floored_value = math.floor(float(value) * factor) / factor
+    return f"{floored_value:.{precision}f}"
+
+
+def legacy_get_symbol_info(exchange_info, symbol):
+    """Salinan BinanceClient.get_symbol_info sebelum ExchangeInfoStore: scan linear."""
+    for symbol_info in exchange_info['symbols']:
+        if symbol_info['symbol'] == symbol:
+            return symbol_info
+    return None
+
+
+def legacy_oco_params(exchange_info, symbol, quantity, tp_price, sl_price):
+    """Pembulatan di place_oco_sell_order baseline."""
+    symbol_info = legacy_get_symbol_info(exchange_info, symbol)
+    filters = {f['filterType']: f for f in symbol_info['filters']}
+    tick_size = filters['PRICE_FILTER']['tickSize']
+    return (
+        legacy_format_value(float(quantity), filters['LOT_SIZE']['stepSize']),
+        legacy_format_value(tp_price, tick_size),
+        legacy_format_value(sl_price, tick_size),
+        legacy_format_value(sl_price * 0.995, tick_size),
+    )
+
+
+def legacy_format_only(filters, quantity, tp_price, sl_price):
+    tick_size = filters['PRICE_FILTER']['tickSize']
+    return (
+        legacy_format_value(float(quantity), filters['LOT_SIZE']['stepSize']),
+        legacy_format_value(tp_price, tick_size),
+        legacy_format_value(sl_price, tick_size),
+        legacy_format_value(sl_price * 0.995, tick_size),
+    )
+
+
+def quantizer_oco_params(store, symbol, quantity, tp_price, sl_price):
+    """Jalur baru seperti di place_oco_sell_order, termasuk validasi kedua kaki."""
+    quantizer = store.get_quantizer(symbol)
+    sl_limit_price = sl_price * 0.995
+    quantizer.validate(quantity, tp_price)
+    quantizer.validate(quantity, sl_limit_price)
+    return (
+        quantizer.format_qty(quantity),
+        quantizer.format_price(tp_price),
+        quantizer.format_price(sl_price),
+        quantizer.format_price(sl_limit_price),
+    )
+
+
+def filler_symbol(index: int):
+    return {"symbol": f"FILL{index}USDT", "status": "TRADING", "baseAsset": f"FILL{index}", "quoteAsset": "USDT", "filters": [
+        {"filterType": "PRICE_FILTER", "minPrice": "0.00010000", "maxPrice": "1000.00000000", "tickSize": "0.00010000"},
+        {"filterType": "LOT_SIZE", "minQty": "0.10000000", "maxQty": "900000.00000000", "stepSize": "0.10000000"},
+        {"filterType": "NOTIONAL", "minNotional": "5.00000000", "applyMinToMarket": True}]}
+
+
+def time_pair(run_a, run_b, number: int, rounds: int):
+    """Median waktu (a, b) dan median rasio a/b dari `rounds` ronde bergantian."""
+    times_a, times_b, ratios = [], [], []
+    for _ in range(rounds):
+        a = min(timeit.repeat(run_a, number=number, repeat=3))
+        b = min(timeit.repeat(run_b, number=number, repeat=3))
+        times_a.append(a)
+        times_b.append(b)
+        ratios.append(a / b)
+    return statistics.median(times_a), statistics.median(times_b), ratios
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pembulatan OCO.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--filler-symbols", type=int, default=2500, help="Jumlah simbol tambahan di exchange info.")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    symbols = [filler_symbol(i) for i in range(args.filler_symbols)]
+    for info in SYMBOL_INFOS:
+        symbols.insert(rng.randrange(len(symbols) + 1), info)
+    exchange_info = {"symbols": symbols}
+    store = ExchangeInfoStore(snapshot_path=None)
+    store._apply_exchange_info(exchange_info)
+    filters_by_symbol = {s['symbol']: {f['filterType']: f for f in s['filters']} for s in SYMBOL_INFOS}
+
+    cases = []
+    for _ in range(1000):
+        info = rng.choice(SYMBOL_INFOS)
+        base = 65000.0 if info['symbol'] == 'BTCUSDT' else 0.00001234
+        qty = 0.00153 if info['symbol'] == 'BTCUSDT' else 812345.0
+        cases.append((info['symbol'], qty * rng.uniform(0.5, 2), base * rng.uniform(1.01, 1.2), base * rng.uniform(0.8, 0.99)))
+
+    def run_legacy():
+        for case in cases:
+            legacy_oco_params(exchange_info, *case)
+
+    def run_quantizer():
+        for case in cases:
+            quantizer_oco_params(store, *case)
+
+    def run_legacy_format():
+        for symbol, qty, tp, sl in cases:
+            legacy_format_only(filters_by_symbol[symbol], qty, tp, sl)
+
+    def run_quantizer_format():
+        for symbol, qty, tp, sl in cases:
+            quantizer = store.get_quantizer(symbol)
+            quantizer.format_qty(qty), quantizer.format_price(tp), quantizer.format_price(sl), quantizer.format_price(sl * 0.995)
+
+    number = max(1, args.iterations // len(cases))
+    calls = number * len(cases)
+    legacy_time, quantizer_time, ratios = time_pair(run_legacy, run_quantizer, number, args.rounds)
+    legacy_format_time, quantizer_format_time, format_ratios = time_pair(run_legacy_format, run_quantizer_format, number, args.rounds)
+
+    # Kasus di mana float * faktor + math.floor membulatkan salah (mis. 0.57 * 100 = 56.99999)
+    mismatches = sum(legacy_oco_params(exchange_info, *case) != quantizer_oco_params(store, *case) for case in cases)
+
+    print(f"Exchange info: {len(symbols)} simbol | median {args.rounds} ronde")
+    print("Per OCO (lookup simbol + pembulatan + validasi):")
+    print(f"  Baseline        : {legacy_time / calls * 1e6:8.2f} us")
+    print(f"  SymbolQuantizer : {quantizer_time / calls * 1e6:8.2f} us")
+    print(f"  Percepatan      : median {statistics.median(ratios):.2f}x (rentang {min(ratios):.2f}x - {max(ratios):.2f}x)")
+    print("Pembulatan saja (filter sudah tersedia):")
+    print(f"  _format_value   : {legacy_format_time / calls * 1e6:8.2f} us")
+    print(f"  SymbolQuantizer : {quantizer_format_time / calls * 1e6:8.2f} us")
+    print(f"  Rasio           : median {statistics.median(format_ratios):.2f}x (rentang {min(format_ratios):.2f}x - {max(format_ratios):.2f}x)")
+    print(f"Hasil berbeda   : {mismatches} dari {len(cases)} kasus")
+    print(f"Contoh 0.57 (tick 0.01): lama={legacy_format_value(0.57, '0.01000000')} baru={store.get_quantizer('BTCUSDT').format_price(0.57)}")
+
+
+if __name__ == "__main__":
+    main()
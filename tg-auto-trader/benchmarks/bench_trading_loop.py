@@ -0,0 +1,206 @@
+# Auto Trade Bot/benchmarks/bench_trading_loop.py
+"""
+Benchmark end-to-end decide -> execute -> manage terhadap simulator Binance
+lokal (binance/simulator.py), tanpa uang & jaringan asli. Tahap fetch
+(Telegram + MongoDB) digantikan oleh sinyal sintetis yang sudah ter-parse;
+tahap manage menjalankan _manage_open_positions yang sama dengan
+run_manage_positions_routine, dengan MongoDB diganti penyimpan sinyal di memori.
+Setelahnya AdaptedTrader milik backend dijalankan terhadap simulator baru
+(dilewati jika dependensi backend belum terpasang).
+
+Jalankan dari folder tg-auto-trader:
+    python -m benchmarks.bench_trading_loop --symbols 5 --cycles 10 --latency 0.02
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Any
+
+import config
+from binance.client import BinanceClient
+from binance.async_client import AsyncBinanceClient
+from binance.execution import ExecutionContext
+from binance.strategy import TradingStrategy
+from binance.trader import Trader
+from binance.exchange_info import ExchangeInfoStore
+from binance.price_cache import PriceCache
+from binance.rate_limiter import RateLimiter
+from binance.simulator import SimulatedExchange, SimulatorServer, PricePath, make_symbol_info
+from core.routines import _manage_open_positions
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "backend")
+
+
+def build_market(symbol_count: int, cycles: int):
+    """Simbol sintetis: separuh naik melewati TP (memicu trailing), separuh turun ke SL."""
+    start_prices, paths, signals = {}, {}, []
+    for i in range(symbol_count):
+        symbol = f"SIM{i}USDT"
+        start = 10.0 + i
+        start_prices[symbol] = start
+        drift = 0.09 if i % 2 == 0 else -0.07
+        paths[symbol] = [start * (1 + drift * step / max(cycles - 1, 1)) for step in range(cycles)]
+        signals.append({
+            "coin_pair": symbol,
+            "entry_price": round(start * 1.01, 2),
+            "risk_level": "Normal",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "targets": [{"level": level, "price": round(start * (1 + 0.02 * level), 2)} for level in range(1, 5)],
+            "stop_losses": [{"level": 1, "price": round(start * 0.95, 2)}],
+        })
+    infos = [make_symbol_info(symbol, symbol[:-4]) for symbol in start_prices]
+    exchange = SimulatedExchange(infos, {"USDT": 1000.0}, start_prices)
+    return exchange, PricePath(paths), {s['coin_pair']: s for s in signals}
+
+
+class SignalStore:
+    """Pengganti MongoManager untuk tahap manage: hanya get_signals_by_pairs yang dipakai."""
+
+    def __init__(self, signals: Dict[str, Dict[str, Any]]):
+        self.signals = signals
+
+    def get_signals_by_pairs(self, coin_pairs: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {pair: self.signals[pair] for pair in coin_pairs if pair in self.signals}
+
+
+def load_backend_trader():
+    """
+    Mengimpor AdaptedTradingStrategy & AdaptedTrader dari backend/ seperti di container,
+    tempat tg-auto-trader/binance dipasang sebagai app.binance.
+    Mengembalikan None jika dependensi backend (beanie, pydantic, ...) belum terpasang.
+    """
+    import binance
+    sys.path.insert(0, os.path.abspath(BACKEND_DIR))
+    for name, module in list(sys.modules.items()):
+        if name == "binance" or name.startswith("binance."):
+            sys.modules[f"app.{name}"] = module
+    try:
+        from app.core.trader import AdaptedTradingStrategy, AdaptedTrader
+    except ImportError as e:
+        print(f"\nMelewatkan benchmark AdaptedTrader backend: {e}")
+        return None
+    return AdaptedTradingStrategy, AdaptedTrader
+
+
+async def run_backend(args) -> None:
+    """Evaluasi entry + eksekusi AdaptedTrader (klien async) untuk setiap sinyal, terhadap simulator baru."""
+    backend = load_backend_trader()
+    if backend is None:
+        return
+    AdaptedTradingStrategy, AdaptedTrader = backend
+    exchange, _, signals = build_market(args.symbols, args.cycles)
+    timings: List[float] = []
+    trades = 0
+    with SimulatorServer(exchange, latency=args.latency) as server:
+        AsyncBinanceClient.BASE_API_URL = server.base_url
+        client = AsyncBinanceClient(
+            "sim-key", "sim-secret",
+            exchange_info_store=ExchangeInfoStore(snapshot_path=None),
+            price_cache=PriceCache(max_age_seconds=0),
+            rate_limiter=RateLimiter(),
+        )
+        strategy = AdaptedTradingStrategy(client)
+        trader = AdaptedTrader(client, config.USDT_AMOUNT_PER_TRADE)
+        try:
+            for signal in signals.values():
+                # NewSignal backend (Document beanie) dibaca lewat atribut; targets/stop_losses berupa dict
+                backend_signal = SimpleNamespace(**signal)
+                start = time.perf_counter()
+                is_valid, _ = await strategy.evaluate_signal_for_entry(backend_signal)
+                if is_valid:
+                    result = await trader.execute_trade(backend_signal)
+                    trades += result.get('status') == 'SUCCESS'
+                timings.append(time.perf_counter() - start)
+        finally:
+            await AsyncBinanceClient.close_shared_session()
+        request_count = server.request_count
+
+    print(f"\n=== AdaptedTrader backend ({len(signals)} sinyal) ===")
+    print(f"per sinyal rata-rata {statistics.mean(timings) * 1000:8.1f} ms | p95 {percentile(timings, 0.95) * 1000:8.1f} ms")
+    print(f"Trade tereksekusi: {trades} | Request: {request_count}")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+
+async def run(args):
+    # Tahap manage memakai pengaturan yang sama dengan produksi; trailing & cek posisi macet dinyalakan
+    config.TRAILING_ENABLED = True
+    config.STUCK_TRADE_ENABLED = True
+    config.STUCK_TRADE_DURATION_HOURS = args.stuck_hours
+
+    exchange, price_path, signals = build_market(args.symbols, args.cycles)
+    timings: Dict[str, List[float]] = {"decide": [], "execute": [], "manage": [], "cycle": []}
+    trades = trailing_moves = stuck_closed = 0
+
+    with SimulatorServer(exchange, latency=args.latency) as server:
+        BinanceClient.BASE_API_URL = AsyncBinanceClient.BASE_API_URL = server.base_url
+        client = BinanceClient(
+            "sim-key", "sim-secret",
+            exchange_info_store=ExchangeInfoStore(snapshot_path=None),
+            price_cache=PriceCache(max_age_seconds=0),
+            rate_limiter=RateLimiter(),
+        )
+        strategy = TradingStrategy(client)
+        trader = Trader(client, config.USDT_AMOUNT_PER_TRADE)
+        signal_store = SignalStore(signals)
+
+        # Seperti pipeline asli, sinyal yang sudah dieksekusi tidak diputuskan ulang
+        pending = dict(signals)
+        for _ in range(args.cycles):
+            cycle_start = time.perf_counter()
+
+            start = time.perf_counter()
+            decisions = strategy.evaluate_new_signals(list(pending.values()))
+            timings["decide"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            buy_decisions = [d for d in decisions if d.decision == "BUY"]
+            context = ExecutionContext.load(client) if buy_decisions else None
+            if context:
+                for decision in buy_decisions:
+                    result = trader.execute_trade(decision, context)
+                    pending.pop(decision.coin_pair, None)
+                    trades += result.get('status') == 'SUCCESS'
+            timings["execute"].append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            results = await _manage_open_positions(client, signal_store, config.MANAGE_MAX_WORKERS)
+            trailing_moves += sum(outcome == "TRAILED" for _, _, outcome, _ in results)
+            stuck_closed += sum(outcome == "STUCK_CLOSED" for _, _, outcome, _ in results)
+            timings["manage"].append(time.perf_counter() - start)
+
+            timings["cycle"].append(time.perf_counter() - cycle_start)
+            exchange.apply_prices(price_path.step())
+
+        request_count = server.request_count
+
+    total = sum(timings["cycle"])
+    print(f"\n=== Hasil benchmark ({args.symbols} simbol, {args.cycles} siklus, latensi {args.latency * 1000:.0f} ms) ===")
+    for stage, values in timings.items():
+        print(f"{stage:<8} rata-rata {statistics.mean(values) * 1000:8.1f} ms | p95 {percentile(values, 0.95) * 1000:8.1f} ms")
+    print(f"Trade tereksekusi: {trades} | Trailing SL: {trailing_moves} | Posisi macet ditutup: {stuck_closed} | Request: {request_count}")
+    print(f"Throughput: {args.cycles / total:.2f} siklus/detik ({request_count / total:.1f} request/detik)")
+
+    await run_backend(args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loop trading terhadap simulator Binance lokal.")
+    parser.add_argument("--symbols", type=int, default=5)
+    parser.add_argument("--cycles", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.02, help="Latensi simulasi per request (detik).")
+    parser.add_argument("--stuck-hours", type=float, default=config.STUCK_TRADE_DURATION_HOURS, help="Batas usia posisi macet untuk tahap manage.")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# Auto Trade Bot/benchmarks/check_streams.py
+"""
+Pemeriksaan otomatis consumer WebSocket terhadap server replay lokal
+(binance/replay.py), tanpa koneksi ke Binance:
+- PriceCache: harga simbol yang tidak berubah tetap valid selama stream aktif,
+  menjadi basi saat stream diam, lalu klien fallback ke REST
+  (simulator lokal) dan mengisi ulang cache.
+- UserDataStream: cermin saldo & order diperbarui dari event replay,
+  wait_for_balance_update mengembalikan saldo dari event setelah `mark()`
+  (atau None saat timeout), dan cermin dibuang saat koneksi putus.
+
+Jalankan dari folder tg-auto-trader (keluar dengan kode 1 jika ada yang gagal):
+    python -m benchmarks.check_streams
+"""
+import sys
+import json
+import time
+import asyncio
+from typing import Callable
+
+from binance.client import BinanceClient
+from binance.exchange_info import ExchangeInfoStore
+from binance.price_cache import PriceCache
+from binance.rate_limiter import RateLimiter
+from binance.replay import ReplayServer
+from binance.user_stream import UserDataStream
+from binance.simulator import SimulatedExchange, SimulatorServer, make_symbol_info
+
+MAX_AGE_SECONDS = 0.5
+FRAME_INTERVAL = 0.1
+
+
+def check(condition: bool, description: str):
+    if not condition:
+        raise AssertionError(description)
+    print(f"  OK  {description}")
+
+
+async def wait_until(predicate: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        await asyncio.sleep(0.01)
+    return predicate()
+
+
+def mini_ticker(prices) -> str:
+    return json.dumps([{"e": "24hrMiniTicker", "E": 0, "s": symbol, "c": str(price)} for symbol, price in prices.items()])
+
+
+async def check_price_cache():
+    print("PriceCache terhadap server replay:")
+    # Frame pertama memuat kedua simbol; selanjutnya hanya BTC yang berubah (seperti mini-ticker asli)
+    frames = [mini_ticker({"BTCUSDT": 100.0, "ETHUSDT": 2000.0})]
+    frames += [mini_ticker({"BTCUSDT": 100.0 + i}) for i in range(1, 21)]
+
+    exchange = SimulatedExchange(
+        [make_symbol_info("BTCUSDT", "BTC"), make_symbol_info("ETHUSDT", "ETH")],
+        {"USDT": 1000.0}, {"BTCUSDT": 150.0, "ETHUSDT": 2500.0},
+    )
+    with SimulatorServer(exchange) as simulator:
+        BinanceClient.BASE_API_URL = simulator.base_url
+        async with ReplayServer(frames, interval=FRAME_INTERVAL) as replay:
+            cache = PriceCache(replay.url, max_age_seconds=MAX_AGE_SECONDS, reconnect_delay=60)
+            client = BinanceClient(exchange_info_store=ExchangeInfoStore(snapshot_path=None), price_cache=cache, rate_limiter=RateLimiter())
+            task = asyncio.create_task(cache.run())
+            try:
+                check(await wait_until(lambda: cache.get_price("ETHUSDT") is not None), "harga dari frame replay masuk ke cache")
+                check(cache.is_streaming, "stream dianggap aktif selama frame terus datang")
+
+                await asyncio.sleep(MAX_AGE_SECONDS + 0.3)
+                check(cache.get_price("ETHUSDT") == 2000.0, "simbol tanpa perubahan tetap valid melewati max_age selama stream aktif")
+                requests_before = simulator.request_count
+                price = await asyncio.to_thread(client.get_current_price, "ETHUSDT")
+                check(price == 2000.0 and simulator.request_count == requests_before, "klien membaca harga dari cache tanpa request REST")
+
+                # Frame habis: koneksi tetap terbuka tetapi diam, sehingga semua harga basi
+                check(await wait_until(lambda: not cache.is_streaming), "stream yang diam melewati max_age tidak lagi dianggap aktif")
+                check(cache.get_price("BTCUSDT") is None and cache.get_price("ETHUSDT") is None, "harga basi saat stream diam")
+                price = await asyncio.to_thread(client.get_current_price, "ETHUSDT")
+                check(price == 2500.0 and simulator.request_count == requests_before + 1, "klien fallback ke REST untuk harga basi")
+                price = await asyncio.to_thread(client.get_current_price, "ETHUSDT")
+                check(price == 2500.0 and simulator.request_count == requests_before + 1, "harga hasil REST disimpan ke cache")
+                prices = await asyncio.to_thread(client.get_prices, ["BTCUSDT", "ETHUSDT"])
+                check(prices == {"BTCUSDT": 150.0, "ETHUSDT": 2500.0} and simulator.request_count == requests_before + 2, "get_prices hanya me-request simbol yang basi")
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+
+async def check_user_stream():
+    print("UserDataStream terhadap server replay:")
+    frames = [
+        {"e": "outboundAccountPosition", "E": 1, "B": [{"a": "USDT", "f": "1000.0", "l": "0.0"}, {"a": "BTC", "f": "0.0", "l": "0.0"}]},
+        {"e": "executionReport", "E": 2, "s": "BTCUSDT", "S": "BUY", "o": "MARKET", "X": "FILLED", "i": 11, "g": -1,
+         "p": "0", "P": "0", "q": "0.5", "z": "0.5", "Z": "50.0", "T": 2},
+        {"e": "outboundAccountPosition", "E": 3, "B": [{"a": "USDT", "f": "950.0", "l": "0.0"}, {"a": "BTC", "f": "0.5", "l": "0.0"}]},
+        {"e": "listStatus", "E": 4, "s": "BTCUSDT", "g": 7, "l": "EXEC_STARTED", "L": "EXECUTING", "T": 4},
+        {"e": "balanceUpdate", "E": 5, "a": "USDT", "d": "25.0", "T": 5},
+    ]
+    # Interval lebih lebar agar mark() bisa diambil sebelum event saldo berikutnya datang
+    replay = await ReplayServer([json.dumps(frame) for frame in frames], interval=FRAME_INTERVAL * 3).start()
+    stream = UserDataStream(None, stream_base_url=replay.url, reconnect_delay=60)
+    task = asyncio.create_task(stream.run())
+    try:
+        check(await wait_until(lambda: stream.is_live), "cermin live setelah event saldo pertama")
+        check(stream.get_free_balance("USDT") == 1000.0, "saldo awal dari outboundAccountPosition")
+        mark = stream.mark()
+        btc_free = await asyncio.to_thread(stream.wait_for_balance_update, "BTC", mark, 2.0)
+        check(btc_free == 0.5, "wait_for_balance_update mengembalikan saldo dari event setelah mark()")
+        check((stream.get_order(11) or {}).get("status") == "FILLED", "status order dari executionReport")
+        usdt_free = await asyncio.to_thread(stream.wait_for_balance_update, "USDT", stream.mark(), 2.0)
+        check(usdt_free == 975.0, "balanceUpdate menambahkan delta ke saldo free")
+        check((stream.get_order_list(7) or {}).get("listOrderStatus") == "EXECUTING", "status OCO dari listStatus")
+        check(await asyncio.to_thread(stream.wait_for_balance_update, "BTC", stream.mark(), 0.3) is None, "wait_for_balance_update mengembalikan None saat timeout")
+        check(stream.account_snapshot()["balances"] == [{"asset": "USDT", "free": 975.0, "locked": 0.0}, {"asset": "BTC", "free": 0.5, "locked": 0.0}],
+              "account_snapshot mengikuti format /account")
+
+        # Server berhenti: event selama terputus tidak akan diterima, jadi cermin harus dibuang
+        await replay.stop()
+        check(await wait_until(lambda: not stream.is_live), "cermin tidak lagi live setelah koneksi putus")
+        check(stream.get_free_balance("USDT") is None and stream.get_order(11) is None, "saldo & order basi dibuang saat koneksi putus")
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        await replay.stop()
+
+
+async def run() -> bool:
+    try:
+        await check_price_cache()
+        await check_user_stream()
+    except AssertionError as e:
+        print(f"  GAGAL  {e}")
+        return False
+    print("Semua pemeriksaan stream berhasil.")
+    return True
+
+
+def main():
+    sys.exit(0 if asyncio.run(run()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# Auto Trade Bot/benchmarks/message_corpus.py
+"""
+Korpus pesan Telegram untuk benchmark parser. Bentuk pesan mengikuti format
+channel sinyal yang dikenali TelegramMessageParser (sinyal baru, pembaruan
+target/stop loss, alert harga, rekap harian, dan pesan bebas), dengan
+proporsi kira-kira seperti isi channel sehari-hari.
+"""
+import random
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+from typing import List
+
+COINS = ["SOL", "PEPE", "WIF", "ARB", "OP", "INJ", "SEI", "TIA", "FET", "RNDR", "BONK", "JUP"]
+
+
+def new_signal(rng: random.Random, coin: str) -> str:
+    entry = round(rng.uniform(0.05, 150), 4)
+    risk = rng.choice(["🟢 Normal", "⚠️ High"])
+    targets = "\n".join(f"Target {level} {entry * (1 + 0.02 * level):.4f} +{2 * level:.2f}%" for level in range(1, 5))
+    stop_losses = "\n".join(f"Stop Loss {level} {entry * (1 - 0.05 * level):.4f} -{5 * level:.2f}%" for level in range(1, 3))
+    return (
+        f"🆕 NEW SIGNAL: {coin}USDT 🆕\n"
+        f"---\n"
+        f"Volume(24H) Ranked: {rng.randint(1, 300)}\n"
+        f"Risk Level: {risk}\n"
+        f"Entry: {entry}\n"
+        f"---\n"
+        f"{targets}\n"
+        f"{stop_losses}\n"
+        f"---\n"
+        f"Social Media: https://x.com/search?q=%24{coin}\n"
+        f"Data Analysis: https://www.tradingview.com/symbols/{coin}USDT/"
+    )
+
+
+def signal_update(rng: random.Random, coin: str) -> str:
+    price = round(rng.uniform(0.05, 150), 4)
+    if rng.random() < 0.75:
+        level = rng.randint(1, 4)
+        return (
+            f"✅ SIGNAL UPDATE: {coin}USDT ✅\n"
+            f"🎯 Target {level} ({price}) HIT!\n"
+            f"Profit: +{2 * level:.2f}%\n"
+            f"Duration: {rng.randint(5, 600)} minutes"
+        )
+    return (
+        f"🔴 SIGNAL UPDATE: {coin}USDT 🔴\n"
+        f"⚠️ Stop Loss 1 ({price}) TRIGGERED!\n"
+        f"Loss: -5.00%"
+    )
+
+
+def malformed_update(rng: random.Random, coin: str) -> str:
+    """Pembaruan dengan akhiran tertukar; parser harus menolaknya seperti pola aslinya."""
+    price = round(rng.uniform(0.05, 150), 4)
+    return (
+        f"✅ SIGNAL UPDATE: {coin}USDT ✅\n"
+        f"🎯 Target {rng.randint(1, 4)} ({price}) TRIGGERED!\n"
+        f"⚠️ Stop Loss 1 ({price}) HIT!"
+    )
+
+
+def market_alert(rng: random.Random, coin: str) -> str:
+    direction = rng.choice(["increased", "decreased"])
+    return (
+        f"⚡⚡⚡ {coin} price {direction} {rng.uniform(3, 15):.2f}% in the last {rng.choice([5, 15, 30])} minutes\n"
+        f"Current price: {rng.uniform(0.05, 150):.4f}"
+    )
+
+
+def new_signal_alert(rng: random.Random, coin: str) -> str:
+    return (
+        f"🆕 NEW SIGNAL 🆕\n"
+        f"❗❗❗ {coin} price amplitude is {rng.uniform(3, 15):.2f}% in the last {rng.choice([5, 15, 30])} minutes"
+    )
+
+
+def daily_recap(rng: random.Random, coin: str) -> str:
+    picks = lambda n: ", ".join(f"{c}USDT" for c in rng.sample(COINS, n))
+    return (
+        f"📊 DAILY RECAP 17/10-18/10 📊\n"
+        f"✅ Hitted target 1: {picks(4)}\n"
+        f"✅ Hitted target 2: {picks(3)}\n"
+        f"✅ Hitted target 3: {picks(2)}\n"
+        f"✅ Hitted target 4: {picks(1)}\n"
+        f"➡️ Running: {picks(3)}\n"
+        f"🛑 Hitted stop loss: {picks(2)}\n"
+        f"Total Signals: 14\n"
+        f"Hitted Take-Profits: 10\n"
+        f"Hitted Stop-Losses: 2"
+    )
+
+
+def chatter(rng: random.Random, coin: str) -> str:
+    return (
+        f"Pasar sedang volatil, {coin} bergerak cepat hari ini. Selalu gunakan stop loss!\n"
+        f"Source: Market Desk"
+    )
+
+
+# (pembuat pesan, bobot)
+MESSAGE_SHAPES = [
+    (new_signal, 30),
+    (signal_update, 40),
+    (malformed_update, 2),
+    (market_alert, 12),
+    (new_signal_alert, 8),
+    (daily_recap, 2),
+    (chatter, 8),
+]
+
+
+def build_corpus(size: int = 1000, seed: int = 7) -> List[SimpleNamespace]:
+    """Objek mirip pesan Telethon (raw_text, date, sender_id, id) untuk diumpankan ke parser."""
+    rng = random.Random(seed)
+    makers, weights = zip(*MESSAGE_SHAPES)
+    now = datetime.now(timezone.utc)
+    return [
+        SimpleNamespace(
+            id=index + 1,
+            sender_id=-1001234567890,
+            date=now - timedelta(seconds=size - index),
+            raw_text=rng.choices(makers, weights)[0](rng, rng.choice(COINS)),
+        )
+        for index in range(size)
+    ]
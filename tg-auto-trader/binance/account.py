@@ -1,65 +1,80 @@
 # Auto Trade Bot/binance/account.py
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from .client import BinanceClient
 
+STABLECOINS = frozenset({'USDT', 'BUSD', 'USDC', 'DAI', 'TUSD'})
+
+# (aset, free, locked) untuk saldo yang tidak nol
+HeldBalance = Tuple[str, float, float]
+
+
+def held_balances(balances: Iterable[Dict[str, Any]]) -> List[HeldBalance]:
+    """Saldo /account (atau cermin user data stream) yang tidak nol, sudah dikonversi ke float."""
+    parsed = ((b['asset'], float(b['free']), float(b['locked'])) for b in balances)
+    return [(asset, free, locked) for asset, free, locked in parsed if free + locked > 0]
+
+
+def price_symbols(held: List[HeldBalance], quote_asset: str = "USDT") -> List[str]:
+    """Simbol yang harganya dibutuhkan untuk menilai saldo: hanya aset non-stablecoin yang dipegang."""
+    return [f"{asset}{quote_asset}" for asset, _, _ in held if asset not in STABLECOINS]
+
+
+def summarize_balances(held: List[HeldBalance], prices: Dict[str, float], quote_asset: str = "USDT") -> Dict[str, Any]:
+    """
+    Ringkasan akun dari saldo yang dipegang dan harga {SIMBOL: harga}.
+    Aset tanpa harga dinilai 0; aset bernilai <= $0.01 tidak dicantumkan.
+    """
+    held_assets = []
+    total_balance_usdt = 0.0
+    for asset, free, locked in held:
+        total_balance = free + locked
+        value = total_balance if asset in STABLECOINS else total_balance * prices.get(f"{asset}{quote_asset}", 0.0)
+        # Hanya tambahkan ke ringkasan jika nilainya signifikan (di atas $0.01)
+        if value > 0.01:
+            held_assets.append({
+                "asset": asset,
+                "total_balance": total_balance,
+                "free_balance": free,
+                "locked_balance": locked,
+                "value_in_usdt": round(value, 2)
+            })
+            total_balance_usdt += value
+
+    # Urutkan aset berdasarkan nilai dari yang terbesar
+    held_assets.sort(key=lambda x: x['value_in_usdt'], reverse=True)
+    return {
+        "total_balance_usdt": round(total_balance_usdt, 2),
+        "held_assets": held_assets
+    }
+
+
 class AccountManager:
     """
     Mengelola fungsionalitas terkait akun Binance.
     """
-    STABLECOINS = {'USDT', 'BUSD', 'USDC', 'DAI', 'TUSD'}
+    STABLECOINS = STABLECOINS
 
     def __init__(self, client: BinanceClient):
         self.client = client
 
-    def get_account_summary(self) -> Optional[Dict[str, Any]]:
+    def get_account_summary(self, account_info: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Menghasilkan ringkasan akun, termasuk aset yang dipegang dan total nilai dalam USDT.
+        `account_info` bisa diisi dari cermin user data stream untuk melewati request /account.
+        Hanya aset yang dipegang yang diberi harga (cache harga stream, lalu satu request batch).
         """
-        print("Mengambil informasi akun dari Binance...")
-        account_info = self.client.get_account_info()
+        if account_info is None:
+            print("Mengambil informasi akun dari Binance...")
+            account_info = self.client.get_account_info()
         if not account_info or 'balances' not in account_info:
             print("Gagal mendapatkan informasi akun atau 'balances' tidak ditemukan.")
             return None
-            
-        print("Mengambil semua harga ticker untuk kalkulasi nilai...")
-        all_tickers = self.client.get_all_tickers()
-        if not all_tickers:
-            print("Gagal mengambil harga ticker. Tidak dapat menghitung total nilai.")
-            return {"held_assets": [], "total_balance_usdt": 0.0, "error": "Gagal mengambil harga ticker."}
-
-        held_assets = []
-        total_balance_usdt = 0.0
-
-        print("Menghitung nilai aset yang dipegang...")
-        for asset in account_info['balances']:
-            asset_name = asset['asset']
-            total_balance = float(asset['free']) + float(asset['locked'])
 
-            if total_balance > 0:
-                asset_value_usdt = 0.0
-                if asset_name in self.STABLECOINS:
-                    asset_value_usdt = total_balance
-                else:
-                    ticker_usdt = f"{asset_name}USDT"
-                    if ticker_usdt in all_tickers:
-                        price_usdt = all_tickers[ticker_usdt]
-                        asset_value_usdt = total_balance * price_usdt
-                
-                # Hanya tambahkan ke ringkasan jika nilainya signifikan (di atas $0.01)
-                if asset_value_usdt > 0.01:
-                    held_assets.append({
-                        "asset": asset_name,
-                        "total_balance": total_balance,
-                        "free_balance": float(asset['free']),
-                        "locked_balance": float(asset['locked']),
-                        "value_in_usdt": round(asset_value_usdt, 2)
-                    })
-                    total_balance_usdt += asset_value_usdt
-        
-        # Urutkan aset berdasarkan nilai dari yang terbesar
-        held_assets.sort(key=lambda x: x['value_in_usdt'], reverse=True)
+        held = held_balances(account_info['balances'])
+        symbols = price_symbols(held)
+        prices = self.client.get_prices(symbols) if symbols else {}
+        unpriced = [symbol for symbol in symbols if symbol not in prices]
+        if unpriced:
+            print(f"Peringatan: harga tidak tersedia untuk {', '.join(unpriced)}. Aset tersebut dinilai $0.")
 
-        return {
-            "total_balance_usdt": round(total_balance_usdt, 2),
-            "held_assets": held_assets
-        }
\ No newline at end of file
+        return summarize_balances(held, prices)
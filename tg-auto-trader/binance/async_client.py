@@ -0,0 +1,316 @@
+# Auto Trade Bot/binance/async_client.py
+import time
+import asyncio
+import json
+import aiohttp
+from typing import Optional, Dict, Any, List, Iterable, Tuple
+from .client import BinanceClient
+from .exchange_info import ExchangeInfoStore, SymbolRules, get_exchange_info_store
+from .quantizer import SymbolQuantizer
+from .models import FillResult
+from .price_cache import PriceCache, get_price_cache
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .metrics import MetricsRegistry, get_metrics_registry
+
+class AsyncBinanceClient:
+    """
+    Versi asyncio dari BinanceClient dengan permukaan method yang sama.
+    Semua instance berbagi satu connection pool (keep-alive) per event loop,
+    sehingga banyak task pengguna bisa melakukan request bersamaan tanpa
+    saling memblokir.
+    """
+    BASE_API_URL = BinanceClient.BASE_API_URL
+    PRICE_BATCH_SIZE = BinanceClient.PRICE_BATCH_SIZE
+    GET_RETRIES = BinanceClient.GET_RETRIES
+    RETRY_BACKOFF_SECONDS = BinanceClient.RETRY_BACKOFF_SECONDS
+    DEFAULT_TIMEOUT_SECONDS = 10
+    POOL_SIZE = 100
+    KEEPALIVE_SECONDS = 30
+
+    _session: Optional[aiohttp.ClientSession] = None
+    _session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # Logika penandatanganan & normalisasi fill sama persis dengan klien sinkron
+    _generate_signature = BinanceClient._generate_signature
+    _to_fill_result = BinanceClient._to_fill_result
+
+    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT_SECONDS, exchange_info_store: Optional[ExchangeInfoStore] = None, price_cache: Optional[PriceCache] = None, rate_limiter: Optional[RateLimiter] = None, metrics: Optional[MetricsRegistry] = None):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.headers = {
+            'Accept': 'application/json',
+            'User-Agent': 'AutoTradeBot/1.0'
+        }
+        if self.api_key:
+            self.headers['X-MBX-APIKEY'] = self.api_key
+        self.exchange_info_store = exchange_info_store or get_exchange_info_store()
+        self.price_cache = price_cache or get_price_cache()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.metrics = metrics or get_metrics_registry()
+
+    @classmethod
+    def _get_session(cls) -> aiohttp.ClientSession:
+        """Mengembalikan session bersama, membuat ulang jika loop-nya berganti atau sudah ditutup."""
+        loop = asyncio.get_running_loop()
+        if cls._session is None or cls._session.closed or cls._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=cls.POOL_SIZE, keepalive_timeout=cls.KEEPALIVE_SECONDS, ttl_dns_cache=300)
+            cls._session = aiohttp.ClientSession(connector=connector)
+            cls._session_loop = loop
+        return cls._session
+
+    @classmethod
+    async def close_shared_session(cls):
+        """Menutup connection pool bersama. Panggil saat aplikasi shutdown."""
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+        cls._session_loop = None
+
+    async def _perform(self, method: str, endpoint: str, url: str, limiter_params: Dict[str, Any], signed: bool, **kwargs) -> Tuple[int, str]:
+        """Versi asyncio dari BinanceClient._perform; mengembalikan (status HTTP, body)."""
+        session = self._get_session()
+        attempts = self.GET_RETRIES + 1 if method == 'GET' else 1
+        for attempt in range(attempts):
+            if attempt:
+                self.metrics.record_retry(method, endpoint)
+                await asyncio.sleep(self.RETRY_BACKOFF_SECONDS * attempt)
+                await self.rate_limiter.acquire_async(method, endpoint, limiter_params, signed=signed)
+
+            started = time.perf_counter()
+            try:
+                async with session.request(method, url, timeout=self.timeout, **kwargs) as response:
+                    body = await response.text()
+                    status, headers = response.status, response.headers
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.metrics.record(method, endpoint, time.perf_counter() - started, None)
+                if attempt + 1 < attempts:
+                    continue
+                raise
+
+            self.metrics.record(method, endpoint, time.perf_counter() - started, status, headers.get('X-MBX-USED-WEIGHT-1M'))
+            self.rate_limiter.update_from_response(status, headers)
+            if status >= 500 and attempt + 1 < attempts:
+                continue
+            return status, body
+
+    async def _send_request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, signed: bool = False) -> Optional[Any]:
+        if params is None:
+            params = {}
+
+        url = f"{self.BASE_API_URL}{endpoint}"
+        req_method = method.upper()
+
+        if signed:
+            if not self.api_key or not self.api_secret:
+                print("Error: API Key dan Secret Key diperlukan.")
+                return None
+
+            # Tunggu giliran sebelum timestamp dibuat agar tidak melewati recvWindow
+            await self.rate_limiter.acquire_async(req_method, endpoint, params, signed=True)
+            params['timestamp'] = int(time.time() * 1000)
+            params['recvWindow'] = 5000
+
+            query_string = '&'.join([f"{k}={v}" for k, v in params.items()])
+            signature = self._generate_signature(query_string)
+            query_string += f"&signature={signature}"
+
+            if req_method == 'POST':
+                headers = {**self.headers, 'Content-Type': 'application/x-www-form-urlencoded'}
+                request_url, request_kwargs = url, {"data": query_string, "headers": headers}
+            elif req_method in ('GET', 'DELETE'):
+                request_url, request_kwargs = f"{url}?{query_string}", {"headers": self.headers}
+            else:
+                print(f"Metode HTTP tidak didukung: {req_method}")
+                return None
+
+            try:
+                status, body = await self._perform(req_method, endpoint, request_url, params, True, **request_kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Error saat request ke {url}: {e!r}")
+                return None
+            if status >= 400:
+                print(f"Error saat request ke {url}: HTTP {status}")
+                try:
+                    print(f"Error Body dari Binance: {json.loads(body)}")
+                except json.JSONDecodeError:
+                    print(f"Error Body: {body}")
+                return None
+            try:
+                return json.loads(body)
+            except json.JSONDecodeError:
+                print(f"Respons dari {url} bukan JSON yang valid: {body[:200]}")
+                return None
+
+        await self.rate_limiter.acquire_async(req_method, endpoint, params)
+        try:
+            status, body = await self._perform(req_method, endpoint, url, params, False, params=params, headers=self.headers)
+            if status >= 400:
+                return None
+            return json.loads(body)
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError):
+            return None
+
+    async def _ensure_exchange_info(self) -> bool:
+        return await self.exchange_info_store.ensure_loaded_async(lambda: self._send_request("GET", "/exchangeInfo"))
+
+    async def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        if await self._ensure_exchange_info():
+            return self.exchange_info_store.get_symbol_info(symbol)
+        return None
+
+    async def get_symbol_rules(self, symbol: str) -> Optional[SymbolRules]:
+        """Mengembalikan filter trading simbol yang sudah di-parse (LOT_SIZE, PRICE_FILTER, NOTIONAL)."""
+        if await self._ensure_exchange_info():
+            return self.exchange_info_store.get_rules(symbol)
+        return None
+
+    async def get_quantizer(self, symbol: str) -> Optional[SymbolQuantizer]:
+        """Mengembalikan pembulat harga/kuantitas simbol (dibangun sekali per simbol)."""
+        if await self._ensure_exchange_info():
+            return self.exchange_info_store.get_quantizer(symbol)
+        return None
+
+    async def place_market_buy_order(self, symbol: str, quote_order_qty: float) -> Optional[FillResult]:
+        """
+        Menempatkan MARKET BUY senilai `quote_order_qty` dan mengembalikan fill
+        yang sudah dinormalisasi (respons FULL), sehingga OCO bisa langsung
+        dipasang tanpa membaca ulang saldo akun.
+        """
+        await self._ensure_exchange_info()
+        params = {"symbol": symbol, "side": "BUY", "type": "MARKET", "quoteOrderQty": quote_order_qty, "newOrderRespType": "FULL"}
+        return self._to_fill_result(symbol, await self._send_request("POST", "/order", params, signed=True))
+
+    async def place_market_sell_order(self, symbol: str, quantity: float) -> Optional[FillResult]:
+        """Menempatkan order MARKET SELL untuk sejumlah kuantitas tertentu."""
+        quantizer = await self.get_quantizer(symbol)
+        if not quantizer:
+            print(f"Gagal menempatkan Market Sell: tidak ditemukan info untuk {symbol}")
+            return None
+
+        error = quantizer.validate(quantity)
+        if error:
+            print(f"Gagal menempatkan Market Sell: {error}")
+            return None
+
+        params = {"symbol": symbol, "side": "SELL", "type": "MARKET", "quantity": quantizer.format_qty(quantity), "newOrderRespType": "FULL"}
+        return self._to_fill_result(symbol, await self._send_request("POST", "/order", params, signed=True))
+
+    async def place_oco_sell_order(self, symbol: str, quantity: float, take_profit_price: float, stop_loss_price: float) -> Optional[Dict[str, Any]]:
+        quantizer = await self.get_quantizer(symbol)
+        if not quantizer:
+            print(f"Gagal menempatkan OCO: tidak ditemukan info untuk {symbol}")
+            return None
+
+        quantity = float(quantity)
+        stop_limit_price = stop_loss_price * 0.995
+        # Setiap kaki OCO divalidasi terpisah, sama seperti di sisi Binance
+        for leg_price in (take_profit_price, stop_limit_price):
+            error = quantizer.validate(quantity, leg_price)
+            if error:
+                print(f"Gagal menempatkan OCO: {error}")
+                return None
+
+        params = {
+            "symbol": symbol, "side": "SELL", "quantity": quantizer.format_qty(quantity),
+            "aboveType": "LIMIT_MAKER", "abovePrice": quantizer.format_price(take_profit_price),
+            "belowType": "STOP_LOSS_LIMIT", "belowStopPrice": quantizer.format_price(stop_loss_price),
+            "belowPrice": quantizer.format_price(stop_limit_price), "belowTimeInForce": "GTC",
+        }
+        return await self._send_request("POST", "/orderList/oco", params, signed=True)
+
+    async def replace_oco(self, symbol: str, order_list_id: int, quantity: float, take_profit_price: Optional[float] = None, stop_loss_price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Mengganti OCO yang aktif tanpa jeda tetap: batalkan lalu langsung pasang
+        OCO baru (TP/SL baru) atau, jika harga tidak diberikan, tutup posisi
+        dengan MARKET SELL. Binance melepas saldo terkunci di respons
+        pembatalan, sehingga order pengganti bisa dikirim seketika.
+        Status: SUCCESS, CANCEL_FAILED (OCO lama masih aktif) atau
+        PLACE_FAILED (OCO lama sudah batal, aset tidak terproteksi).
+        """
+        cancel_result = await self.cancel_oco_order(symbol, order_list_id)
+        if not cancel_result:
+            return {"status": "CANCEL_FAILED", "reason": f"Gagal membatalkan OCO {order_list_id} untuk {symbol}."}
+
+        if take_profit_price is None or stop_loss_price is None:
+            new_order = await self.place_market_sell_order(symbol, float(quantity))
+        else:
+            new_order = await self.place_oco_sell_order(symbol, quantity, take_profit_price, stop_loss_price)
+            if not new_order:
+                # Satu percobaan ulang langsung untuk galat sementara (jaringan / rate limit)
+                print(f"Gagal memasang OCO pengganti untuk {symbol}. Mencoba sekali lagi...")
+                new_order = await self.place_oco_sell_order(symbol, quantity, take_profit_price, stop_loss_price)
+
+        if not new_order:
+            return {"status": "PLACE_FAILED", "reason": f"OCO {order_list_id} dibatalkan tetapi order pengganti untuk {symbol} gagal.", "cancel_result": cancel_result}
+        return {"status": "SUCCESS", "cancel_result": cancel_result, "order": new_order}
+    
+    async def cancel_oco_order(self, symbol: str, order_list_id: int) -> Optional[Dict[str, Any]]:
+        print(f"Membatalkan OCO orderListId: {order_list_id} untuk {symbol}...")
+        params = {"symbol": symbol, "orderListId": order_list_id}
+        return await self._send_request("DELETE", "/orderList", params, signed=True)
+
+    async def cancel_all_open_orders_for_symbol(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Membatalkan semua open order untuk simbol tertentu."""
+        print(f"Membatalkan SEMUA order terbuka untuk {symbol}...")
+        params = {"symbol": symbol}
+        return await self._send_request("DELETE", "/openOrders", params, signed=True)
+
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        # Baca dari cache stream terlebih dahulu; REST hanya jika harga basi
+        cached_price = self.price_cache.get_price(symbol)
+        if cached_price is not None:
+            return cached_price
+
+        params = {"symbol": symbol}
+        data = await self._send_request("GET", "/ticker/price", params)
+        if not data or 'price' not in data:
+            return None
+        price = float(data['price'])
+        self.price_cache.update(symbol, price)
+        return price
+
+    async def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """Versi asyncio dari BinanceClient.get_prices; batch di-request bersamaan."""
+        symbols = list(dict.fromkeys(symbols))
+        prices = self.price_cache.get_prices(symbols)
+        missing = [s for s in symbols if s not in prices]
+        if missing and self.exchange_info_store.is_fresh():
+            missing = [s for s in missing if self.exchange_info_store.has_symbol(s)]
+
+        chunks = [missing[i:i + self.PRICE_BATCH_SIZE] for i in range(0, len(missing), self.PRICE_BATCH_SIZE)]
+        results = await asyncio.gather(*[
+            self._send_request("GET", "/ticker/price", {"symbols": json.dumps(chunk, separators=(',', ':'))})
+            for chunk in chunks
+        ])
+        for chunk, data in zip(chunks, results):
+            if data is None:
+                print(f"Gagal mengambil harga batch ({len(chunk)} simbol). Mencoba per simbol...")
+                fallback = await asyncio.gather(*[self.get_current_price(symbol) for symbol in chunk])
+                prices.update({symbol: price for symbol, price in zip(chunk, fallback) if price is not None})
+                continue
+            for item in data:
+                price = float(item['price'])
+                prices[item['symbol']] = price
+                self.price_cache.update(item['symbol'], price)
+        return prices
+
+    async def get_all_tickers(self) -> Optional[List[Dict[str, Any]]]:
+        return await self._send_request("GET", "/ticker/price")
+
+    async def get_account_info(self) -> Optional[Dict[str, Any]]:
+        return await self._send_request("GET", "/account", signed=True)
+
+    async def get_open_orders(self, symbol: str = None) -> Optional[list]:
+        params = {}
+        if symbol:
+            params['symbol'] = symbol
+        return await self._send_request("GET", "/openOrders", params, signed=True)
+
+    async def get_order_list(self, order_list_id: int) -> Optional[Dict[str, Any]]:
+        """Mengambil status sebuah order list (OCO)."""
+        return await self._send_request("GET", "/orderList", {"orderListId": order_list_id}, signed=True)
+
+    async def get_my_trades(self, symbol: str, limit: int = 10) -> Optional[list]:
+        """Mengambil riwayat trade akun untuk simbol tertentu."""
+        return await self._send_request("GET", "/myTrades", {"symbol": symbol, "limit": limit}, signed=True)
@@ -1,19 +1,30 @@
 # Auto Trade Bot/binance/client.py
+import os
 import time
 import hmac
 import hashlib
 import requests
-import math
 import json
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable
+from .exchange_info import ExchangeInfoStore, SymbolRules, get_exchange_info_store
+from .quantizer import SymbolQuantizer
+from .models import FillResult
+from .price_cache import PriceCache, get_price_cache
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .metrics import MetricsRegistry, get_metrics_registry
 
 class BinanceClient:
     """
     Klien untuk berinteraksi dengan API Binance, mendukung endpoint publik dan privat.
     """
-    BASE_API_URL = "https://api.binance.com/api/v3"
+    BASE_API_URL = os.getenv("BINANCE_API_URL", "https://api.binance.com/api/v3")
+    # Jumlah simbol maksimal per request /ticker/price?symbols=[...]
+    PRICE_BATCH_SIZE = 100
+    # Percobaan ulang untuk GET (idempoten) saat error jaringan atau HTTP 5xx
+    GET_RETRIES = 2
+    RETRY_BACKOFF_SECONDS = 0.25
 
-    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None, exchange_info_store: Optional[ExchangeInfoStore] = None, price_cache: Optional[PriceCache] = None, rate_limiter: Optional[RateLimiter] = None, metrics: Optional[MetricsRegistry] = None):
         self.api_key = api_key
         self.api_secret = api_secret
         self.session = requests.Session()
@@ -23,22 +34,55 @@ class BinanceClient:
         })
         if self.api_key:
             self.session.headers.update({'X-MBX-APIKEY': self.api_key})
-        self.exchange_info = None
+        self.exchange_info_store = exchange_info_store or get_exchange_info_store()
+        self.price_cache = price_cache or get_price_cache()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.metrics = metrics or get_metrics_registry()
 
     def _generate_signature(self, data: str) -> str:
         return hmac.new(self.api_secret.encode('utf-8'), data.encode('utf-8'), hashlib.sha256).hexdigest()
 
+    def _perform(self, method: str, endpoint: str, url: str, limiter_params: Dict[str, Any], signed: bool, **kwargs) -> requests.Response:
+        """
+        Mengirim request lewat rate limiter dan mencatat metriknya. GET diulang
+        hingga GET_RETRIES kali saat error jaringan atau HTTP 5xx.
+        """
+        attempts = self.GET_RETRIES + 1 if method == 'GET' else 1
+        for attempt in range(attempts):
+            if attempt:
+                self.metrics.record_retry(method, endpoint)
+                time.sleep(self.RETRY_BACKOFF_SECONDS * attempt)
+                self.rate_limiter.acquire(method, endpoint, limiter_params, signed=signed)
+
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException:
+                self.metrics.record(method, endpoint, time.perf_counter() - started, None)
+                if attempt + 1 < attempts:
+                    continue
+                raise
+
+            self.metrics.record(method, endpoint, time.perf_counter() - started, response.status_code, response.headers.get('X-MBX-USED-WEIGHT-1M'))
+            self.rate_limiter.update_from_response(response.status_code, response.headers)
+            if response.status_code >= 500 and attempt + 1 < attempts:
+                continue
+            return response
+
     def _send_request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, signed: bool = False) -> Optional[Any]:
         if params is None:
             params = {}
         
         url = f"{self.BASE_API_URL}{endpoint}"
+        req_method = method.upper()
         
         if signed:
             if not self.api_key or not self.api_secret:
                 print("Error: API Key dan Secret Key diperlukan.")
                 return None
             
+            # Tunggu giliran sebelum timestamp dibuat agar tidak melewati recvWindow
+            self.rate_limiter.acquire(req_method, endpoint, params, signed=True)
             params['timestamp'] = int(time.time() * 1000)
             params['recvWindow'] = 5000 
             
@@ -46,20 +90,18 @@ class BinanceClient:
             signature = self._generate_signature(query_string)
             query_string += f"&signature={signature}"
             
-            try:
-                # Perbaikan: Menggunakan method.upper() untuk konsistensi
-                req_method = method.upper()
-                if req_method == 'GET':
-                    response = self.session.get(f"{url}?{query_string}")
-                elif req_method == 'POST':
-                    headers = {'Content-Type': 'application/x-www-form-urlencoded'}
-                    response = self.session.post(url, data=query_string, headers=headers)
-                elif req_method == 'DELETE':
-                    response = self.session.delete(f"{url}?{query_string}")
-                else:
-                    print(f"Metode HTTP tidak didukung: {req_method}")
-                    return None
+            if req_method == 'POST':
+                request_kwargs = {"data": query_string, "headers": {'Content-Type': 'application/x-www-form-urlencoded'}}
+                request_url = url
+            elif req_method in ('GET', 'DELETE'):
+                request_kwargs = {}
+                request_url = f"{url}?{query_string}"
+            else:
+                print(f"Metode HTTP tidak didukung: {req_method}")
+                return None
 
+            try:
+                response = self._perform(req_method, endpoint, request_url, params, True, **request_kwargs)
                 response.raise_for_status()
                 return response.json()
             except requests.exceptions.RequestException as e:
@@ -72,73 +114,115 @@ class BinanceClient:
                         print(f"Error Body: {e.response.text}")
                 return None
         
+        self.rate_limiter.acquire(req_method, endpoint, params)
         try:
-            response = self.session.get(url, params=params)
+            # Endpoint tanpa signature (mis. /userDataStream) tetap bisa memakai POST/PUT/DELETE
+            response = self._perform(req_method, endpoint, url, params, False, params=params)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             return None
 
-    def _get_exchange_info(self):
-        if self.exchange_info is None:
-            print("Mengambil exchange info (aturan trading)...")
-            self.exchange_info = self._send_request("GET", "/exchangeInfo")
-        return self.exchange_info
+    def _ensure_exchange_info(self) -> bool:
+        return self.exchange_info_store.ensure_loaded(lambda: self._send_request("GET", "/exchangeInfo"))
 
     def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
-        info = self._get_exchange_info()
-        if info:
-            for symbol_info in info['symbols']:
-                if symbol_info['symbol'] == symbol:
-                    return symbol_info
+        if self._ensure_exchange_info():
+            return self.exchange_info_store.get_symbol_info(symbol)
         return None
 
-    def _format_value(self, value, step_size_str: str):
-        step_size = float(step_size_str)
-        if step_size == 1.0:
-            return str(int(float(value)))
-        
-        precision = abs(int(round(math.log(step_size, 10), 0)))
-        factor = 10 ** precision
-        floored_value = math.floor(float(value) * factor) / factor
-        return f"{floored_value:.{precision}f}"
-        
-    def place_market_buy_order(self, symbol: str, quote_order_qty: float) -> Optional[Dict[str, Any]]:
-        params = {"symbol": symbol, "side": "BUY", "type": "MARKET", "quoteOrderQty": quote_order_qty}
-        return self._send_request("POST", "/order", params, signed=True)
+    def get_symbol_rules(self, symbol: str) -> Optional[SymbolRules]:
+        """Mengembalikan filter trading simbol yang sudah di-parse (LOT_SIZE, PRICE_FILTER, NOTIONAL)."""
+        if self._ensure_exchange_info():
+            return self.exchange_info_store.get_rules(symbol)
+        return None
+
+    def get_quantizer(self, symbol: str) -> Optional[SymbolQuantizer]:
+        """Mengembalikan pembulat harga/kuantitas simbol (dibangun sekali per simbol)."""
+        if self._ensure_exchange_info():
+            return self.exchange_info_store.get_quantizer(symbol)
+        return None
+
+    def _to_fill_result(self, symbol: str, order: Optional[Dict[str, Any]]) -> Optional[FillResult]:
+        if not order:
+            return None
+        rules = self.exchange_info_store.get_rules(symbol)
+        base_asset = rules.base_asset if rules else symbol.replace("USDT", "")
+        return FillResult.from_order_response(order, base_asset)
+
+    def place_market_buy_order(self, symbol: str, quote_order_qty: float) -> Optional[FillResult]:
+        """
+        Menempatkan MARKET BUY senilai `quote_order_qty` dan mengembalikan fill
+        yang sudah dinormalisasi (respons FULL), sehingga OCO bisa langsung
+        dipasang tanpa membaca ulang saldo akun.
+        """
+        self._ensure_exchange_info()
+        params = {"symbol": symbol, "side": "BUY", "type": "MARKET", "quoteOrderQty": quote_order_qty, "newOrderRespType": "FULL"}
+        return self._to_fill_result(symbol, self._send_request("POST", "/order", params, signed=True))
         
-    def place_market_sell_order(self, symbol: str, quantity: float) -> Optional[Dict[str, Any]]:
+    def place_market_sell_order(self, symbol: str, quantity: float) -> Optional[FillResult]:
         """Menempatkan order MARKET SELL untuk sejumlah kuantitas tertentu."""
-        symbol_info = self.get_symbol_info(symbol)
-        if not symbol_info:
+        quantizer = self.get_quantizer(symbol)
+        if not quantizer:
             print(f"Gagal menempatkan Market Sell: tidak ditemukan info untuk {symbol}")
             return None
-        
-        lot_size_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'LOT_SIZE'), None)
-        if not lot_size_filter:
-            print(f"Filter LOT_SIZE tidak ditemukan untuk {symbol}")
+
+        error = quantizer.validate(quantity)
+        if error:
+            print(f"Gagal menempatkan Market Sell: {error}")
             return None
 
-        formatted_quantity = self._format_value(quantity, lot_size_filter['stepSize'])
-        params = {"symbol": symbol, "side": "SELL", "type": "MARKET", "quantity": formatted_quantity}
-        return self._send_request("POST", "/order", params, signed=True)
+        params = {"symbol": symbol, "side": "SELL", "type": "MARKET", "quantity": quantizer.format_qty(quantity), "newOrderRespType": "FULL"}
+        return self._to_fill_result(symbol, self._send_request("POST", "/order", params, signed=True))
 
     def place_oco_sell_order(self, symbol: str, quantity: float, take_profit_price: float, stop_loss_price: float) -> Optional[Dict[str, Any]]:
-        symbol_info = self.get_symbol_info(symbol)
-        if not symbol_info:
+        quantizer = self.get_quantizer(symbol)
+        if not quantizer:
             print(f"Gagal menempatkan OCO: tidak ditemukan info untuk {symbol}")
             return None
-            
-        filters = {f['filterType']: f for f in symbol_info['filters']}
-        
-        formatted_quantity = self._format_value(float(quantity), filters['LOT_SIZE']['stepSize'])
-        formatted_tp_price = self._format_value(take_profit_price, filters['PRICE_FILTER']['tickSize'])
-        formatted_sl_price = self._format_value(stop_loss_price, filters['PRICE_FILTER']['tickSize'])
-        stop_limit_price_val = stop_loss_price * 0.995 
-        formatted_sl_limit_price = self._format_value(stop_limit_price_val, filters['PRICE_FILTER']['tickSize'])
-
-        params = {"symbol": symbol, "side": "SELL", "quantity": formatted_quantity, "price": formatted_tp_price, "stopPrice": formatted_sl_price, "stopLimitPrice": formatted_sl_limit_price, "stopLimitTimeInForce": "GTC"}
-        return self._send_request("POST", "/order/oco", params, signed=True)
+
+        quantity = float(quantity)
+        stop_limit_price = stop_loss_price * 0.995
+        # Setiap kaki OCO divalidasi terpisah, sama seperti di sisi Binance
+        for leg_price in (take_profit_price, stop_limit_price):
+            error = quantizer.validate(quantity, leg_price)
+            if error:
+                print(f"Gagal menempatkan OCO: {error}")
+                return None
+
+        params = {
+            "symbol": symbol, "side": "SELL", "quantity": quantizer.format_qty(quantity),
+            "aboveType": "LIMIT_MAKER", "abovePrice": quantizer.format_price(take_profit_price),
+            "belowType": "STOP_LOSS_LIMIT", "belowStopPrice": quantizer.format_price(stop_loss_price),
+            "belowPrice": quantizer.format_price(stop_limit_price), "belowTimeInForce": "GTC",
+        }
+        return self._send_request("POST", "/orderList/oco", params, signed=True)
+
+    def replace_oco(self, symbol: str, order_list_id: int, quantity: float, take_profit_price: Optional[float] = None, stop_loss_price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Mengganti OCO yang aktif tanpa jeda tetap: batalkan lalu langsung pasang
+        OCO baru (TP/SL baru) atau, jika harga tidak diberikan, tutup posisi
+        dengan MARKET SELL. Binance melepas saldo terkunci di respons
+        pembatalan, sehingga order pengganti bisa dikirim seketika.
+        Status: SUCCESS, CANCEL_FAILED (OCO lama masih aktif) atau
+        PLACE_FAILED (OCO lama sudah batal, aset tidak terproteksi).
+        """
+        cancel_result = self.cancel_oco_order(symbol, order_list_id)
+        if not cancel_result:
+            return {"status": "CANCEL_FAILED", "reason": f"Gagal membatalkan OCO {order_list_id} untuk {symbol}."}
+
+        if take_profit_price is None or stop_loss_price is None:
+            new_order = self.place_market_sell_order(symbol, float(quantity))
+        else:
+            new_order = self.place_oco_sell_order(symbol, quantity, take_profit_price, stop_loss_price)
+            if not new_order:
+                # Satu percobaan ulang langsung untuk galat sementara (jaringan / rate limit)
+                print(f"Gagal memasang OCO pengganti untuk {symbol}. Mencoba sekali lagi...")
+                new_order = self.place_oco_sell_order(symbol, quantity, take_profit_price, stop_loss_price)
+
+        if not new_order:
+            return {"status": "PLACE_FAILED", "reason": f"OCO {order_list_id} dibatalkan tetapi order pengganti untuk {symbol} gagal.", "cancel_result": cancel_result}
+        return {"status": "SUCCESS", "cancel_result": cancel_result, "order": new_order}
     
     def cancel_oco_order(self, symbol: str, order_list_id: int) -> Optional[Dict[str, Any]]:
         print(f"Membatalkan OCO orderListId: {order_list_id} untuk {symbol}...")
@@ -154,10 +238,48 @@ class BinanceClient:
         return self._send_request("DELETE", "/openOrders", params, signed=True)
 
     def get_current_price(self, symbol: str) -> Optional[float]:
+        # Baca dari cache stream terlebih dahulu; REST hanya jika harga basi
+        cached_price = self.price_cache.get_price(symbol)
+        if cached_price is not None:
+            return cached_price
+
         params = {"symbol": symbol}
         data = self._send_request("GET", "/ticker/price", params)
-        return float(data['price']) if data and 'price' in data else None
+        if not data or 'price' not in data:
+            return None
+        price = float(data['price'])
+        self.price_cache.update(symbol, price)
+        return price
         
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """
+        Mengambil harga banyak simbol sekaligus dengan /ticker/price?symbols=[...].
+        Harga segar diambil dari cache stream; sisanya di-request per batch.
+        Simbol yang tidak ditemukan tidak ada di hasil.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        prices = self.price_cache.get_prices(symbols)
+        missing = [s for s in symbols if s not in prices]
+        if missing and self.exchange_info_store.is_fresh():
+            # Satu simbol tidak valid membuat seluruh batch ditolak Binance
+            missing = [s for s in missing if self.exchange_info_store.has_symbol(s)]
+
+        for i in range(0, len(missing), self.PRICE_BATCH_SIZE):
+            chunk = missing[i:i + self.PRICE_BATCH_SIZE]
+            data = self._send_request("GET", "/ticker/price", {"symbols": json.dumps(chunk, separators=(',', ':'))})
+            if data is None:
+                print(f"Gagal mengambil harga batch ({len(chunk)} simbol). Mencoba per simbol...")
+                for symbol in chunk:
+                    price = self.get_current_price(symbol)
+                    if price is not None:
+                        prices[symbol] = price
+                continue
+            for item in data:
+                price = float(item['price'])
+                prices[item['symbol']] = price
+                self.price_cache.update(item['symbol'], price)
+        return prices
+
     def get_all_tickers(self) -> Optional[List[Dict[str, Any]]]:
         return self._send_request("GET", "/ticker/price")
 
@@ -168,4 +290,23 @@ class BinanceClient:
         params = {}
         if symbol:
             params['symbol'] = symbol
-        return self._send_request("GET", "/openOrders", params, signed=True)
\ No newline at end of file
+        return self._send_request("GET", "/openOrders", params, signed=True)
+
+    def get_order_list(self, order_list_id: int) -> Optional[Dict[str, Any]]:
+        """Mengambil status sebuah order list (OCO)."""
+        return self._send_request("GET", "/orderList", {"orderListId": order_list_id}, signed=True)
+
+    def get_my_trades(self, symbol: str, limit: int = 10) -> Optional[list]:
+        """Mengambil riwayat trade akun untuk simbol tertentu."""
+        return self._send_request("GET", "/myTrades", {"symbol": symbol, "limit": limit}, signed=True)
+
+    # --- BARU: Manajemen listenKey untuk user data stream ---
+    def create_listen_key(self) -> Optional[str]:
+        data = self._send_request("POST", "/userDataStream")
+        return data.get('listenKey') if data else None
+
+    def keepalive_listen_key(self, listen_key: str) -> bool:
+        return self._send_request("PUT", "/userDataStream", {"listenKey": listen_key}) is not None
+
+    def close_listen_key(self, listen_key: str) -> bool:
+        return self._send_request("DELETE", "/userDataStream", {"listenKey": listen_key}) is not None
@@ -0,0 +1,121 @@
+# Auto Trade Bot/binance/codec.py
+"""
+Dekorator `model` untuk kelas data bot (sinyal Telegram, keputusan trading,
+hasil order): dataclass dengan __slots__ ditambah `to_dict`/`from_dict` yang
+dibangkitkan sekali per kelas. `to_dict` menggantikan `dataclasses.asdict`
+(yang menyalin seluruh pohon objek secara rekursif) dan hasilnya langsung
+dipakai sebagai dokumen MongoDB (BSON) maupun baris JSON.
+
+Modul ini sengaja berada di paket binance: backend hanya memasang folder
+binance/ (sebagai app.binance), sedangkan binance/models.py membutuhkannya.
+telegram/models.py mengimpornya dari sini.
+"""
+import typing
+from dataclasses import MISSING, dataclass, fields
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def _add_slots(cls):
+    """Membuat ulang dataclass dengan __slots__ (setara dataclass(slots=True) di Python 3.10+)."""
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(f.name for f in fields(cls))
+    inherited = {name for base in cls.__mro__[1:-1] for name in getattr(base, '__slots__', ())}
+    cls_dict['__slots__'] = tuple(name for name in field_names if name not in inherited)
+    # Nilai default sudah tersimpan di __init__ hasil dataclass; atribut kelasnya bentrok dengan slot
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+def _is_model(tp: Any) -> bool:
+    return isinstance(tp, type) and hasattr(tp, '__dataclass_fields__') and hasattr(tp, 'from_dict')
+
+
+def _field_kind(tp: Any) -> Tuple[str, Any]:
+    """Jenis konversi untuk satu field: ('model_list', kelas item), ('datetime', None), ('list'/'dict', None) atau ('plain', None)."""
+    args = [arg for arg in typing.get_args(tp) if arg is not type(None)]
+    if typing.get_origin(tp) is typing.Union and len(args) == 1:
+        tp, args = args[0], list(typing.get_args(args[0]))
+    if tp is datetime:
+        return 'datetime', None
+    origin = typing.get_origin(tp)
+    if origin is list:
+        return ('model_list', args[0]) if args and _is_model(args[0]) else ('list', None)
+    if origin is dict:
+        return 'dict', None
+    return 'plain', None
+
+
+def _build_to_dict(specs: List[Tuple[str, str, Any]]) -> Callable:
+    expressions = {
+        'model_list': "[item.to_dict() for item in self.{0}]",
+        'datetime': "None if self.{0} is None else self.{0}.isoformat()",
+        'list': "list(self.{0})",
+        'dict': "dict(self.{0})",
+        'plain': "self.{0}",
+    }
+    # Satu literal dict per kelas, seperti cara dataclasses membangkitkan __init__
+    body = "".join(f"        {name!r}: {expressions[kind].format(name)},\n" for name, kind, _ in specs)
+    namespace: Dict[str, Any] = {}
+    exec(f"def to_dict(self):\n    return {{\n{body}    }}\n", {}, namespace)
+    to_dict = namespace['to_dict']
+    to_dict.__doc__ = "Mengonversi objek menjadi dictionary (tanpa deep-copy seperti asdict)."
+    return to_dict
+
+
+def _build_from_dict(cls: type, specs: List[Tuple[str, str, Any]]) -> Callable:
+    """
+    Membangkitkan from_dict yang mengisi slot langsung (tanpa dict kwargs dan
+    tanpa memanggil __init__), dengan nilai default/default_factory dataclass
+    untuk kunci yang tidak ada.
+    """
+    namespace: Dict[str, Any] = {'_new': object.__new__, '_fromiso': datetime.fromisoformat}
+    body = []
+    for f, (name, kind, item_cls) in zip(fields(cls), specs):
+        if f.default is not MISSING:
+            namespace[f'_default_{name}'] = f.default
+            value = f"data.get({name!r}, _default_{name})"
+        elif f.default_factory is not MISSING:
+            namespace[f'_factory_{name}'] = f.default_factory
+            value = f"data[{name!r}] if {name!r} in data else _factory_{name}()"
+        else:
+            value = f"data[{name!r}]"
+        if kind == 'model_list':
+            namespace[f'_item_{name}'] = item_cls
+            body.append(f"        value = {value}\n")
+            body.append(f"        self.{name} = value if value is None else [item if isinstance(item, _item_{name}) else _item_{name}.from_dict(item) for item in value]\n")
+        elif kind == 'datetime':
+            body.append(f"        value = {value}\n")
+            body.append(f"        self.{name} = _fromiso(value) if isinstance(value, str) else value\n")
+        else:
+            body.append(f"        self.{name} = {value}\n")
+    if hasattr(cls, '__post_init__'):
+        body.append("        self.__post_init__()\n")
+    exec(
+        "def from_dict(cls, data):\n"
+        "    self = _new(cls)\n"
+        "    try:\n"
+        f"{''.join(body)}"
+        "    except KeyError as e:\n"
+        "        raise TypeError(f\"{cls.__name__}.from_dict: field wajib {e} tidak ada\") from None\n"
+        "    return self\n",
+        namespace,
+    )
+    from_dict = namespace['from_dict']
+    from_dict.__doc__ = "Kebalikan dari to_dict. Kunci yang bukan field (mis. '_id' MongoDB) diabaikan."
+    return from_dict
+
+
+def model(cls):
+    """Dekorator pengganti @dataclass untuk kelas data: slotted + encoder/decoder cepat."""
+    cls = _add_slots(dataclass(cls))
+    hints = typing.get_type_hints(cls)
+    specs = [(f.name, *_field_kind(hints[f.name])) for f in fields(cls)]
+    cls.to_dict = _build_to_dict(specs)
+    cls.from_dict = classmethod(_build_from_dict(cls, specs))
+    return cls
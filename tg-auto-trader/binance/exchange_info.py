@@ -0,0 +1,233 @@
+# Auto Trade Bot/binance/exchange_info.py
+import os
+import json
+import time
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Callable, Awaitable
+from .quantizer import SymbolQuantizer
+
+DEFAULT_SNAPSHOT_PATH = os.getenv(
+    "BINANCE_EXCHANGE_INFO_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "exchange_info.json")
+)
+DEFAULT_TTL_SECONDS = int(os.getenv("BINANCE_EXCHANGE_INFO_TTL_SECONDS", 3600))
+# Jeda sebelum mencoba ulang /exchangeInfo (weight 20) setelah pembaruan gagal; selama jeda data lama tetap dipakai
+DEFAULT_RETRY_BACKOFF_SECONDS = int(os.getenv("BINANCE_EXCHANGE_INFO_RETRY_SECONDS", 60))
+
+
+@dataclass(frozen=True)
+class LotSizeFilter:
+    """Filter LOT_SIZE: batas dan kelipatan kuantitas order."""
+    min_qty: float
+    max_qty: float
+    step_size: str
+
+
+@dataclass(frozen=True)
+class PriceFilter:
+    """Filter PRICE_FILTER: batas dan kelipatan harga order."""
+    min_price: float
+    max_price: float
+    tick_size: str
+
+
+@dataclass(frozen=True)
+class NotionalFilter:
+    """Gabungan filter MIN_NOTIONAL (lama) dan NOTIONAL (baru)."""
+    min_notional: float
+    max_notional: Optional[float] = None
+    apply_to_market: bool = True
+
+
+@dataclass(frozen=True)
+class SymbolRules:
+    """Aturan trading sebuah simbol yang sudah di-parse dari exchange info."""
+    symbol: str
+    status: str
+    base_asset: str
+    quote_asset: str
+    lot_size: Optional[LotSizeFilter] = None
+    price_filter: Optional[PriceFilter] = None
+    notional: Optional[NotionalFilter] = None
+
+    @classmethod
+    def from_symbol_info(cls, info: Dict[str, Any]) -> "SymbolRules":
+        filters = {f['filterType']: f for f in info.get('filters', [])}
+        lot_size = price_filter = notional = None
+
+        if 'LOT_SIZE' in filters:
+            f = filters['LOT_SIZE']
+            lot_size = LotSizeFilter(float(f['minQty']), float(f['maxQty']), f['stepSize'])
+        if 'PRICE_FILTER' in filters:
+            f = filters['PRICE_FILTER']
+            price_filter = PriceFilter(float(f['minPrice']), float(f['maxPrice']), f['tickSize'])
+        if 'NOTIONAL' in filters:
+            f = filters['NOTIONAL']
+            max_notional = float(f['maxNotional']) if 'maxNotional' in f else None
+            notional = NotionalFilter(float(f['minNotional']), max_notional, f.get('applyMinToMarket', True))
+        elif 'MIN_NOTIONAL' in filters:
+            f = filters['MIN_NOTIONAL']
+            notional = NotionalFilter(float(f['minNotional']), None, f.get('applyToMarket', True))
+
+        return cls(
+            symbol=info['symbol'],
+            status=info.get('status', ''),
+            base_asset=info.get('baseAsset', ''),
+            quote_asset=info.get('quoteAsset', ''),
+            lot_size=lot_size,
+            price_filter=price_filter,
+            notional=notional,
+        )
+
+
+class ExchangeInfoStore:
+    """
+    Penyimpanan exchange info bersama untuk satu proses.
+    Simbol diindeks berdasarkan nama (lookup O(1)), filter di-parse sekali,
+    dan snapshot ringkas disimpan ke disk agar proses lain (bot & backend)
+    tidak perlu mengunduh ulang /exchangeInfo sebelum TTL habis.
+    """
+    KEPT_FIELDS = ('symbol', 'status', 'baseAsset', 'quoteAsset')
+    KEPT_FILTERS = {'LOT_SIZE', 'MARKET_LOT_SIZE', 'PRICE_FILTER', 'MIN_NOTIONAL', 'NOTIONAL'}
+
+    def __init__(self, snapshot_path: Optional[str] = DEFAULT_SNAPSHOT_PATH, ttl_seconds: int = DEFAULT_TTL_SECONDS, retry_backoff_seconds: int = DEFAULT_RETRY_BACKOFF_SECONDS):
+        self.snapshot_path = snapshot_path
+        self.ttl_seconds = ttl_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._failed_at = 0.0
+        self._symbols: Dict[str, Dict[str, Any]] = {}
+        self._rules: Dict[str, SymbolRules] = {}
+        self._quantizers: Dict[str, SymbolQuantizer] = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._async_lock: Optional[asyncio.Lock] = None
+        self._async_lock_loop = None
+
+    def is_fresh(self) -> bool:
+        return bool(self._symbols) and (time.time() - self._fetched_at) < self.ttl_seconds
+
+    def _in_backoff(self) -> bool:
+        """True selama jeda setelah pembaruan gagal: tidak ada request baru, data lama (jika ada) dipakai."""
+        return bool(self._failed_at) and (time.time() - self._failed_at) < self.retry_backoff_seconds
+
+    def ensure_loaded(self, fetch: Callable[[], Optional[Dict[str, Any]]]) -> bool:
+        """Memastikan data tersedia; memuat dari disk atau memanggil `fetch` jika kedaluwarsa."""
+        if self.is_fresh():
+            return True
+        if self._in_backoff():
+            return bool(self._symbols)
+        with self._lock:
+            if self.is_fresh() or self._load_snapshot():
+                return True
+            if self._in_backoff():
+                return bool(self._symbols)
+            print("Mengambil exchange info (aturan trading)...")
+            self._apply_exchange_info(fetch())
+            return bool(self._symbols)
+
+    async def ensure_loaded_async(self, fetch: Callable[[], Awaitable[Optional[Dict[str, Any]]]]) -> bool:
+        """Versi asyncio dari `ensure_loaded`; hanya satu coroutine yang mengunduh ulang."""
+        if self.is_fresh():
+            return True
+        if self._in_backoff():
+            return bool(self._symbols)
+        loop = asyncio.get_running_loop()
+        if self._async_lock is None or self._async_lock_loop is not loop:
+            self._async_lock = asyncio.Lock()
+            self._async_lock_loop = loop
+        async with self._async_lock:
+            if self.is_fresh() or self._load_snapshot():
+                return True
+            if self._in_backoff():
+                return bool(self._symbols)
+            print("Mengambil exchange info (aturan trading)...")
+            self._apply_exchange_info(await fetch())
+            return bool(self._symbols)
+
+    def get_symbol_info(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return self._symbols.get(symbol)
+
+    def get_rules(self, symbol: str) -> Optional[SymbolRules]:
+        rules = self._rules.get(symbol)
+        if rules is None and symbol in self._symbols:
+            rules = self._rules[symbol] = SymbolRules.from_symbol_info(self._symbols[symbol])
+        return rules
+
+    def get_quantizer(self, symbol: str) -> Optional[SymbolQuantizer]:
+        quantizer = self._quantizers.get(symbol)
+        if quantizer is None:
+            rules = self.get_rules(symbol)
+            if rules is None:
+                return None
+            try:
+                quantizer = SymbolQuantizer(rules)
+            except ValueError as e:
+                print(f"Pembulat order untuk {symbol} tidak dapat dibuat: {e}")
+                return None
+            self._quantizers[symbol] = quantizer
+        return quantizer
+
+    def has_symbol(self, symbol: str) -> bool:
+        return symbol in self._symbols
+
+    def _compact(self, symbol_info: Dict[str, Any]) -> Dict[str, Any]:
+        compact = {k: symbol_info[k] for k in self.KEPT_FIELDS if k in symbol_info}
+        compact['filters'] = [f for f in symbol_info.get('filters', []) if f.get('filterType') in self.KEPT_FILTERS]
+        return compact
+
+    def _set_symbols(self, symbols: list, fetched_at: float):
+        self._symbols = {s['symbol']: s for s in symbols}
+        self._rules = {}
+        self._quantizers = {}
+        self._fetched_at = fetched_at
+
+    def _apply_exchange_info(self, exchange_info: Optional[Dict[str, Any]]):
+        if not exchange_info or 'symbols' not in exchange_info:
+            self._failed_at = time.time()
+            if self._symbols:
+                print(f"Gagal memperbarui exchange info. Menggunakan data lama; dicoba lagi dalam {self.retry_backoff_seconds} detik.")
+            else:
+                print(f"Gagal mengambil exchange info. Dicoba lagi dalam {self.retry_backoff_seconds} detik.")
+            return
+        self._failed_at = 0.0
+        fetched_at = time.time()
+        self._set_symbols([self._compact(s) for s in exchange_info['symbols']], fetched_at)
+        self._save_snapshot()
+
+    def _load_snapshot(self) -> bool:
+        if not self.snapshot_path:
+            return False
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, OSError):
+            return False
+        fetched_at = snapshot.get('fetched_at', 0)
+        if time.time() - fetched_at >= self.ttl_seconds or not snapshot.get('symbols'):
+            return False
+        self._set_symbols(snapshot['symbols'], fetched_at)
+        return True
+
+    def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'fetched_at': self._fetched_at, 'symbols': list(self._symbols.values())}, f, separators=(',', ':'))
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"Gagal menyimpan snapshot exchange info ke {self.snapshot_path}: {e}")
+
+
+_default_store: Optional[ExchangeInfoStore] = None
+
+def get_exchange_info_store() -> ExchangeInfoStore:
+    """Mengembalikan ExchangeInfoStore bersama untuk seluruh proses."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ExchangeInfoStore()
+    return _default_store
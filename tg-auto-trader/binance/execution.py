@@ -0,0 +1,110 @@
+# Auto Trade Bot/binance/execution.py
+from typing import Dict, Any, List, Optional
+from .client import BinanceClient
+from .account import AccountManager
+from .user_stream import UserDataStream
+from .exchange_info import SymbolRules
+from .models import FillResult
+
+
+class ExecutionContext:
+    """
+    Snapshot satu pass eksekusi: open orders (diindeks per simbol), ringkasan
+    saldo dan aturan simbol diambil sekali di awal, lalu diperbarui secara
+    lokal setiap kali order ditempatkan, dibatalkan atau dijual. Semua
+    pengecekan pra-pembelian membaca dari sini, sehingga jumlah request
+    informasi per pass tetap, berapa pun jumlah keputusan BUY-nya.
+    """
+
+    def __init__(self, client: BinanceClient, account_summary: Dict[str, Any], open_orders: List[Dict[str, Any]], quote_asset: str = "USDT"):
+        self.client = client
+        self.quote_asset = quote_asset
+        self.account_summary = account_summary
+        self._assets: Dict[str, Dict[str, Any]] = {asset['asset']: asset for asset in account_summary.get('held_assets', [])}
+        self._orders_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+        for order in open_orders:
+            self._orders_by_symbol.setdefault(order['symbol'], []).append(order)
+        self._rules: Dict[str, Optional[SymbolRules]] = {}
+
+    @classmethod
+    def load(cls, client: BinanceClient, account_stream: Optional[UserDataStream] = None) -> Optional["ExecutionContext"]:
+        """
+        Mengambil saldo (dari cermin user data stream jika aktif, jika tidak dari /account)
+        dan seluruh open orders dalam satu request. Mengembalikan None jika salah satunya gagal.
+        """
+        account_info = account_stream.account_snapshot() if account_stream and account_stream.is_live else None
+        account_summary = AccountManager(client).get_account_summary(account_info=account_info)
+        if not account_summary:
+            return None
+        open_orders = client.get_open_orders()
+        if open_orders is None:
+            print("Gagal mengambil open orders untuk pass eksekusi.")
+            return None
+        return cls(client, account_summary, open_orders)
+
+    # --- Baca ---
+    def open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Open orders satu simbol, atau semuanya jika `symbol` kosong."""
+        if symbol:
+            return list(self._orders_by_symbol.get(symbol, []))
+        return [order for orders in self._orders_by_symbol.values() for order in orders]
+
+    def open_symbols(self) -> List[str]:
+        """Simbol yang memiliki open order, sesuai urutan dari Binance."""
+        return list(self._orders_by_symbol)
+
+    def free_balance(self, asset: str) -> float:
+        return self._assets.get(asset, {}).get('free_balance', 0.0)
+
+    def held_value(self, asset: str) -> float:
+        return self._assets.get(asset, {}).get('value_in_usdt', 0.0)
+
+    def symbol_rules(self, symbol: str) -> Optional[SymbolRules]:
+        """Aturan simbol; exchangeInfo hanya dimuat sekali oleh klien, hasil per simbol disimpan di sini."""
+        if symbol not in self._rules:
+            self._rules[symbol] = self.client.get_symbol_rules(symbol)
+        return self._rules[symbol]
+
+    # --- Pembaruan lokal ---
+    def _asset(self, asset: str) -> Dict[str, Any]:
+        if asset not in self._assets:
+            entry = {"asset": asset, "total_balance": 0.0, "free_balance": 0.0, "locked_balance": 0.0, "value_in_usdt": 0.0}
+            self._assets[asset] = entry
+            self.account_summary.setdefault('held_assets', []).append(entry)
+        return self._assets[asset]
+
+    def _adjust(self, asset: str, free: float = 0.0, locked: float = 0.0, value: float = 0.0):
+        entry = self._asset(asset)
+        entry['free_balance'] = max(entry['free_balance'] + free, 0.0)
+        entry['locked_balance'] = max(entry['locked_balance'] + locked, 0.0)
+        entry['total_balance'] = entry['free_balance'] + entry['locked_balance']
+        entry['value_in_usdt'] = round(max(entry['value_in_usdt'] + value, 0.0), 2)
+
+    def record_buy(self, fill: FillResult, base_asset: str):
+        """Market buy terisi: USDT berkurang sebesar nilai fill, aset dasar bertambah (dinilai pada harga fill)."""
+        spent = fill.quote_qty + fill.fees.get(self.quote_asset, 0.0)
+        self._adjust(self.quote_asset, free=-spent, value=-spent)
+        self._adjust(base_asset, free=fill.net_qty, value=fill.quote_qty)
+
+    def record_sell(self, fill: FillResult, base_asset: str):
+        """Market sell terisi: aset dasar berkurang, USDT bertambah sebesar hasil bersih penjualan."""
+        received = fill.quote_qty - fill.fees.get(self.quote_asset, 0.0)
+        entry = self._asset(base_asset)
+        sold_value = entry['value_in_usdt'] * min(fill.executed_qty / entry['total_balance'], 1.0) if entry['total_balance'] else 0.0
+        self._adjust(base_asset, free=-fill.executed_qty, value=-sold_value)
+        self._adjust(self.quote_asset, free=received, value=received)
+
+    def record_oco(self, symbol: str, base_asset: str, oco_order: Dict[str, Any], quantity: float):
+        """OCO ditempatkan: order-nya masuk indeks open orders dan kuantitasnya terkunci."""
+        reports = oco_order.get('orderReports') or [{"symbol": symbol, "orderListId": oco_order.get('orderListId', -1)}]
+        self._orders_by_symbol.setdefault(symbol, []).extend(reports)
+        self._adjust(base_asset, free=-quantity, locked=quantity)
+
+    def record_cancel(self, symbol: str, base_asset: str, free_balance: float):
+        """
+        Semua order simbol dibatalkan: indeksnya dihapus dan saldo aset dasar diganti
+        dengan saldo free aktual setelah pembatalan (dibaca dari stream atau /account).
+        """
+        self._orders_by_symbol.pop(symbol, None)
+        entry = self._asset(base_asset)
+        self._adjust(base_asset, free=free_balance - entry['free_balance'], locked=-entry['locked_balance'])
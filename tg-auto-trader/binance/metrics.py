@@ -0,0 +1,163 @@
+# Auto Trade Bot/binance/metrics.py
+import time
+import bisect
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+
+# Batas atas bucket histogram latensi (milidetik); bucket terakhir = +Inf
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class EndpointStats:
+    """Statistik kumulatif untuk satu pasangan (method, endpoint)."""
+    __slots__ = ('count', 'errors', 'retries', 'total_ms', 'max_ms', 'buckets', 'status_codes', 'used_weight', 'last_at')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        # status HTTP -> jumlah; 0 berarti error jaringan/timeout tanpa respons
+        self.status_codes: Dict[int, int] = {}
+        self.used_weight: Optional[int] = None
+        self.last_at = 0.0
+
+    def percentile_ms(self, fraction: float) -> float:
+        """Perkiraan persentil dari histogram (batas atas bucket, maksimal latensi terbesar)."""
+        if not self.count:
+            return 0.0
+        threshold = self.count * fraction
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            cumulative += bucket_count
+            if cumulative >= threshold:
+                return min(float(LATENCY_BUCKETS_MS[index]), round(self.max_ms, 1)) if index < len(LATENCY_BUCKETS_MS) else round(self.max_ms, 1)
+        return self.max_ms
+
+
+class MetricsRegistry:
+    """
+    Pencatat latensi, status HTTP, retry, dan bobot terpakai per endpoint
+    untuk semua klien Binance dalam satu proses. Aman dipakai dari banyak
+    thread; dibaca oleh run_status_routine dan endpoint metrik backend.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self.started_at = time.time()
+
+    def _get(self, method: str, endpoint: str) -> EndpointStats:
+        key = (method.upper(), endpoint)
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = EndpointStats()
+        return stats
+
+    def record(self, method: str, endpoint: str, latency_seconds: float, status_code: Optional[int], used_weight: Optional[str] = None):
+        """Mencatat satu percobaan request. `status_code` None berarti tidak ada respons."""
+        latency_ms = latency_seconds * 1000
+        status = status_code or 0
+        with self._lock:
+            stats = self._get(method, endpoint)
+            stats.count += 1
+            stats.total_ms += latency_ms
+            stats.max_ms = max(stats.max_ms, latency_ms)
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+            stats.status_codes[status] = stats.status_codes.get(status, 0) + 1
+            if status == 0 or status >= 400:
+                stats.errors += 1
+            if used_weight is not None:
+                try:
+                    stats.used_weight = int(used_weight)
+                except ValueError:
+                    pass
+            stats.last_at = time.time()
+
+    def record_retry(self, method: str, endpoint: str):
+        with self._lock:
+            self._get(method, endpoint).retries += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Ringkasan per endpoint, diurutkan dari total waktu terbesar."""
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[1].total_ms, reverse=True)
+            return {
+                f"{method} {endpoint}": {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "retries": stats.retries,
+                    "avg_ms": round(stats.total_ms / stats.count, 1) if stats.count else 0.0,
+                    "p50_ms": stats.percentile_ms(0.5),
+                    "p95_ms": stats.percentile_ms(0.95),
+                    "max_ms": round(stats.max_ms, 1),
+                    "total_ms": round(stats.total_ms, 1),
+                    "status_codes": {str(code): n for code, n in sorted(stats.status_codes.items())},
+                    "used_weight_1m": stats.used_weight,
+                }
+                for (method, endpoint), stats in items
+            }
+
+    def format_table(self) -> str:
+        """Tabel teks untuk dicetak di terminal."""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "  Belum ada request Binance yang tercatat."
+        lines = [f"  {'Endpoint':<26} {'Jumlah':>6} {'Error':>5} {'Retry':>5} {'Rata2':>8} {'p95':>8} {'Maks':>8} {'Bobot':>6}"]
+        for name, stats in snapshot.items():
+            weight = stats['used_weight_1m'] if stats['used_weight_1m'] is not None else '-'
+            lines.append(
+                f"  {name:<26} {stats['count']:>6} {stats['errors']:>5} {stats['retries']:>5} "
+                f"{stats['avg_ms']:>6.1f}ms {stats['p95_ms']:>6.0f}ms {stats['max_ms']:>6.0f}ms {weight:>6}"
+            )
+        return "\n".join(lines)
+
+    def to_prometheus(self) -> str:
+        """Format teks eksposisi Prometheus."""
+        lines: List[str] = [
+            "# HELP binance_request_duration_seconds Latensi request Binance per endpoint.",
+            "# TYPE binance_request_duration_seconds histogram",
+        ]
+        with self._lock:
+            items = list(self._stats.items())
+            for (method, endpoint), stats in items:
+                labels = f'method="{method}",endpoint="{endpoint}"'
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS_MS, stats.buckets):
+                    cumulative += bucket_count
+                    lines.append(f'binance_request_duration_seconds_bucket{{{labels},le="{bound / 1000}"}} {cumulative}')
+                lines.append(f'binance_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                lines.append(f"binance_request_duration_seconds_sum{{{labels}}} {stats.total_ms / 1000:.6f}")
+                lines.append(f"binance_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+            lines += ["# HELP binance_requests_total Jumlah request Binance per status HTTP (0 = tanpa respons).", "# TYPE binance_requests_total counter"]
+            for (method, endpoint), stats in items:
+                for code, count in sorted(stats.status_codes.items()):
+                    lines.append(f'binance_requests_total{{method="{method}",endpoint="{endpoint}",status="{code}"}} {count}')
+
+            lines += ["# HELP binance_request_retries_total Jumlah retry request Binance.", "# TYPE binance_request_retries_total counter"]
+            for (method, endpoint), stats in items:
+                lines.append(f'binance_request_retries_total{{method="{method}",endpoint="{endpoint}"}} {stats.retries}')
+
+            lines += ["# HELP binance_used_weight_1m Nilai X-MBX-USED-WEIGHT-1M terakhir.", "# TYPE binance_used_weight_1m gauge"]
+            for (method, endpoint), stats in items:
+                if stats.used_weight is not None:
+                    lines.append(f'binance_used_weight_1m{{method="{method}",endpoint="{endpoint}"}} {stats.used_weight}')
+        return "\n".join(lines) + "\n"
+
+
+_default_registry: Optional[MetricsRegistry] = None
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Mengembalikan MetricsRegistry bersama untuk seluruh proses."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+    return _default_registry
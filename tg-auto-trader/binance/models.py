@@ -1,9 +1,10 @@
 # Auto Trade Bot/binance/models.py
 import json
-from dataclasses import dataclass, field, asdict
+from dataclasses import field
 from typing import List, Optional, Dict, Any
+from .codec import model
 
-@dataclass
+@model
 class TargetInfo:
     """Mewakili informasi target harga."""
     level: int
@@ -12,7 +13,7 @@ class TargetInfo:
     status: Optional[str] = None
 
 
-@dataclass
+@model
 class StopLossInfo:
     """Mewakili informasi stop-loss."""
     level: int
@@ -21,7 +22,7 @@ class StopLossInfo:
     status: Optional[str] = None
 
 
-@dataclass
+@model
 class TradeDecision:
     """Mewakili keputusan trading berdasarkan sinyal."""
     decision: str  # "BUY", "SKIP", atau "FAIL"
@@ -33,10 +34,55 @@ class TradeDecision:
     targets: List[TargetInfo] = field(default_factory=list)
     stop_losses: List[StopLossInfo] = field(default_factory=list)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Mengonversi dataclass menjadi dictionary."""
-        return asdict(self)
-
     def to_json(self) -> str:
         """Mengonversi dataclass menjadi string JSON."""
-        return json.dumps(self.to_dict(), indent=4)
\ No newline at end of file
+        return json.dumps(self.to_dict(), indent=4)
+
+@model
+class FillResult:
+    """
+    Hasil order MARKET yang sudah dinormalisasi dari respons FULL Binance.
+    `net_qty` adalah kuantitas yang benar-benar diterima: jika komisi dibayar
+    dengan aset dasar (mis. beli BTC, fee dalam BTC), komisinya dikurangkan.
+    """
+    symbol: str
+    side: str
+    status: str
+    order_id: int
+    executed_qty: float
+    net_qty: float
+    quote_qty: float
+    avg_price: float
+    fees: Dict[str, float] = field(default_factory=dict)  # aset -> total komisi
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def is_filled(self) -> bool:
+        return self.status == 'FILLED' and self.executed_qty > 0
+
+    @classmethod
+    def from_order_response(cls, order: Dict[str, Any], base_asset: str) -> "FillResult":
+        executed_qty = float(order.get('executedQty', 0))
+        quote_qty = float(order.get('cummulativeQuoteQty', 0))
+        fees: Dict[str, float] = {}
+        for fill in order.get('fills', []):
+            asset = fill.get('commissionAsset', '')
+            fees[asset] = fees.get(asset, 0.0) + float(fill.get('commission', 0))
+
+        # Komisi hanya mengurangi aset dasar yang diterima pada sisi BUY
+        net_qty = executed_qty - fees.get(base_asset, 0.0) if order.get('side') == 'BUY' else executed_qty
+        return cls(
+            symbol=order.get('symbol', ''),
+            side=order.get('side', ''),
+            status=order.get('status', ''),
+            order_id=order.get('orderId', 0),
+            executed_qty=executed_qty,
+            net_qty=net_qty,
+            quote_qty=quote_qty,
+            avg_price=quote_qty / executed_qty if executed_qty else 0.0,
+            fees=fees,
+            raw=order,
+        )
+
+    def fee_in(self, asset: str) -> float:
+        return self.fees.get(asset, 0.0)
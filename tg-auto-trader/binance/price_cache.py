@@ -0,0 +1,111 @@
+# Auto Trade Bot/binance/price_cache.py
+import os
+import json
+import time
+import asyncio
+import websockets
+from typing import Optional, Dict, Tuple, Iterable
+from .stream import BackgroundStream
+
+DEFAULT_STREAM_URL = os.getenv("BINANCE_PRICE_STREAM_URL", "wss://stream.binance.com:9443/ws/!miniTicker@arr")
+DEFAULT_MAX_AGE_SECONDS = float(os.getenv("BINANCE_PRICE_MAX_AGE_SECONDS", 5))
+
+
+class PriceCache(BackgroundStream):
+    """
+    Cache harga terakhir per simbol yang diisi dari stream WebSocket mini-ticker
+    seluruh pasar. Pembaca mendapatkan harga tanpa request jaringan; harga
+    dianggap basi jika simbolnya tidak diperbarui dan stream sedang terputus
+    lebih lama dari `max_age_seconds`, sehingga pemanggil bisa fallback ke REST.
+    """
+    thread_name = "price-cache"
+
+    def __init__(self, stream_url: str = DEFAULT_STREAM_URL, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS, reconnect_delay: float = 5.0):
+        super().__init__(reconnect_delay)
+        self.stream_url = stream_url
+        self.max_age_seconds = max_age_seconds
+        # symbol -> (harga, waktu diterima)
+        self._prices: Dict[str, Tuple[float, float]] = {}
+        self._connected_since: Optional[float] = None
+        self.last_message_at = 0.0
+
+    @property
+    def is_streaming(self) -> bool:
+        """True jika stream terhubung dan masih mengirim pesan."""
+        return self._connected_since is not None and (time.time() - self.last_message_at) <= self.max_age_seconds
+
+    def update(self, symbol: str, price: float, received_at: Optional[float] = None):
+        self._prices[symbol] = (price, received_at or time.time())
+
+    def handle_message(self, raw_message: str):
+        """Memproses satu frame stream (array mini-ticker atau event tunggal)."""
+        try:
+            payload = json.loads(raw_message)
+        except json.JSONDecodeError:
+            return
+        if isinstance(payload, dict) and 'data' in payload:
+            payload = payload['data']
+        tickers = payload if isinstance(payload, list) else [payload]
+
+        now = time.time()
+        self.last_message_at = now
+        for ticker in tickers:
+            try:
+                self._prices[ticker['s']] = (float(ticker['c']), now)
+            except (KeyError, TypeError, ValueError):
+                continue
+
+    def get_price(self, symbol: str, max_age_seconds: Optional[float] = None) -> Optional[float]:
+        """
+        Mengembalikan harga yang masih segar, atau None jika tidak ada/basi.
+        Mini-ticker hanya mengirim simbol yang berubah, jadi harga lama tetap
+        valid selama diterima pada koneksi stream yang masih aktif.
+        """
+        entry = self._prices.get(symbol)
+        if entry is None:
+            return None
+        price, received_at = entry
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        if time.time() - received_at <= max_age:
+            return price
+        connected_since = self._connected_since
+        if connected_since is not None and received_at >= connected_since and self.is_streaming:
+            return price
+        return None
+
+    def get_prices(self, symbols: Iterable[str], max_age_seconds: Optional[float] = None) -> Dict[str, float]:
+        """Mengembalikan harga segar untuk simbol yang tersedia di cache."""
+        prices = {}
+        for symbol in symbols:
+            price = self.get_price(symbol, max_age_seconds)
+            if price is not None:
+                prices[symbol] = price
+        return prices
+
+    async def run(self):
+        """Berlangganan stream dan memperbarui cache hingga `stop()` dipanggil."""
+        while not self._stopped:
+            try:
+                async with websockets.connect(self.stream_url, ping_interval=20, max_size=None) as ws:
+                    self._connected_since = time.time()
+                    print(f"Terhubung ke stream harga {self.stream_url}")
+                    async for message in ws:
+                        self.handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Stream harga terputus: {e!r}. Mencoba lagi dalam {self.reconnect_delay} detik...")
+            finally:
+                self._connected_since = None
+            if not self._stopped:
+                await asyncio.sleep(self.reconnect_delay)
+
+
+_default_cache: Optional[PriceCache] = None
+
+def get_price_cache() -> PriceCache:
+    """Mengembalikan PriceCache bersama untuk seluruh proses."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = PriceCache()
+    return _default_cache
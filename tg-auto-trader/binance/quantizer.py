@@ -0,0 +1,110 @@
+# Auto Trade Bot/binance/quantizer.py
+from decimal import Decimal
+from typing import Optional, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .exchange_info import SymbolRules
+
+Number = Union[str, float, int, Decimal]
+
+
+class _StepRounder:
+    """
+    Pembulatan ke bawah ke kelipatan step/tick dengan aritmetika Decimal.
+    Nilai dihitung sebagai jumlah unit bulat (10^-desimal), sehingga kelipatan
+    step selalu tepat dan tidak ada pembulatan float seperti 0.57 * 100 = 56.99999.
+    Float dikonversi lewat repr() (representasi desimal terpendek), bukan nilai biner persisnya.
+    """
+    __slots__ = ('decimals', 'factor', 'step_units')
+
+    def __init__(self, step: str):
+        step_decimal = Decimal(step).normalize()
+        self.decimals = max(-step_decimal.as_tuple().exponent, 0) if step_decimal else 0
+        self.factor = 10 ** self.decimals
+        self.step_units = int(step_decimal.scaleb(self.decimals)) if step_decimal else 1
+
+    def units(self, value: Number) -> int:
+        """Jumlah unit terbesar (kelipatan step) yang tidak melebihi `value`."""
+        decimal_value = Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+        # Perkalian Decimal * int tepat; int() memotong ke arah nol (= ROUND_DOWN)
+        units = int(decimal_value * self.factor)
+        if self.step_units != 1:
+            units -= units % self.step_units
+        return units
+
+    def to_decimal(self, units: int) -> Decimal:
+        return Decimal(units).scaleb(-self.decimals)
+
+    def to_str(self, units: int) -> str:
+        """String desimal dari unit bulat, tanpa pembagian float."""
+        if not self.decimals:
+            return str(units)
+        whole, fraction = divmod(abs(units), self.factor)
+        return f"{'-' if units < 0 else ''}{whole}.{fraction:0{self.decimals}d}"
+
+
+class SymbolQuantizer:
+    """
+    Pembulat harga & kuantitas untuk satu simbol, dibangun sekali dari filter
+    LOT_SIZE, PRICE_FILTER dan NOTIONAL lalu di-cache oleh ExchangeInfoStore.
+    Hasil `quantize_*` selalu kelipatan tepat dari stepSize/tickSize.
+    Melempar ValueError jika LOT_SIZE atau PRICE_FILTER tidak ada, agar order
+    tidak pernah dikirim dengan pembulatan tebakan.
+    """
+    __slots__ = ('symbol', '_qty', '_price', 'min_qty', 'max_qty', 'min_price', 'max_price', 'min_notional', 'max_notional')
+
+    def __init__(self, rules: "SymbolRules"):
+        self.symbol = rules.symbol
+        lot_size, price_filter, notional = rules.lot_size, rules.price_filter, rules.notional
+        if not lot_size or not price_filter:
+            missing = [name for name, f in (("LOT_SIZE", lot_size), ("PRICE_FILTER", price_filter)) if not f]
+            raise ValueError(f"Filter {', '.join(missing)} tidak ditemukan untuk {rules.symbol}.")
+        self._qty = _StepRounder(lot_size.step_size)
+        self._price = _StepRounder(price_filter.tick_size)
+        # Batas filter disimpan dalam unit bulat yang sama dengan hasil pembulatan
+        self.min_qty = self._qty.units(lot_size.min_qty)
+        self.max_qty = self._qty.units(lot_size.max_qty) if lot_size.max_qty else None
+        self.min_price = self._price.units(price_filter.min_price)
+        self.max_price = self._price.units(price_filter.max_price) if price_filter.max_price else None
+        self.min_notional = Decimal(repr(notional.min_notional)) if notional else Decimal(0)
+        self.max_notional = Decimal(repr(notional.max_notional)) if notional and notional.max_notional else None
+
+    def quantize_qty(self, quantity: Number) -> Decimal:
+        """Membulatkan kuantitas ke bawah ke kelipatan stepSize."""
+        return self._qty.to_decimal(self._qty.units(quantity))
+
+    def quantize_price(self, price: Number) -> Decimal:
+        """Membulatkan harga ke bawah ke kelipatan tickSize."""
+        return self._price.to_decimal(self._price.units(price))
+
+    def format_qty(self, quantity: Number) -> str:
+        return self._qty.to_str(self._qty.units(quantity))
+
+    def format_price(self, price: Number) -> str:
+        return self._price.to_str(self._price.units(price))
+
+    def validate(self, quantity: Number, price: Optional[Number] = None) -> Optional[str]:
+        """
+        Membulatkan lalu memeriksa kuantitas (dan harga, jika ada) terhadap
+        batas LOT_SIZE, PRICE_FILTER dan NOTIONAL.
+        Mengembalikan pesan error, atau None jika valid.
+        """
+        qty_units = self._qty.units(quantity)
+        if qty_units <= 0 or qty_units < self.min_qty:
+            return f"Kuantitas {self._qty.to_str(qty_units)} di bawah minimum {self._qty.to_str(self.min_qty)} untuk {self.symbol}."
+        if self.max_qty is not None and qty_units > self.max_qty:
+            return f"Kuantitas {self._qty.to_str(qty_units)} melebihi maksimum {self._qty.to_str(self.max_qty)} untuk {self.symbol}."
+        if price is None:
+            return None
+
+        price_units = self._price.units(price)
+        if price_units <= 0 or price_units < self.min_price:
+            return f"Harga {self._price.to_str(price_units)} di bawah minimum {self._price.to_str(self.min_price)} untuk {self.symbol}."
+        if self.max_price is not None and price_units > self.max_price:
+            return f"Harga {self._price.to_str(price_units)} melebihi maksimum {self._price.to_str(self.max_price)} untuk {self.symbol}."
+        notional = Decimal(qty_units * price_units).scaleb(-(self._qty.decimals + self._price.decimals))
+        if notional < self.min_notional:
+            return f"Nilai order ${notional} di bawah minimum notional ${self.min_notional} untuk {self.symbol}."
+        if self.max_notional is not None and notional > self.max_notional:
+            return f"Nilai order ${notional} melebihi maksimum notional ${self.max_notional} untuk {self.symbol}."
+        return None
@@ -0,0 +1,197 @@
+# Auto Trade Bot/binance/rate_limiter.py
+import os
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+from typing import Optional, Dict, Any, Mapping, Tuple
+
+# Prioritas request: angka lebih kecil dilayani lebih dulu
+PRIORITY_ORDER = 0    # penempatan & pembatalan order
+PRIORITY_ACCOUNT = 1  # bacaan privat (saldo, open orders, riwayat)
+PRIORITY_MARKET = 2   # bacaan publik (harga, exchange info)
+
+# (method, endpoint) -> (bobot dengan symbol, bobot tanpa symbol)
+ENDPOINT_WEIGHTS: Dict[Tuple[str, str], Tuple[int, int]] = {
+    ("GET", "/ticker/price"): (2, 4),
+    ("GET", "/exchangeInfo"): (20, 20),
+    ("GET", "/account"): (20, 20),
+    ("GET", "/openOrders"): (6, 80),
+    ("DELETE", "/openOrders"): (1, 1),
+    ("GET", "/order"): (4, 4),
+    ("POST", "/order"): (1, 1),
+    ("DELETE", "/order"): (1, 1),
+    ("POST", "/order/oco"): (1, 1),
+    ("POST", "/orderList/oco"): (1, 1),
+    ("GET", "/orderList"): (4, 4),
+    ("DELETE", "/orderList"): (1, 1),
+    ("GET", "/myTrades"): (20, 20),
+    ("POST", "/userDataStream"): (2, 2),
+    ("PUT", "/userDataStream"): (2, 2),
+    ("DELETE", "/userDataStream"): (2, 2),
+}
+DEFAULT_WEIGHT = 2
+
+# Endpoint yang menambah hitungan ORDERS (bukan hanya bobot request)
+ORDER_PLACEMENT_ENDPOINTS = {("POST", "/order"), ("POST", "/order/oco"), ("POST", "/orderList/oco")}
+
+
+class RateLimiter:
+    """
+    Pembatas request bersama untuk semua panggilan Binance dari satu proses.
+    Menghitung bobot tiap endpoint, menyelaraskan dengan header
+    X-MBX-USED-WEIGHT-* dan X-MBX-ORDER-COUNT-* dari Binance, menahan request
+    saat kena 429/418, dan mengantrekan request berdasarkan prioritas sehingga
+    order & pembatalan selalu didahulukan dibanding bacaan informasi.
+    """
+
+    def __init__(
+        self,
+        weight_limit: int = int(os.getenv("BINANCE_WEIGHT_LIMIT_PER_MINUTE", 6000)),
+        order_limit_10s: int = int(os.getenv("BINANCE_ORDER_LIMIT_PER_10S", 100)),
+        reserved_fraction: float = 0.1,
+        poll_interval: float = 0.05,
+    ):
+        self.weight_limit = weight_limit
+        self.order_limit_10s = order_limit_10s
+        # Bagian budget yang hanya boleh dipakai oleh request order
+        self.reserved_fraction = reserved_fraction
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._weight_window = self._current_minute()
+        self._used_weight = 0
+        self._order_window = self._current_10s()
+        self._order_count = 0
+        self.order_count_1d = 0
+        self._banned_until = 0.0
+
+    @staticmethod
+    def _current_minute() -> int:
+        return int(time.time() // 60)
+
+    @staticmethod
+    def _current_10s() -> int:
+        return int(time.time() // 10)
+
+    @staticmethod
+    def classify(method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, signed: bool = False) -> Tuple[int, int, bool]:
+        """Mengembalikan (bobot, prioritas, apakah order) untuk sebuah request."""
+        method = method.upper()
+        params = params or {}
+        has_symbol = 'symbol' in params
+        weight_with_symbol, weight_without_symbol = ENDPOINT_WEIGHTS.get((method, endpoint), (DEFAULT_WEIGHT, DEFAULT_WEIGHT))
+        weight = weight_with_symbol if has_symbol else weight_without_symbol
+        if endpoint == "/ticker/price" and 'symbols' in params:
+            weight = weight_without_symbol
+
+        is_order = (method, endpoint) in ORDER_PLACEMENT_ENDPOINTS
+        if method in ("POST", "DELETE") and endpoint != "/userDataStream":
+            priority = PRIORITY_ORDER
+        elif signed:
+            priority = PRIORITY_ACCOUNT
+        else:
+            priority = PRIORITY_MARKET
+        return weight, priority, is_order
+
+    @property
+    def used_weight(self) -> int:
+        with self._lock:
+            self._roll_windows()
+            return self._used_weight
+
+    def _roll_windows(self):
+        minute = self._current_minute()
+        if minute != self._weight_window:
+            self._weight_window = minute
+            self._used_weight = 0
+        window = self._current_10s()
+        if window != self._order_window:
+            self._order_window = window
+            self._order_count = 0
+
+    def _enqueue(self, weight: int, priority: int, is_order: bool) -> list:
+        ticket = [priority, next(self._seq), weight, is_order]
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _try_acquire(self, ticket: list) -> bool:
+        priority, _, weight, is_order = ticket
+        with self._lock:
+            if time.time() < self._banned_until or self._waiters[0] is not ticket:
+                return False
+            self._roll_windows()
+            budget = self.weight_limit if priority == PRIORITY_ORDER else int(self.weight_limit * (1 - self.reserved_fraction))
+            if self._used_weight + weight > budget:
+                return False
+            if is_order and self._order_count >= self.order_limit_10s:
+                return False
+            heapq.heappop(self._waiters)
+            self._used_weight += weight
+            if is_order:
+                self._order_count += 1
+            return True
+
+    def _cancel(self, ticket: list):
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+
+    def acquire(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, signed: bool = False):
+        """Menunggu (blocking) sampai request boleh dikirim."""
+        ticket = self._enqueue(*self.classify(method, endpoint, params, signed))
+        try:
+            while not self._try_acquire(ticket):
+                time.sleep(self.poll_interval)
+        except BaseException:
+            self._cancel(ticket)
+            raise
+
+    async def acquire_async(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None, signed: bool = False):
+        """Versi asyncio dari `acquire`; menunggu tanpa memblokir event loop."""
+        ticket = self._enqueue(*self.classify(method, endpoint, params, signed))
+        try:
+            while not self._try_acquire(ticket):
+                await asyncio.sleep(self.poll_interval)
+        except BaseException:
+            self._cancel(ticket)
+            raise
+
+    def update_from_response(self, status_code: int, headers: Mapping[str, str]):
+        """Menyelaraskan hitungan lokal dengan header respons Binance."""
+        with self._lock:
+            self._roll_windows()
+            for name, value in headers.items():
+                name = name.upper()
+                try:
+                    if name == "X-MBX-USED-WEIGHT-1M":
+                        self._used_weight = max(self._used_weight, int(value))
+                    elif name == "X-MBX-ORDER-COUNT-10S":
+                        self._order_count = max(self._order_count, int(value))
+                    elif name == "X-MBX-ORDER-COUNT-1D":
+                        self.order_count_1d = int(value)
+                except ValueError:
+                    continue
+
+            if status_code in (418, 429):
+                try:
+                    retry_after = float(headers.get("Retry-After") or headers.get("retry-after") or 60)
+                except ValueError:
+                    retry_after = 60.0
+                self._banned_until = max(self._banned_until, time.time() + retry_after)
+                print(f"Binance membatasi request (HTTP {status_code}). Menahan semua request selama {retry_after:.0f} detik.")
+
+
+_default_limiter: Optional[RateLimiter] = None
+
+def get_rate_limiter() -> RateLimiter:
+    """Mengembalikan RateLimiter bersama; batas Binance berlaku per IP, bukan per akun."""
+    global _default_limiter
+    if _default_limiter is None:
+        _default_limiter = RateLimiter()
+    return _default_limiter
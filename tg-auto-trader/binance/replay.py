@@ -0,0 +1,104 @@
+# Auto Trade Bot/binance/replay.py
+import sys
+import json
+import asyncio
+import argparse
+import websockets
+from typing import List, Optional
+
+class ReplayServer:
+    """
+    Server WebSocket lokal yang memutar ulang frame hasil rekaman stream Binance.
+    Dipakai sebagai pengganti stream asli saat menguji PriceCache atau
+    consumer stream lain tanpa koneksi ke Binance.
+    """
+
+    def __init__(self, frames: List[str], host: str = "127.0.0.1", port: int = 0, interval: float = 0.0, repeat: bool = False):
+        self.frames = frames
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.repeat = repeat
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def _handler(self, websocket, path: Optional[str] = None):
+        while True:
+            for frame in self.frames:
+                await websocket.send(frame)
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+            if not self.repeat:
+                break
+        # Biarkan koneksi tetap terbuka seperti stream asli sampai klien menutupnya
+        await websocket.wait_closed()
+
+    async def start(self):
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+
+def load_frames(file_path: str) -> List[str]:
+    """Memuat frame rekaman dari file JSONL (satu frame per baris)."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+async def record_frames(stream_url: str, file_path: str, count: int):
+    """Merekam `count` frame dari stream ke file JSONL untuk diputar ulang."""
+    async with websockets.connect(stream_url, max_size=None) as ws:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for _ in range(count):
+                message = await ws.recv()
+                f.write(json.dumps(json.loads(message), separators=(',', ':')) + "\n")
+    print(f"Berhasil merekam {count} frame ke {file_path}")
+
+
+async def _serve_forever(file_path: str, port: int, interval: float):
+    async with ReplayServer(load_frames(file_path), port=port, interval=interval, repeat=True) as server:
+        print(f"Memutar ulang {file_path} di {server.url} (CTRL+C untuk berhenti)")
+        await asyncio.Future()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Rekam atau putar ulang stream WebSocket Binance.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="Merekam frame dari stream asli.")
+    record.add_argument("output")
+    record.add_argument("--url", default="wss://stream.binance.com:9443/ws/!miniTicker@arr")
+    record.add_argument("--count", type=int, default=60)
+
+    serve = subparsers.add_parser("serve", help="Memutar ulang rekaman di server lokal.")
+    serve.add_argument("input")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--interval", type=float, default=1.0)
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "record":
+            asyncio.run(record_frames(args.url, args.output, args.count))
+        else:
+            asyncio.run(_serve_forever(args.input, args.port, args.interval))
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,534 @@
+# Auto Trade Bot/binance/simulator.py
+import sys
+import json
+import time
+import random
+import argparse
+import itertools
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qsl
+from typing import Optional, Dict, Any, List, Iterable
+from .exchange_info import SymbolRules
+from .quantizer import SymbolQuantizer
+from .rate_limiter import RateLimiter
+
+DEFAULT_COMMISSION_RATE = 0.001
+
+
+class SimulatorError(Exception):
+    """Error dengan format body Binance ({"code": ..., "msg": ...})."""
+
+    def __init__(self, code: int, msg: str, http_status: int = 400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.http_status = http_status
+
+
+def make_symbol_info(symbol: str, base_asset: str, quote_asset: str = "USDT", tick_size: str = "0.01000000", step_size: str = "0.00001000", min_notional: str = "5.00000000") -> Dict[str, Any]:
+    """Membuat entri exchangeInfo minimal untuk satu simbol simulasi."""
+    return {
+        "symbol": symbol, "status": "TRADING", "baseAsset": base_asset, "quoteAsset": quote_asset,
+        "filters": [
+            {"filterType": "PRICE_FILTER", "minPrice": tick_size, "maxPrice": "1000000.00000000", "tickSize": tick_size},
+            {"filterType": "LOT_SIZE", "minQty": step_size, "maxQty": "900000000.00000000", "stepSize": step_size},
+            {"filterType": "NOTIONAL", "minNotional": min_notional, "applyMinToMarket": True},
+        ],
+    }
+
+
+class PricePath:
+    """
+    Jalur harga terskrip per simbol. Setiap `step()` memajukan semua simbol
+    satu titik; simbol yang jalurnya habis bertahan di harga terakhir
+    (atau kembali ke awal jika `loop=True`).
+    """
+
+    def __init__(self, paths: Dict[str, List[float]], loop: bool = False):
+        self.paths = paths
+        self.loop = loop
+        self.position = 0
+
+    @classmethod
+    def random_walk(cls, start_prices: Dict[str, float], steps: int, volatility: float = 0.01, seed: Optional[int] = None) -> "PricePath":
+        rng = random.Random(seed)
+        paths = {}
+        for symbol, price in start_prices.items():
+            path = [price]
+            for _ in range(steps - 1):
+                path.append(path[-1] * (1 + rng.gauss(0, volatility)))
+            paths[symbol] = path
+        return cls(paths)
+
+    def prices_at(self, position: int) -> Dict[str, float]:
+        prices = {}
+        for symbol, path in self.paths.items():
+            index = position % len(path) if self.loop else min(position, len(path) - 1)
+            prices[symbol] = path[index]
+        return prices
+
+    def current(self) -> Dict[str, float]:
+        return self.prices_at(self.position)
+
+    def step(self) -> Dict[str, float]:
+        self.position += 1
+        return self.current()
+
+
+class SimulatedExchange:
+    """
+    Mesin matching sederhana untuk endpoint spot yang dipakai bot.
+    Mendukung MARKET (BUY dengan quoteOrderQty / quantity, SELL), OCO dengan
+    kaki LIMIT_MAKER dan STOP_LOSS_LIMIT, pembatalan, saldo free/locked,
+    komisi, dan riwayat trade. Order resting dicocokkan setiap harga berubah.
+    """
+
+    def __init__(self, symbol_infos: Iterable[Dict[str, Any]], balances: Dict[str, float], prices: Dict[str, float], commission_rate: float = DEFAULT_COMMISSION_RATE):
+        self.symbol_infos = {info['symbol']: info for info in symbol_infos}
+        self.rules = {symbol: SymbolRules.from_symbol_info(info) for symbol, info in self.symbol_infos.items()}
+        self.quantizers = {symbol: SymbolQuantizer(rules) for symbol, rules in self.rules.items()}
+        self.balances: Dict[str, List[float]] = {asset: [float(amount), 0.0] for asset, amount in balances.items()}
+        self.prices = dict(prices)
+        self.commission_rate = commission_rate
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.order_lists: Dict[int, Dict[str, Any]] = {}
+        self.trades: List[Dict[str, Any]] = []
+        self._order_ids = itertools.count(1)
+        self._order_list_ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._routes = {
+            ("GET", "/exchangeInfo"): self._exchange_info,
+            ("GET", "/ticker/price"): self._ticker_price,
+            ("GET", "/account"): self._account,
+            ("POST", "/order"): self._new_order,
+            ("GET", "/order"): self._query_order,
+            ("DELETE", "/order"): self._cancel_order,
+            ("POST", "/order/oco"): self._new_oco_legacy,
+            ("POST", "/orderList/oco"): self._new_oco,
+            ("GET", "/orderList"): self._query_order_list,
+            ("DELETE", "/orderList"): self._cancel_order_list,
+            ("GET", "/openOrders"): self._open_orders,
+            ("DELETE", "/openOrders"): self._cancel_open_orders,
+            ("GET", "/myTrades"): self._my_trades,
+        }
+
+    # --- Harga & matching ---
+    def set_price(self, symbol: str, price: float):
+        with self._lock:
+            self.prices[symbol] = price
+            self._match(symbol)
+
+    def apply_prices(self, prices: Dict[str, float]):
+        for symbol, price in prices.items():
+            self.set_price(symbol, price)
+
+    def _match(self, symbol: str):
+        price = self.prices[symbol]
+        for order in [o for o in self.orders.values() if o['symbol'] == symbol and o['status'] == 'NEW']:
+            if order['type'] == 'LIMIT_MAKER' and price >= float(order['price']):
+                self._fill_resting(order, float(order['price']), maker=True)
+            elif order['type'] == 'STOP_LOSS_LIMIT':
+                if not order['isWorking'] and price <= float(order['stopPrice']):
+                    order['isWorking'] = True
+                if order['isWorking'] and price >= float(order['price']):
+                    self._fill_resting(order, price, maker=False)
+
+    def _fill_resting(self, order: Dict[str, Any], fill_price: float, maker: bool):
+        symbol_rules = self.rules[order['symbol']]
+        qty = float(order['origQty'])
+        self._balance(symbol_rules.base_asset)[1] -= qty
+        self._record_fill(order, qty, fill_price, maker)
+        order_list = self.order_lists.get(order['orderListId'])
+        if order_list:
+            for sibling_id in order_list['orderIds']:
+                sibling = self.orders[sibling_id]
+                if sibling['status'] == 'NEW':
+                    sibling['status'] = 'EXPIRED'
+                    sibling['updateTime'] = self._now_ms()
+            order_list['listOrderStatus'] = 'ALL_DONE'
+            order_list['listStatusType'] = 'ALL_DONE'
+
+    def _record_fill(self, order: Dict[str, Any], qty: float, price: float, maker: bool) -> Dict[str, Any]:
+        """Mencatat fill penuh: saldo, komisi (aset yang diterima), dan riwayat trade."""
+        symbol_rules = self.rules[order['symbol']]
+        quote_qty = qty * price
+        if order['side'] == 'BUY':
+            commission, commission_asset = qty * self.commission_rate, symbol_rules.base_asset
+            self._balance(symbol_rules.base_asset)[0] += qty - commission
+        else:
+            commission, commission_asset = quote_qty * self.commission_rate, symbol_rules.quote_asset
+            self._balance(symbol_rules.quote_asset)[0] += quote_qty - commission
+
+        trade_id = next(self._trade_ids)
+        now = self._now_ms()
+        order.update(status='FILLED', executedQty=self._fmt(qty), cummulativeQuoteQty=self._fmt(quote_qty), updateTime=now)
+        self.trades.append({
+            "symbol": order['symbol'], "id": trade_id, "orderId": order['orderId'], "orderListId": order['orderListId'],
+            "price": self._fmt(price), "qty": self._fmt(qty), "quoteQty": self._fmt(quote_qty),
+            "commission": self._fmt(commission), "commissionAsset": commission_asset, "time": now,
+            "isBuyer": order['side'] == 'BUY', "isMaker": maker, "isBestMatch": True,
+        })
+        return {"price": self._fmt(price), "qty": self._fmt(qty), "commission": self._fmt(commission), "commissionAsset": commission_asset, "tradeId": trade_id}
+
+    # --- Utilitas ---
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    @staticmethod
+    def _fmt(value: float) -> str:
+        return f"{value:.8f}"
+
+    def _balance(self, asset: str) -> List[float]:
+        return self.balances.setdefault(asset, [0.0, 0.0])
+
+    def _rules_for(self, params: Dict[str, Any]) -> SymbolRules:
+        symbol = params.get('symbol')
+        if symbol not in self.rules:
+            raise SimulatorError(-1121, "Invalid symbol.")
+        return self.rules[symbol]
+
+    def _new_order_record(self, symbol: str, side: str, order_type: str, qty: float, price: float = 0.0, stop_price: float = 0.0, order_list_id: int = -1) -> Dict[str, Any]:
+        order_id = next(self._order_ids)
+        now = self._now_ms()
+        order = {
+            "symbol": symbol, "orderId": order_id, "orderListId": order_list_id, "clientOrderId": f"sim{order_id}",
+            "price": self._fmt(price), "origQty": self._fmt(qty), "executedQty": self._fmt(0), "cummulativeQuoteQty": self._fmt(0),
+            "status": "NEW", "timeInForce": "GTC", "type": order_type, "side": side, "stopPrice": self._fmt(stop_price),
+            "time": now, "updateTime": now, "isWorking": order_type == 'LIMIT_MAKER',
+        }
+        self.orders[order_id] = order
+        return order
+
+    def _check_filters(self, symbol: str, qty: float, price: float):
+        error = self.quantizers[symbol].validate(qty, price)
+        if error:
+            raise SimulatorError(-1013, f"Filter failure: {error}")
+
+    def _lock_base(self, rules: SymbolRules, qty: float):
+        balance = self._balance(rules.base_asset)
+        if balance[0] + 1e-12 < qty:
+            raise SimulatorError(-2010, "Account has insufficient balance for requested action.")
+        balance[0] -= qty
+        balance[1] += qty
+
+    # --- Endpoint ---
+    def handle(self, method: str, endpoint: str, params: Dict[str, Any]) -> Any:
+        route = self._routes.get((method.upper(), endpoint))
+        if route is None:
+            raise SimulatorError(-1000, f"Endpoint {method} {endpoint} tidak didukung simulator.", http_status=404)
+        with self._lock:
+            return route(params)
+
+    def _exchange_info(self, params):
+        return {"timezone": "UTC", "serverTime": self._now_ms(), "symbols": list(self.symbol_infos.values())}
+
+    def _ticker_price(self, params):
+        if 'symbol' in params:
+            self._rules_for(params)
+            return {"symbol": params['symbol'], "price": self._fmt(self.prices[params['symbol']])}
+        symbols = json.loads(params['symbols']) if 'symbols' in params else list(self.prices)
+        unknown = [s for s in symbols if s not in self.prices]
+        if unknown:
+            raise SimulatorError(-1121, "Invalid symbol.")
+        return [{"symbol": s, "price": self._fmt(self.prices[s])} for s in symbols]
+
+    def _account(self, params):
+        return {
+            "canTrade": True, "updateTime": self._now_ms(),
+            "balances": [{"asset": a, "free": self._fmt(f), "locked": self._fmt(l)} for a, (f, l) in self.balances.items()],
+        }
+
+    def _new_order(self, params):
+        rules = self._rules_for(params)
+        symbol, side, order_type = rules.symbol, params.get('side'), params.get('type')
+        if order_type != 'MARKET':
+            raise SimulatorError(-1116, "Simulator hanya mendukung order tunggal bertipe MARKET.")
+        price = self.prices[symbol]
+        quantizer = self.quantizers[symbol]
+
+        if side == 'BUY':
+            if 'quoteOrderQty' in params:
+                qty = float(quantizer.quantize_qty(float(params['quoteOrderQty']) / price))
+            else:
+                qty = float(params['quantity'])
+            self._check_filters(symbol, qty, price)
+            quote_balance = self._balance(rules.quote_asset)
+            if quote_balance[0] + 1e-9 < qty * price:
+                raise SimulatorError(-2010, "Account has insufficient balance for requested action.")
+            quote_balance[0] -= qty * price
+        elif side == 'SELL':
+            qty = float(params['quantity'])
+            self._check_filters(symbol, qty, price)
+            base_balance = self._balance(rules.base_asset)
+            if base_balance[0] + 1e-12 < qty:
+                raise SimulatorError(-2010, "Account has insufficient balance for requested action.")
+            base_balance[0] -= qty
+        else:
+            raise SimulatorError(-1102, "Parameter 'side' tidak valid.")
+
+        order = self._new_order_record(symbol, side, 'MARKET', qty)
+        fill = self._record_fill(order, qty, price, maker=False)
+        response = {key: order[key] for key in ("symbol", "orderId", "orderListId", "clientOrderId", "price", "origQty", "executedQty", "cummulativeQuoteQty", "status", "timeInForce", "type", "side")}
+        response["transactTime"] = order['updateTime']
+        if params.get('newOrderRespType', 'FULL') == 'FULL':
+            response["fills"] = [fill]
+        return response
+
+    def _place_oco(self, rules: SymbolRules, qty: float, take_profit: float, stop_price: float, stop_limit: float):
+        symbol = rules.symbol
+        price = self.prices[symbol]
+        if take_profit <= price:
+            raise SimulatorError(-2010, "Order would immediately match and take.")
+        if stop_price >= price:
+            raise SimulatorError(-2010, "Stop price would trigger immediately.")
+        for leg_price in (take_profit, stop_limit):
+            self._check_filters(symbol, qty, leg_price)
+        self._lock_base(rules, qty)
+
+        order_list_id = next(self._order_list_ids)
+        stop_order = self._new_order_record(symbol, 'SELL', 'STOP_LOSS_LIMIT', qty, stop_limit, stop_price, order_list_id)
+        limit_order = self._new_order_record(symbol, 'SELL', 'LIMIT_MAKER', qty, take_profit, 0.0, order_list_id)
+        self.order_lists[order_list_id] = {
+            "orderListId": order_list_id, "contingencyType": "OCO", "listStatusType": "EXEC_STARTED",
+            "listOrderStatus": "EXECUTING", "listClientOrderId": f"simlist{order_list_id}", "transactionTime": self._now_ms(),
+            "symbol": symbol, "orderIds": [stop_order['orderId'], limit_order['orderId']],
+        }
+        return self._order_list_response(order_list_id, with_reports=True)
+
+    def _new_oco_legacy(self, params):
+        rules = self._rules_for(params)
+        return self._place_oco(rules, float(params['quantity']), float(params['price']), float(params['stopPrice']), float(params['stopLimitPrice']))
+
+    def _new_oco(self, params):
+        rules = self._rules_for(params)
+        if params.get('aboveType') != 'LIMIT_MAKER' or params.get('belowType') != 'STOP_LOSS_LIMIT':
+            raise SimulatorError(-1116, "Simulator hanya mendukung OCO LIMIT_MAKER + STOP_LOSS_LIMIT.")
+        return self._place_oco(rules, float(params['quantity']), float(params['abovePrice']), float(params['belowStopPrice']), float(params['belowPrice']))
+
+    def _order_list_response(self, order_list_id: int, with_reports: bool = False) -> Dict[str, Any]:
+        order_list = self.order_lists[order_list_id]
+        response = {key: order_list[key] for key in ("orderListId", "contingencyType", "listStatusType", "listOrderStatus", "listClientOrderId", "transactionTime", "symbol")}
+        response["orders"] = [{"symbol": order_list['symbol'], "orderId": oid, "clientOrderId": self.orders[oid]['clientOrderId']} for oid in order_list['orderIds']]
+        if with_reports:
+            response["orderReports"] = [dict(self.orders[oid]) for oid in order_list['orderIds']]
+        return response
+
+    def _query_order(self, params):
+        order = self.orders.get(int(params.get('orderId', 0)))
+        if not order:
+            raise SimulatorError(-2013, "Order does not exist.")
+        return dict(order)
+
+    def _cancel_single(self, order: Dict[str, Any]):
+        if order['status'] != 'NEW':
+            return
+        if order['side'] == 'SELL':
+            balance = self._balance(self.rules[order['symbol']].base_asset)
+            qty = float(order['origQty'])
+            balance[0] += qty
+            balance[1] -= qty
+        order['status'] = 'CANCELED'
+        order['updateTime'] = self._now_ms()
+
+    def _cancel_order(self, params):
+        order = self.orders.get(int(params.get('orderId', 0)))
+        if not order or order['status'] != 'NEW':
+            raise SimulatorError(-2011, "Unknown order sent.")
+        if order['orderListId'] != -1:
+            return self._cancel_order_list({"orderListId": order['orderListId']})
+        self._cancel_single(order)
+        return dict(order)
+
+    def _query_order_list(self, params):
+        order_list_id = int(params.get('orderListId', 0))
+        if order_list_id not in self.order_lists:
+            raise SimulatorError(-2013, "Order list does not exist.")
+        return self._order_list_response(order_list_id)
+
+    def _cancel_order_list(self, params):
+        order_list = self.order_lists.get(int(params.get('orderListId', 0)))
+        if not order_list or order_list['listOrderStatus'] == 'ALL_DONE':
+            raise SimulatorError(-2011, "Unknown order sent.")
+        # Kuantitas dikunci sekali untuk seluruh OCO, jadi hanya dilepas sekali.
+        # Saldo sudah bebas saat respons pembatalan dikirim, seperti di Binance.
+        released = False
+        for oid in order_list['orderIds']:
+            order = self.orders[oid]
+            if order['status'] != 'NEW':
+                continue
+            if not released:
+                self._cancel_single(order)
+                released = True
+            else:
+                order['status'] = 'CANCELED'
+                order['updateTime'] = self._now_ms()
+        order_list['listOrderStatus'] = 'ALL_DONE'
+        order_list['listStatusType'] = 'ALL_DONE'
+        return self._order_list_response(order_list['orderListId'], with_reports=True)
+
+    def _open_orders(self, params):
+        symbol = params.get('symbol')
+        return [dict(o) for o in self.orders.values() if o['status'] == 'NEW' and (symbol is None or o['symbol'] == symbol)]
+
+    def _cancel_open_orders(self, params):
+        rules = self._rules_for(params)
+        canceled = []
+        for order_list in list(self.order_lists.values()):
+            if order_list['symbol'] == rules.symbol and order_list['listOrderStatus'] != 'ALL_DONE':
+                canceled.append(self._cancel_order_list({"orderListId": order_list['orderListId']}))
+        for order in self.orders.values():
+            if order['symbol'] == rules.symbol and order['status'] == 'NEW':
+                self._cancel_single(order)
+                canceled.append(dict(order))
+        if not canceled:
+            raise SimulatorError(-2011, "Unknown order sent.")
+        return canceled
+
+    def _my_trades(self, params):
+        rules = self._rules_for(params)
+        limit = int(params.get('limit', 500))
+        trades = [t for t in self.trades if t['symbol'] == rules.symbol]
+        return trades[-limit:]
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    server_version = "BinanceSimulator/1.0"
+    API_PREFIX = "/api/v3"
+    SIGNATURE_PARAMS = {"timestamp", "recvWindow", "signature"}
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self, method: str):
+        simulator: "SimulatorServer" = self.server.simulator
+        parsed = urlparse(self.path)
+        params = dict(parse_qsl(parsed.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            params.update(parse_qsl(self.rfile.read(length).decode('utf-8')))
+        signed = 'signature' in params
+        for key in self.SIGNATURE_PARAMS:
+            params.pop(key, None)
+
+        endpoint = parsed.path[len(self.API_PREFIX):] if parsed.path.startswith(self.API_PREFIX) else parsed.path
+        if simulator.latency:
+            time.sleep(simulator.latency + random.uniform(0, simulator.jitter))
+
+        try:
+            status, body = 200, simulator.exchange.handle(method, endpoint, params)
+        except SimulatorError as e:
+            status, body = e.http_status, {"code": e.code, "msg": e.msg}
+        except (KeyError, ValueError) as e:
+            status, body = 400, {"code": -1102, "msg": f"Parameter wajib tidak ada atau tidak valid: {e}"}
+
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-MBX-USED-WEIGHT-1M", str(simulator.record_weight(method, endpoint, params, signed)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class SimulatorServer:
+    """
+    Server HTTP lokal (ThreadingHTTPServer) yang melayani SimulatedExchange
+    di bawah /api/v3. Arahkan klien ke `base_url` (lewat env BINANCE_API_URL
+    atau atribut BASE_API_URL) untuk menjalankan bot tanpa uang & jaringan asli.
+    """
+
+    def __init__(self, exchange: SimulatedExchange, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0):
+        self.exchange = exchange
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._weight_lock = threading.Lock()
+        self._weight_window = 0
+        self._used_weight = 0
+        self.request_count = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/api/v3"
+
+    def record_weight(self, method: str, endpoint: str, params: Dict[str, Any], signed: bool) -> int:
+        """Menghitung bobot request per menit seperti header X-MBX-USED-WEIGHT-1M."""
+        weight, _, _ = RateLimiter.classify(method, endpoint, params, signed)
+        with self._weight_lock:
+            self.request_count += 1
+            minute = int(time.time() // 60)
+            if minute != self._weight_window:
+                self._weight_window, self._used_weight = minute, 0
+            self._used_weight += weight
+            return self._used_weight
+
+    def start(self) -> "SimulatorServer":
+        self._httpd = ThreadingHTTPServer((self.host, self.port), _SimulatorHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.simulator = self
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="binance-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def demo_exchange(start_prices: Dict[str, float], usdt_balance: float = 10000.0) -> SimulatedExchange:
+    """Membuat SimulatedExchange berisi simbol *USDT dengan filter standar."""
+    infos = [make_symbol_info(symbol, symbol[:-4]) for symbol in start_prices]
+    return SimulatedExchange(infos, {"USDT": usdt_balance}, start_prices)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Simulator REST spot Binance untuk pengujian lokal.")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.0, help="Jeda tiap request (detik).")
+    parser.add_argument("--tick", type=float, default=1.0, help="Interval langkah harga random walk (detik).")
+    parser.add_argument("--usdt", type=float, default=10000.0)
+    parser.add_argument("--symbols", default="BTCUSDT:65000,ETHUSDT:3000,SOLUSDT:150")
+    args = parser.parse_args(argv)
+
+    start_prices = {pair.split(':')[0]: float(pair.split(':')[1]) for pair in args.symbols.split(',')}
+    exchange = demo_exchange(start_prices, args.usdt)
+    path = PricePath.random_walk(start_prices, steps=100000, volatility=0.002)
+    with SimulatorServer(exchange, port=args.port, latency=args.latency) as server:
+        print(f"Simulator Binance berjalan di {server.base_url} (CTRL+C untuk berhenti)")
+        try:
+            while True:
+                time.sleep(args.tick)
+                exchange.apply_prices(path.step())
+        except KeyboardInterrupt:
+            sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
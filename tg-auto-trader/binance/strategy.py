@@ -1,5 +1,5 @@
 # Auto Trade Bot/binance/strategy.py
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 import config
 from .client import BinanceClient
@@ -19,6 +19,30 @@ class TradingStrategy:
         - SKIP: Harga di atas entry price.
         - FAIL: Sinyal sudah tidak valid atau data kurang.
         """
+        failed_decision = self._precheck_signal(signal)
+        if failed_decision:
+            return failed_decision
+
+        current_price = self.client.get_current_price(signal["coin_pair"])
+        return self._decide_with_price(signal, current_price)
+
+    def evaluate_new_signals(self, signals: List[Dict[str, Any]]) -> List[TradeDecision]:
+        """
+        Mengevaluasi banyak sinyal sekaligus dengan satu snapshot harga.
+        Harga semua sinyal yang lolos pra-pengecekan diambil dalam satu batch,
+        sehingga biaya jaringan tidak bertambah seiring jumlah sinyal.
+        """
+        prechecked = [(signal, self._precheck_signal(signal)) for signal in signals]
+        pending_pairs = [signal["coin_pair"] for signal, failed in prechecked if failed is None]
+        price_snapshot = self.client.get_prices(pending_pairs) if pending_pairs else {}
+
+        return [
+            failed if failed else self._decide_with_price(signal, price_snapshot.get(signal["coin_pair"]))
+            for signal, failed in prechecked
+        ]
+
+    def _precheck_signal(self, signal: Dict[str, Any]) -> Optional[TradeDecision]:
+        """Pengecekan yang tidak membutuhkan harga. Mengembalikan keputusan FAIL atau None."""
         coin_pair = signal.get("coin_pair")
         entry_price = signal.get("entry_price")
         risk_level = signal.get("risk_level") # Ambil risk level dari sinyal
@@ -48,7 +72,13 @@ class TradingStrategy:
         if not coin_pair or entry_price is None:
             return TradeDecision(decision="FAIL", coin_pair=coin_pair or "N/A", reason="Sinyal tidak valid: 'coin_pair' atau 'entry_price' tidak ditemukan.", risk_level=risk_level)
 
-        current_price = self.client.get_current_price(coin_pair)
+        return None
+
+    def _decide_with_price(self, signal: Dict[str, Any], current_price: Optional[float]) -> TradeDecision:
+        coin_pair = signal.get("coin_pair")
+        entry_price = signal.get("entry_price")
+        risk_level = signal.get("risk_level")
+
         if current_price is None:
             return TradeDecision(decision="FAIL", coin_pair=coin_pair, entry_price=entry_price, reason=f"Gagal mendapatkan harga terkini untuk {coin_pair}.", risk_level=risk_level)
 
@@ -61,8 +91,8 @@ class TradingStrategy:
             return TradeDecision(decision="FAIL", coin_pair=coin_pair, reason="Sinyal tidak memiliki data Stop Loss (SL1) yang valid untuk divalidasi.", current_price=current_price, risk_level=risk_level)
         
         if current_price <= entry_price:
-            targets = [TargetInfo(**t) for t in signal.get("targets", [])]
-            stop_losses = [StopLossInfo(**sl) for sl in signal.get("stop_losses", [])]
+            targets = [TargetInfo.from_dict(t) for t in signal.get("targets", [])]
+            stop_losses = [StopLossInfo.from_dict(sl) for sl in signal.get("stop_losses", [])]
             
             return TradeDecision(
                 decision="BUY",
@@ -0,0 +1,47 @@
+# Auto Trade Bot/binance/stream.py
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from typing import Optional
+
+class BackgroundStream(ABC):
+    """
+    Kelas dasar untuk consumer WebSocket Binance. Subclass mengimplementasikan
+    `run()`; stream bisa dijalankan sebagai task di event loop yang ada, atau
+    lewat `start()` di thread latar belakang agar kode sinkron tetap terlayani.
+    """
+    thread_name = "binance-stream"
+
+    def __init__(self, reconnect_delay: float = 5.0):
+        self.reconnect_delay = reconnect_delay
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    async def run(self):
+        """Loop koneksi stream; berjalan hingga `stop()` dipanggil."""
+
+    def start(self):
+        """Menjalankan stream di thread latar belakang (untuk kode sinkron)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._thread_main, name=self.thread_name, daemon=True)
+        self._thread.start()
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self.run())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    def stop(self):
+        self._stopped = True
+        if self._loop and self._task and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._task.cancel)
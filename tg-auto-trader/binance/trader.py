@@ -1,107 +1,130 @@
 # Auto Trade Bot/binance/trader.py
 import time
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Optional
 from .client import BinanceClient
+from .user_stream import UserDataStream
+from .execution import ExecutionContext
+from .models import TradeDecision
 
 class Trader:
     """
     Bertanggung jawab untuk mengeksekusi trade berdasarkan keputusan yang sudah dianalisis.
     """
-    def __init__(self, client: BinanceClient, usdt_per_trade: float):
+    def __init__(self, client: BinanceClient, usdt_per_trade: float, account_stream: Optional[UserDataStream] = None):
         self.client = client
         self.usdt_per_trade = usdt_per_trade
+        self.account_stream = account_stream
 
-    def can_execute_trade(self, decision: Dict[str, Any], account_summary: Dict[str, Any]) -> Tuple[bool, str]:
+    def can_execute_trade(self, decision: TradeDecision, context: ExecutionContext) -> Tuple[bool, str]:
         """
-        --- FUNGSI BARU ---
         Melakukan semua pemeriksaan pra-pembelian tanpa mengeksekusi order.
+        Semua data dibaca dari `context` (snapshot pass eksekusi), tanpa request ke Binance.
         Mengembalikan (True, "Alasan") jika bisa dieksekusi, atau (False, "Alasan") jika tidak.
         """
-        coin_pair = decision["coin_pair"]
+        coin_pair = decision.coin_pair
         base_asset = coin_pair.replace("USDT", "")
 
         # Pengecekan 1: Order Aktif
-        open_orders = self.client.get_open_orders(symbol=coin_pair)
+        open_orders = context.open_orders(coin_pair)
         if open_orders:
             return (False, f"Ditemukan {len(open_orders)} order aktif untuk {coin_pair}.")
 
         # Pengecekan 2: Saldo USDT
-        usdt_balance = next((asset['free_balance'] for asset in account_summary.get('held_assets', []) if asset['asset'] == 'USDT'), 0)
+        usdt_balance = context.free_balance('USDT')
         if usdt_balance < self.usdt_per_trade:
             return (False, f"Saldo USDT tidak cukup. Tersedia: ${usdt_balance:.2f}, Dibutuhkan: ${self.usdt_per_trade:.2f}")
 
         # Pengecekan 3: Aset Sudah Dimiliki
-        held_asset_value = next((asset['value_in_usdt'] for asset in account_summary.get('held_assets', []) if asset['asset'] == base_asset), 0)
+        held_asset_value = context.held_value(base_asset)
         if held_asset_value >= (self.usdt_per_trade * 0.5):
              return (False, f"Aset {base_asset} sudah dimiliki dengan nilai signifikan (${held_asset_value:.2f}).")
 
         # Pengecekan 4: Aturan Trading (Minimum Notional)
-        symbol_info = self.client.get_symbol_info(coin_pair)
-        if not symbol_info:
+        rules = context.symbol_rules(coin_pair)
+        if not rules:
             return (False, f"Tidak dapat menemukan aturan trading untuk {coin_pair}.")
         
-        min_notional_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'MIN_NOTIONAL'), None)
-        if min_notional_filter and self.usdt_per_trade < float(min_notional_filter['minNotional']):
-            reason = f"Jumlah trade (${self.usdt_per_trade}) di bawah minimum (${float(min_notional_filter['minNotional'])}) untuk {coin_pair}."
+        if rules.notional and self.usdt_per_trade < rules.notional.min_notional:
+            reason = f"Jumlah trade (${self.usdt_per_trade}) di bawah minimum (${rules.notional.min_notional}) untuk {coin_pair}."
             return (False, reason)
 
         return (True, "Semua pengecekan lolos, siap untuk dieksekusi.")
 
 
-    def execute_trade(self, decision: Dict[str, Any], account_summary: Dict[str, Any]) -> Dict[str, Any]:
+    def execute_trade(self, decision: TradeDecision, context: ExecutionContext) -> Dict[str, Any]:
         """
         Mengeksekusi satu trade, dengan memanggil can_execute_trade terlebih dahulu.
+        Fill dan OCO yang berhasil dicatat ke `context` agar keputusan berikutnya melihat saldo terbaru.
         """
-        # --- PERUBAHAN: Panggil fungsi pengecekan terlebih dahulu ---
-        is_buyable, reason = self.can_execute_trade(decision, account_summary)
+        is_buyable, reason = self.can_execute_trade(decision, context)
         if not is_buyable:
             return {"status": "SKIP", "reason": reason}
 
-        coin_pair = decision["coin_pair"]
+        coin_pair = decision.coin_pair
         base_asset = coin_pair.replace("USDT", "")
         
         print(f"Memulai proses pembelian untuk {coin_pair}...")
+        stream_mark = self.account_stream.mark() if self.account_stream else 0
         
-        buy_order = self.client.place_market_buy_order(symbol=coin_pair, quote_order_qty=self.usdt_per_trade)
-        if not buy_order or buy_order.get('status') != 'FILLED':
-            return {"status": "FAIL", "reason": "Market buy order gagal dieksekusi atau tidak terisi penuh.", "details": buy_order}
+        fill = self.client.place_market_buy_order(symbol=coin_pair, quote_order_qty=self.usdt_per_trade)
+        if not fill or not fill.is_filled:
+            return {"status": "FAIL", "reason": "Market buy order gagal dieksekusi atau tidak terisi penuh.", "details": fill.raw if fill else None}
 
-        initial_filled_qty = float(buy_order['executedQty'])
-        avg_price = float(buy_order['cummulativeQuoteQty']) / initial_filled_qty
-        print(f"Berhasil membeli {initial_filled_qty:.6f} {base_asset} @ ~${avg_price:.4f}")
-        
-        print("Menunggu & mengambil saldo aktual untuk menempatkan OCO...")
-        time.sleep(2) 
-        updated_account_info = self.client.get_account_info()
-        if not updated_account_info:
-             return {"status": "CRITICAL_FAIL", "reason": "Aset dibeli tetapi GAGAL mengambil saldo terbaru untuk OCO.", "buy_order": buy_order}
-
-        actual_balance = 0.0
-        for balance in updated_account_info.get('balances', []):
-            if balance['asset'] == base_asset:
-                actual_balance = float(balance['free'])
-                break
-        
-        if actual_balance <= 0:
-            return {"status": "CRITICAL_FAIL", "reason": f"Aset dibeli tetapi saldo {base_asset} tidak ditemukan atau nol.", "buy_order": buy_order}
-        
-        print(f"Saldo aktual terdeteksi: {actual_balance} {base_asset}. Menggunakan jumlah ini untuk OCO.")
+        buy_order = fill.raw
+        context.record_buy(fill, base_asset)
+        print(f"Berhasil membeli {fill.executed_qty:.6f} {base_asset} @ ~${fill.avg_price:.4f} (bersih setelah komisi: {fill.net_qty} {base_asset})")
 
         try:
-            tp_price = decision['targets'][3]['price']
-            sl_price = decision['stop_losses'][0]['price']
-        except (IndexError, KeyError):
+            tp_price = decision.targets[3].price
+            sl_price = decision.stop_losses[0].price
+        except IndexError:
             return {"status": "CRITICAL_FAIL", "reason": "Data TP4 atau SL1 tidak ditemukan pada sinyal.", "buy_order": buy_order}
             
+        # Kuantitas bersih dari fill langsung dipakai: saldo sudah terupdate saat respons order diterima
         print(f"Menempatkan OCO Order: TP=${tp_price}, SL=${sl_price}")
+        oco_quantity = fill.net_qty
         oco_order = self.client.place_oco_sell_order(
             symbol=coin_pair,
-            quantity=actual_balance,
+            quantity=oco_quantity,
             take_profit_price=tp_price,
             stop_loss_price=sl_price
         )
 
+        if not oco_order:
+            # Cadangan: baca saldo aktual (stream atau /account) lalu coba sekali lagi
+            actual_balance = self.get_free_balance_after(base_asset, stream_mark)
+            if actual_balance:
+                print(f"Mencoba ulang OCO dengan saldo aktual: {actual_balance} {base_asset}")
+                oco_quantity = actual_balance
+                oco_order = self.client.place_oco_sell_order(
+                    symbol=coin_pair,
+                    quantity=actual_balance,
+                    take_profit_price=tp_price,
+                    stop_loss_price=sl_price
+                )
+
         if not oco_order:
             return {"status": "CRITICAL_FAIL", "reason": "Aset berhasil dibeli tetapi GAGAL menempatkan OCO order.", "buy_order": buy_order, "details": "Cek error body dari Binance."}
-        
-        return {"status": "SUCCESS", "reason": "Pembelian dan penempatan OCO berhasil.", "buy_order": buy_order, "oco_order": oco_order}
\ No newline at end of file
+
+        context.record_oco(coin_pair, base_asset, oco_order, oco_quantity)
+        return {"status": "SUCCESS", "reason": "Pembelian dan penempatan OCO berhasil.", "buy_order": buy_order, "oco_order": oco_order}
+
+    def get_free_balance_after(self, base_asset: str, stream_mark: int) -> Optional[float]:
+        """
+        Mengambil saldo free aset setelah order terisi/dibatalkan. Jika user data stream aktif,
+        saldo dibaca dari event outboundAccountPosition tanpa jeda tetap;
+        jika tidak, kembali ke cara lama (jeda lalu /account).
+        """
+        if self.account_stream and self.account_stream.is_live:
+            balance = self.account_stream.wait_for_balance_update(base_asset, stream_mark, timeout=2.0)
+            if balance is not None:
+                return balance
+            print(f"Event saldo {base_asset} belum diterima dari stream. Menggunakan /account...")
+        else:
+            print("Menunggu & mengambil saldo aktual dari /account...")
+            time.sleep(2)
+
+        updated_account_info = self.client.get_account_info()
+        if not updated_account_info:
+            return None
+        return next((float(b['free']) for b in updated_account_info.get('balances', []) if b['asset'] == base_asset), 0.0)
@@ -0,0 +1,192 @@
+# Auto Trade Bot/binance/user_stream.py
+import os
+import json
+import time
+import asyncio
+import threading
+import websockets
+from typing import Optional, Dict, Any, Tuple
+from .client import BinanceClient
+from .stream import BackgroundStream
+
+DEFAULT_STREAM_BASE_URL = os.getenv("BINANCE_USER_STREAM_URL", "wss://stream.binance.com:9443/ws")
+
+
+class UserDataStream(BackgroundStream):
+    """
+    Consumer user data stream Binance berbasis listenKey.
+    Menjaga cermin saldo dan status order di memori dari event
+    `outboundAccountPosition`, `balanceUpdate`, `executionReport` dan
+    `listStatus`, sehingga trader tidak perlu tidur lalu memanggil /account
+    setelah setiap order.
+
+    Jika `client` bernilai None, stream langsung terhubung ke
+    `stream_base_url` tanpa listenKey (dipakai dengan server replay lokal).
+    """
+    thread_name = "user-data-stream"
+    KEEPALIVE_SECONDS = 30 * 60
+
+    def __init__(self, client: Optional[BinanceClient], stream_base_url: str = DEFAULT_STREAM_BASE_URL, reconnect_delay: float = 5.0):
+        super().__init__(reconnect_delay)
+        self.client = client
+        self.stream_base_url = stream_base_url
+        # asset -> (free, locked)
+        self._balances: Dict[str, Tuple[float, float]] = {}
+        # asset -> nomor urut event terakhir yang memperbarui saldonya
+        self._balance_seq: Dict[str, int] = {}
+        self._orders: Dict[int, Dict[str, Any]] = {}
+        self._order_lists: Dict[int, Dict[str, Any]] = {}
+        self._event_seq = 0
+        self._condition = threading.Condition()
+        self._connected = False
+        self.last_event_at = 0.0
+
+    @property
+    def is_live(self) -> bool:
+        """True jika stream terhubung dan cermin saldo sudah diinisialisasi."""
+        return self._connected and bool(self._balances)
+
+    def mark(self) -> int:
+        """Nomor urut event saat ini; dipakai untuk menunggu event yang datang setelahnya."""
+        return self._event_seq
+
+    # --- Pemrosesan event ---
+    def seed_from_account(self, account_info: Optional[Dict[str, Any]]) -> bool:
+        """
+        Mengganti cermin saldo dengan snapshot /account (saat awal atau setelah reconnect).
+        Mengembalikan False jika snapshot tidak valid; cermin tidak diubah.
+        """
+        if not account_info or 'balances' not in account_info:
+            return False
+        with self._condition:
+            self._balances = {b['asset']: (float(b['free']), float(b['locked'])) for b in account_info['balances']}
+            self._condition.notify_all()
+        return True
+
+    def invalidate(self):
+        """Membuang cermin saat koneksi putus: event selama terputus tidak pernah diterima, jadi isinya basi."""
+        with self._condition:
+            self._connected = False
+            self._balances = {}
+            self._balance_seq = {}
+            self._orders = {}
+            self._order_lists = {}
+            self._condition.notify_all()
+
+    def handle_message(self, raw_message: str):
+        try:
+            event = json.loads(raw_message)
+        except json.JSONDecodeError:
+            return
+        if isinstance(event, dict) and 'data' in event and 'e' not in event:
+            event = event['data']
+        if isinstance(event, dict):
+            self.handle_event(event)
+
+    def handle_event(self, event: Dict[str, Any]):
+        event_type = event.get('e')
+        with self._condition:
+            self._event_seq += 1
+            self.last_event_at = time.time()
+
+            if event_type == 'outboundAccountPosition':
+                for balance in event.get('B', []):
+                    self._balances[balance['a']] = (float(balance['f']), float(balance['l']))
+                    self._balance_seq[balance['a']] = self._event_seq
+            elif event_type == 'balanceUpdate':
+                asset = event['a']
+                free, locked = self._balances.get(asset, (0.0, 0.0))
+                self._balances[asset] = (free + float(event['d']), locked)
+                self._balance_seq[asset] = self._event_seq
+            elif event_type == 'executionReport':
+                self._orders[event['i']] = {
+                    "symbol": event.get('s'),
+                    "side": event.get('S'),
+                    "type": event.get('o'),
+                    "status": event.get('X'),
+                    "orderListId": event.get('g', -1),
+                    "price": event.get('p'),
+                    "stopPrice": event.get('P'),
+                    "origQty": event.get('q'),
+                    "executedQty": event.get('z'),
+                    "cummulativeQuoteQty": event.get('Z'),
+                    "updateTime": event.get('T') or event.get('E'),
+                }
+            elif event_type == 'listStatus':
+                self._order_lists[event['g']] = {
+                    "symbol": event.get('s'),
+                    "listStatusType": event.get('l'),
+                    "listOrderStatus": event.get('L'),
+                    "updateTime": event.get('T') or event.get('E'),
+                }
+            self._condition.notify_all()
+
+    # --- Pembacaan cermin ---
+    def get_free_balance(self, asset: str) -> Optional[float]:
+        balance = self._balances.get(asset)
+        return balance[0] if balance else None
+
+    def get_order(self, order_id: int) -> Optional[Dict[str, Any]]:
+        return self._orders.get(order_id)
+
+    def get_order_list(self, order_list_id: int) -> Optional[Dict[str, Any]]:
+        return self._order_lists.get(order_list_id)
+
+    def account_snapshot(self) -> Dict[str, Any]:
+        """Cermin saldo dalam format yang sama dengan respons /account."""
+        with self._condition:
+            return {"balances": [
+                {"asset": asset, "free": free, "locked": locked}
+                for asset, (free, locked) in self._balances.items()
+            ]}
+
+    def wait_for_balance_update(self, asset: str, since_seq: int, timeout: float = 2.0) -> Optional[float]:
+        """
+        Menunggu event saldo `asset` yang datang setelah `since_seq` (lihat `mark()`).
+        Mengembalikan saldo free terbaru, atau None jika timeout.
+        """
+        with self._condition:
+            updated = self._condition.wait_for(lambda: self._balance_seq.get(asset, 0) > since_seq, timeout=timeout)
+            balance = self._balances.get(asset) if updated else None
+            return balance[0] if balance else None
+
+    # --- Koneksi ---
+    async def _keepalive(self, listen_key: str):
+        while True:
+            await asyncio.sleep(self.KEEPALIVE_SECONDS)
+            if not await asyncio.to_thread(self.client.keepalive_listen_key, listen_key):
+                print("Gagal memperpanjang listenKey user data stream.")
+
+    async def run(self):
+        """Terhubung ke user data stream dan memperbarui cermin hingga `stop()` dipanggil."""
+        while not self._stopped:
+            keepalive_task = None
+            try:
+                stream_url = self.stream_base_url
+                if self.client is not None:
+                    listen_key = await asyncio.to_thread(self.client.create_listen_key)
+                    if not listen_key:
+                        raise ConnectionError("Gagal membuat listenKey.")
+                    stream_url = f"{self.stream_base_url}/{listen_key}"
+                    keepalive_task = asyncio.create_task(self._keepalive(listen_key))
+
+                async with websockets.connect(stream_url, ping_interval=20) as ws:
+                    # Snapshot diambil setelah terhubung agar tidak ada event yang terlewat;
+                    # stream baru dianggap live setelah cermin berhasil diisi ulang
+                    if self.client is not None:
+                        if not self.seed_from_account(await asyncio.to_thread(self.client.get_account_info)):
+                            raise ConnectionError("Gagal mengambil snapshot /account untuk cermin saldo.")
+                    self._connected = True
+                    print("Terhubung ke user data stream Binance.")
+                    async for message in ws:
+                        self.handle_message(message)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"User data stream terputus: {e!r}. Mencoba lagi dalam {self.reconnect_delay} detik...")
+            finally:
+                self.invalidate()
+                if keepalive_task:
+                    keepalive_task.cancel()
+            if not self._stopped:
+                await asyncio.sleep(self.reconnect_delay)
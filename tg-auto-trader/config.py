@@ -10,6 +10,8 @@ API_HASH = os.getenv("TELEGRAM_API_HASH")
 PHONE_NUMBER = os.getenv("TELEGRAM_PHONE_NUMBER")
 TARGET_CHAT_ID = int(os.getenv("TELEGRAM_TARGET_CHAT_ID", 0))
 SESSION_NAME = "trading_bot_session"
+# Batas pesan yang diambil saat mengejar ketertinggalan dari watermark (setelah downtime)
+TELEGRAM_CATCH_UP_LIMIT = int(os.getenv("TELEGRAM_CATCH_UP_LIMIT", 500))
 
 # Konfigurasi Binance
 BINANCE_API_KEY = None
@@ -27,6 +29,22 @@ TRAILING_ENABLED = os.getenv("TRAILING_ENABLED", "False").lower() in ('true', '1
 MIN_TRAILING_TP_LEVEL = int(os.getenv("MIN_TRAILING_TP_LEVEL", 1))
 TRAILING_TRIGGER_PERCENTAGE = float(os.getenv("TRAILING_TRIGGER_PERCENTAGE", 0.005))
 
+# Jumlah posisi yang dikelola bersamaan dalam satu pass manajemen
+MANAGE_MAX_WORKERS = int(os.getenv("MANAGE_MAX_WORKERS", 4))
+
+# Konfigurasi Pipeline Autoloop
+# Jeda (detik) antar pass manajemen posisi, terpisah dari jeda fetch Telegram (--delay)
+MANAGE_INTERVAL_SECONDS = int(os.getenv("MANAGE_INTERVAL_SECONDS", 15))
+# Ukuran antrean antar tahap; tahap sebelumnya menunggu jika antrean penuh
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", 2))
+# Snapshot JSON di data/ (parsed_messages, new_signals, trade_decisions, ...) ditulis di latar belakang.
+# Tahap-tahap saling mengoper data di memori; snapshot hanya dibutuhkan aksi 'decide'/'execute' yang dijalankan terpisah.
+SNAPSHOTS_ENABLED = os.getenv("SNAPSHOTS_ENABLED", "True").lower() in ('true', '1', 't')
+# Journal JSONL append-only (parsed_messages.jsonl, trade_log.jsonl): ukuran rotasi, jumlah file cadangan, fsync per N record
+JOURNAL_MAX_MB = int(os.getenv("JOURNAL_MAX_MB", 20))
+JOURNAL_BACKUP_COUNT = int(os.getenv("JOURNAL_BACKUP_COUNT", 5))
+JOURNAL_FSYNC_BATCH = int(os.getenv("JOURNAL_FSYNC_BATCH", 50))
+
 # Konfigurasi Posisi Macet
 STUCK_TRADE_ENABLED = os.getenv("STUCK_TRADE_ENABLED", "False").lower() in ('true', '1', 't')
 STUCK_TRADE_DURATION_HOURS = int(os.getenv("STUCK_TRADE_DURATION_HOURS", 6))
@@ -36,4 +54,8 @@ PRIORITIZE_NORMAL_RISK = os.getenv("PRIORITIZE_NORMAL_RISK", "False").lower() in
 
 # --- BARU: Konfigurasi Validitas Waktu Sinyal ---
 FILTER_OLD_SIGNALS_ENABLED = os.getenv("FILTER_OLD_SIGNALS_ENABLED", "True").lower() in ('true', '1', 't')
-SIGNAL_VALIDITY_MINUTES = int(os.getenv("SIGNAL_VALIDITY_MINUTES", 30))
\ No newline at end of file
+SIGNAL_VALIDITY_MINUTES = int(os.getenv("SIGNAL_VALIDITY_MINUTES", 30))
+
+# --- BARU: Konfigurasi Stream Binance (harga mini-ticker & user data) ---
+PRICE_STREAM_ENABLED = os.getenv("PRICE_STREAM_ENABLED", "True").lower() in ('true', '1', 't')
+USER_STREAM_ENABLED = os.getenv("USER_STREAM_ENABLED", "True").lower() in ('true', '1', 't')
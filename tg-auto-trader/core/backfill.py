@@ -0,0 +1,136 @@
+# Auto Trade Bot/core/backfill.py
+import os
+import json
+import time
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+from telegram.client import TelegramClientWrapper
+from telegram.parser import TelegramMessageParser
+from db.mongo_client import MongoManager
+
+CHECKPOINT_FILE = "backfill_checkpoint.json"
+
+# Parser per proses worker, dibuat sekali saat pertama dipakai
+_worker_parser: Optional[TelegramMessageParser] = None
+
+
+def _to_record(message: Any) -> Tuple[int, datetime, Optional[int], str]:
+    """Ringkasan pesan Telethon yang ringan untuk dikirim ke proses worker."""
+    return (message.id, message.date, message.sender_id, message.raw_text or "")
+
+
+def parse_records(records: List[Tuple[int, datetime, Optional[int], str]]) -> List[Dict[str, Any]]:
+    """Dijalankan di proses worker: mem-parsing satu potongan pesan menjadi dict."""
+    global _worker_parser
+    if _worker_parser is None:
+        _worker_parser = TelegramMessageParser()
+    return [
+        _worker_parser.parse_message(SimpleNamespace(id=message_id, date=date, sender_id=sender_id, raw_text=raw_text)).to_dict()
+        for message_id, date, sender_id, raw_text in records
+    ]
+
+
+def _load_checkpoint(directory: str = "data") -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(directory, CHECKPOINT_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _save_checkpoint(checkpoint: Dict[str, Any], directory: str = "data"):
+    """Ditulis ke file sementara lalu di-rename, agar checkpoint tidak pernah setengah jadi."""
+    path = os.path.join(directory, CHECKPOINT_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _write_chunk(parsed: List[Dict[str, Any]], output, mongo_manager: MongoManager, checkpoint: Dict[str, Any]) -> int:
+    """Menyimpan satu potongan ke Mongo dan JSONL, lalu memajukan checkpoint. Mengembalikan jumlah sisipan Mongo."""
+    inserted = mongo_manager.insert_telegram_messages(parsed)
+    output.write("".join(json.dumps(message, ensure_ascii=False) + "\n" for message in parsed).encode('utf-8'))
+    output.flush()
+    os.fsync(output.fileno())
+
+    checkpoint["last_message_id"] = max(message["message_id"] for message in parsed)
+    checkpoint["messages"] += len(parsed)
+    checkpoint["jsonl_offset"] = output.tell()
+    checkpoint["updated_at"] = datetime.now(timezone.utc).isoformat()
+    _save_checkpoint(checkpoint)
+    return inserted
+
+
+async def run_backfill_routine(chunk_size: int = 500, workers: Optional[int] = None, since: Optional[datetime] = None, output_file: str = "backfill_messages.jsonl"):
+    """
+    Mengambil seluruh riwayat channel dari terlama ke terbaru per potongan,
+    mem-parsing potongan di process pool, lalu menambahkannya ke file JSONL
+    dan koleksi 'telegram_messages'. Bisa dihentikan kapan saja dan
+    dilanjutkan dari checkpoint; memori hanya menampung beberapa potongan.
+    """
+    workers = workers or os.cpu_count() or 1
+    print(f"\n--- Memulai Backfill Riwayat Telegram (potongan: {chunk_size} pesan, worker: {workers}) ---")
+    os.makedirs("data", exist_ok=True)
+    output_path = os.path.join("data", output_file)
+
+    checkpoint = _load_checkpoint()
+    if checkpoint and (checkpoint.get("chat_id") != config.TARGET_CHAT_ID or checkpoint.get("output_file") != output_file):
+        print("Checkpoint milik chat/file lain. Memulai backfill dari awal.")
+        checkpoint = None
+    if checkpoint:
+        print(f"Melanjutkan dari checkpoint: {checkpoint['messages']} pesan, ID terakhir {checkpoint['last_message_id']}.")
+    else:
+        checkpoint = {"chat_id": config.TARGET_CHAT_ID, "output_file": output_file, "last_message_id": 0, "messages": 0, "jsonl_offset": 0}
+        if since:
+            print(f"Mengambil pesan sejak {since.isoformat()}.")
+        # Isi file yang tidak tercakup checkpoint (chat lain / backfill lama) dipindahkan, bukan di-truncate
+        if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+            rotated_path = f"{output_path}.{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+            os.replace(output_path, rotated_path)
+            print(f"File {output_path} berisi data yang tidak tercakup checkpoint. Dipindahkan ke {rotated_path}.")
+
+    client_wrapper = TelegramClientWrapper(config.SESSION_NAME, config.API_ID, config.API_HASH, config.PHONE_NUMBER)
+    mongo_manager = MongoManager(config.MONGO_URI, config.MONGO_DB_NAME)
+    loop = asyncio.get_running_loop()
+    # Potongan yang sedang di-parse; urutan dijaga agar checkpoint selalu maju berurutan
+    in_flight = deque()
+    max_in_flight = workers * 2
+    started_at = time.perf_counter()
+    start_count = checkpoint["messages"]
+
+    async def _drain_one():
+        parsed = await in_flight.popleft()
+        inserted = await asyncio.to_thread(_write_chunk, parsed, output, mongo_manager, checkpoint)
+        rate = (checkpoint["messages"] - start_count) / max(time.perf_counter() - started_at, 1e-9)
+        print(f"  {checkpoint['messages']} pesan tersimpan (ID s/d {checkpoint['last_message_id']}, baru di DB: {inserted}, {rate:.0f} pesan/detik)")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool, open(output_path, 'ab') as output:
+            # Buang baris yang ditulis setelah checkpoint terakhir (mis. proses terhenti di tengah potongan)
+            output.truncate(checkpoint["jsonl_offset"])
+
+            await client_wrapper.connect()
+            offset_date = since if not checkpoint["last_message_id"] else None
+            async for chunk in client_wrapper.iter_message_chunks(config.TARGET_CHAT_ID, chunk_size, min_id=checkpoint["last_message_id"], offset_date=offset_date):
+                in_flight.append(loop.run_in_executor(pool, parse_records, [_to_record(message) for message in chunk]))
+                if len(in_flight) >= max_in_flight:
+                    await _drain_one()
+            while in_flight:
+                await _drain_one()
+
+        elapsed = time.perf_counter() - started_at
+        print(f"--- Backfill Selesai: {checkpoint['messages'] - start_count} pesan baru dalam {elapsed:.1f} detik, total {checkpoint['messages']} di {output_path} ---")
+    finally:
+        for future in in_flight:
+            future.cancel()
+        if client_wrapper.client.is_connected(): await client_wrapper.disconnect()
+        mongo_manager.close_connection()
@@ -4,17 +4,24 @@ import time
 import json
 import os
 import asyncio
+import threading
 import config
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from datetime import datetime, timezone
 
 from telegram.client import TelegramClientWrapper
 from telegram.parser import TelegramMessageParser
-from telegram.utils import JsonWriter
+from telegram.utils import JsonWriter, JsonlJournal, get_journal, get_snapshot_writer
 from binance.client import BinanceClient
 from binance.strategy import TradingStrategy
 from binance.account import AccountManager
+from binance.execution import ExecutionContext
 from binance.trader import Trader
+from binance.user_stream import UserDataStream
+from binance.metrics import get_metrics_registry
+from binance.models import TradeDecision
 from db.mongo_client import MongoManager
+from core.runtime import RuntimeContext
 
 def _load_json_file(file_name: str, directory: str = "data"):
     file_path = os.path.join(directory, file_name)
@@ -24,198 +31,262 @@ def _load_json_file(file_name: str, directory: str = "data"):
     except (FileNotFoundError, json.JSONDecodeError):
         return None
 
-async def run_fetch_routine(message_limit: int = 50):
+class FetchResult(NamedTuple):
+    """Hasil tahap fetch yang diteruskan langsung (di memori) ke tahap keputusan."""
+    messages: List[Dict[str, Any]]  # semua pesan yang di-parse pada pemanggilan ini
+    signals: List[Dict[str, Any]]  # jendela sinyal terbaru yang perlu dievaluasi
+
+def _snapshot(file_name: str, data: Any):
+    """Snapshot JSON opsional di data/, ditulis di thread latar belakang (lihat SNAPSHOTS_ENABLED)."""
+    if config.SNAPSHOTS_ENABLED:
+        get_snapshot_writer().submit(file_name, data)
+
+def _journal(file_name: str) -> JsonlJournal:
+    """Journal JSONL append-only di data/ (riwayat yang terus bertambah, mis. pesan & log trade)."""
+    return get_journal(file_name, max_bytes=config.JOURNAL_MAX_MB * 1024 * 1024, backup_count=config.JOURNAL_BACKUP_COUNT, fsync_batch=config.JOURNAL_FSYNC_BATCH)
+
+def _merge_recent_signals(new_signals, window: int, previous_signals):
+    """
+    Menggabungkan sinyal baru dengan jendela sinyal sebelumnya, sehingga
+    sinyal yang masih dalam jendela `window` tetap dievaluasi ulang oleh tahap
+    keputusan meskipun pesannya tidak diambil lagi dari Telegram.
+    """
+    merged, seen_ids = [], set()
+    for signal in new_signals + previous_signals:
+        message_id = signal.get("message_id")
+        if message_id in seen_ids:
+            continue
+        seen_ids.add(message_id)
+        merged.append(signal)
+    merged.sort(key=lambda s: s.get("message_id") or 0, reverse=True)
+    return merged[:window]
+
+async def run_fetch_routine(message_limit: int = 50, ctx: RuntimeContext = None) -> FetchResult:
+    """
+    `ctx` (opsional) memakai koneksi Telegram & MongoDB bersama alih-alih membuka
+    yang baru, dan menyimpan jendela sinyal di memori antar siklus.
+    """
     print(f"\n--- [1] Memulai Rutinitas Fetch Telegram (Limit: {message_limit} pesan) ---")
-    client_wrapper = TelegramClientWrapper(config.SESSION_NAME, config.API_ID, config.API_HASH, config.PHONE_NUMBER)
     parser = TelegramMessageParser()
-    mongo_manager = MongoManager(config.MONGO_URI, config.MONGO_DB_NAME)
-    parsed_data = []
+    mongo_manager = ctx.mongo if ctx else MongoManager(config.MONGO_URI, config.MONGO_DB_NAME)
+    client_wrapper = None
+    if ctx and ctx.signal_window is not None:
+        previous_signals = ctx.signal_window
+    else:
+        previous_signals = _load_json_file("new_signals.json") or []
 
     try:
-        await client_wrapper.connect()
-        messages = await client_wrapper.fetch_historical_messages(config.TARGET_CHAT_ID, limit=message_limit)
+        watermark = mongo_manager.get_telegram_watermark(config.TARGET_CHAT_ID)
+        fetch_limit = message_limit
+        if watermark:
+            # Catch-up setelah downtime dibatasi; pesan yang lebih tua dari batas ini dilewati
+            fetch_limit = max(message_limit, config.TELEGRAM_CATCH_UP_LIMIT)
+            print(f"Mengambil pesan setelah ID {watermark} (maks {fetch_limit} pesan).")
+
+        if ctx:
+            client_wrapper = await ctx.get_telegram()
+        else:
+            client_wrapper = TelegramClientWrapper(config.SESSION_NAME, config.API_ID, config.API_HASH, config.PHONE_NUMBER)
+            await client_wrapper.connect()
+        messages = await client_wrapper.fetch_historical_messages(config.TARGET_CHAT_ID, limit=fetch_limit, min_id=watermark or 0)
         if not messages: 
             print("Tidak ada pesan baru yang diambil.")
-            return []
+            return FetchResult(messages=[], signals=previous_signals)
+        if watermark and len(messages) >= fetch_limit:
+            print(f"Peringatan: lebih dari {fetch_limit} pesan baru sejak ID {watermark}. Pesan yang lebih lama dilewati.")
         
         parsed_data = [parser.parse_message(msg).to_dict() for msg in messages]
-        JsonWriter("parsed_messages.json").write(parsed_data)
-        
         new_signals = [m for m in parsed_data if m.get("message_type") == "NewSignal"]
-        JsonWriter("new_signals.json").write(new_signals)
+        signal_window = _merge_recent_signals(new_signals, message_limit, previous_signals)
+        if ctx:
+            ctx.signal_window = signal_window
+        _journal("parsed_messages.jsonl").append(parsed_data)
+        _snapshot("new_signals.json", signal_window)
         
         if new_signals:
             mongo_manager.save_new_signals(new_signals)
 
+        mongo_manager.save_telegram_watermark(config.TARGET_CHAT_ID, max(msg.id for msg in messages))
         print("--- Rutinitas Fetch Telegram Selesai ---")
     finally:
-        if client_wrapper.client.is_connected(): await client_wrapper.disconnect()
-        mongo_manager.close_connection()
+        if ctx is None:
+            if client_wrapper and client_wrapper.client.is_connected(): await client_wrapper.disconnect()
+            mongo_manager.close_connection()
         
-    return parsed_data
+    return FetchResult(messages=parsed_data, signals=signal_window)
 
-def run_decide_routine(parsed_data=None):
+def run_decide_routine(fetch_result: Optional[FetchResult] = None, ctx: RuntimeContext = None) -> List[TradeDecision]:
+    """
+    Mengevaluasi jendela sinyal dari `fetch_result`. Tanpa `fetch_result`
+    (aksi 'decide' yang dijalankan terpisah) sinyal dibaca dari snapshot new_signals.json.
+    """
     print("\n--- [2] Memulai Rutinitas Keputusan Trading ---")
-    client = BinanceClient()
+    client = ctx.client if ctx else BinanceClient()
     strategy = TradingStrategy(client)
-    new_signals = _load_json_file("new_signals.json")
+    new_signals = fetch_result.signals if fetch_result is not None else _load_json_file("new_signals.json")
     if not new_signals:
         print("Tidak ada sinyal baru untuk dievaluasi.")
         return []
 
-    all_decisions = [strategy.evaluate_new_signal(signal).to_dict() for signal in new_signals]
-    JsonWriter("trade_decisions.json").write(all_decisions)
+    all_decisions = strategy.evaluate_new_signals(new_signals)
+    _snapshot("trade_decisions.json", all_decisions)
     print(f"Berhasil membuat {len(all_decisions)} keputusan trading.")
     print("--- Rutinitas Keputusan Trading Selesai ---")
     return all_decisions
 
-def run_execute_routine(decisions_data=None):
+def run_execute_routine(decisions: Optional[List[TradeDecision]] = None, account_stream: UserDataStream = None, ctx: RuntimeContext = None) -> Dict[str, Dict[str, Any]]:
     """
     Fungsi eksekusi dengan logika pengecekan pra-swap.
+    Mengembalikan hasil eksekusi per coin_pair (keputusan BUY yang diproses).
+    Tanpa `decisions` (aksi 'execute' yang dijalankan terpisah) keputusan dibaca dari snapshot trade_decisions.json.
+    `account_stream` (opsional) menghilangkan jeda tetap dan request /account berulang.
+    `ctx` (opsional) memakai klien Binance, MongoDB dan user data stream bersama.
     """
     print("\n--- [3] Memulai Rutinitas Eksekusi Trading ---")
     if not config.BINANCE_API_KEY or not config.BINANCE_API_SECRET:
         print("Kunci API Binance tidak dikonfigurasi. Melewatkan eksekusi.")
-        return
+        return {}
+
+    client = ctx.trading_client if ctx else BinanceClient(config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
+    account_stream = account_stream or (ctx.account_stream if ctx else None)
+    mongo = ctx.mongo if ctx else MongoManager(config.MONGO_URI, config.MONGO_DB_NAME)
+    try:
+        if decisions is None:
+            decisions = [TradeDecision.from_dict(d) for d in _load_json_file("trade_decisions.json") or []]
+        return _execute_buy_decisions(client, mongo, decisions, account_stream)
+    finally:
+        if ctx is None:
+            mongo.close_connection()
+
+def _execute_buy_decisions(client: BinanceClient, mongo: MongoManager, decisions: List[TradeDecision], account_stream: UserDataStream = None) -> Dict[str, Dict[str, Any]]:
+    trader = Trader(client, config.USDT_AMOUNT_PER_TRADE, account_stream=account_stream)
 
-    client = BinanceClient(config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
-    manager = AccountManager(client)
-    trader = Trader(client, config.USDT_AMOUNT_PER_TRADE)
-    mongo = MongoManager(config.MONGO_URI, config.MONGO_DB_NAME)
-    
-    decisions = _load_json_file("trade_decisions.json")
     if not decisions:
-        print("Tidak ada file keputusan trading untuk diproses.")
-        mongo.close_connection()
-        return
+        print("Tidak ada keputusan trading untuk diproses.")
+        return {}
 
-    buy_decisions = [d for d in decisions if d.get('decision') == 'BUY']
+    buy_decisions = [d for d in decisions if d.decision == 'BUY']
     if not buy_decisions:
         print("Tidak ditemukan keputusan 'BUY'. Tidak ada yang dieksekusi.")
-        mongo.close_connection()
-        return
+        return {}
     
     trade_logs = []
-    account_summary = manager.get_account_summary()
-    if not account_summary: 
-        mongo.close_connection()
-        return
+    # Saldo, open orders & aturan simbol diambil sekali per pass lalu diperbarui lokal oleh setiap order
+    context = ExecutionContext.load(client, account_stream)
+    if not context:
+        return {}
 
     if not config.PRIORITIZE_NORMAL_RISK:
         print("Mode Prioritas Risiko NON-AKTIF. Mengeksekusi semua sinyal 'BUY'.")
         for decision in buy_decisions:
-            result = trader.execute_trade(decision, account_summary)
-            trade_logs.append({"decision_details": decision, "execution_result": result})
-            if result.get('status') == 'SUCCESS':
-                time.sleep(2)
-                refreshed_summary = manager.get_account_summary()
-                if refreshed_summary: account_summary = refreshed_summary
+            result = trader.execute_trade(decision, context)
+            trade_logs.append({"decision_details": decision.to_dict(), "execution_result": result})
     else:
         # --- LOGIKA PRIORITAS DENGAN PENGECEKAN PRA-SWAP ---
         print("Mode Prioritas Risiko AKTIF. Mengkategorikan sinyal...")
-        normal_risk_buys = [d for d in buy_decisions if d.get('risk_level', '').lower() == 'normal']
-        high_risk_buys = [d for d in buy_decisions if d.get('risk_level', '').lower() == 'high']
+        normal_risk_buys = [d for d in buy_decisions if (d.risk_level or '').lower() == 'normal']
+        high_risk_buys = [d for d in buy_decisions if (d.risk_level or '').lower() == 'high']
         print(f"Ditemukan {len(normal_risk_buys)} sinyal 'Normal' dan {len(high_risk_buys)} sinyal 'High'.")
 
         swapped_out_symbols = set()
 
         stuck_high_risk_to_swap = []
-        processed_symbols = set()
         print("\n[PRIO] Mencari kandidat posisi High Risk yang macet untuk ditukar...")
-        open_orders = client.get_open_orders()
-        if open_orders:
-            for order in open_orders:
-                symbol = order['symbol']
-                if symbol in processed_symbols: continue
-                signal_data = mongo.get_signal_by_pair(symbol)
-                if signal_data and signal_data.get('risk_level', '').lower() == 'high':
-                    processed_symbols.add(symbol)
-                    try:
-                        current_price = client.get_current_price(symbol)
-                        sl_price = signal_data['stop_losses'][0]['price']
-                        tp1_price = signal_data['targets'][0]['price']
-                        if current_price and sl_price < current_price < tp1_price:
-                            stuck_high_risk_to_swap.append(symbol)
-                    except (IndexError, KeyError, TypeError): continue
+        open_symbols = context.open_symbols()
+        if open_symbols:
+            # Kumpulkan sinyal & harga semua posisi sekaligus sebelum memilih kandidat
+            signals_by_pair = mongo.get_signals_by_pairs(open_symbols)
+            high_risk_symbols = [s for s in open_symbols if (signals_by_pair.get(s, {}).get('risk_level') or '').lower() == 'high']
+            prices = client.get_prices(high_risk_symbols) if high_risk_symbols else {}
+            for symbol in high_risk_symbols:
+                signal_data = signals_by_pair[symbol]
+                try:
+                    current_price = prices.get(symbol)
+                    sl_price = signal_data['stop_losses'][0]['price']
+                    tp1_price = signal_data['targets'][0]['price']
+                    if current_price and sl_price < current_price < tp1_price:
+                        stuck_high_risk_to_swap.append(symbol)
+                except (IndexError, KeyError, TypeError): continue
         print(f"[PRIO] Ditemukan {len(stuck_high_risk_to_swap)} kandidat posisi macet: {stuck_high_risk_to_swap}")
 
         if normal_risk_buys:
             print("\n[PRIO] Memproses sinyal Normal Risk...")
             for decision in normal_risk_buys:
                 # --- LOGIKA BARU: Pengecekan pra-swap ---
-                is_buyable, reason = trader.can_execute_trade(decision, account_summary)
+                is_buyable, reason = trader.can_execute_trade(decision, context)
                 
                 if not is_buyable:
-                    print(f"  -> Melewatkan sinyal Normal {decision['coin_pair']}: {reason}")
-                    trade_logs.append({"decision_details": decision, "execution_result": {"status": "SKIP", "reason": reason}})
+                    print(f"  -> Melewatkan sinyal Normal {decision.coin_pair}: {reason}")
+                    trade_logs.append({"decision_details": decision.to_dict(), "execution_result": {"status": "SKIP", "reason": reason}})
                     continue
 
                 # Jika sinyal Normal BISA dibeli, baru kita pertimbangkan untuk swap
                 if stuck_high_risk_to_swap:
                     symbol_to_cancel = stuck_high_risk_to_swap.pop(0)
-                    print(f"\n[SWAP] Sinyal Normal {decision['coin_pair']} bisa dibeli. Mengganti posisi macet {symbol_to_cancel}...")
+                    print(f"\n[SWAP] Sinyal Normal {decision.coin_pair} bisa dibeli. Mengganti posisi macet {symbol_to_cancel}...")
                     
-                    cancel_res = client.cancel_all_open_orders_for_symbol(symbol_to_cancel)
-                    if not cancel_res:
-                        print(f"  - KRITIS: Gagal membatalkan order untuk {symbol_to_cancel}.")
-                        trade_logs.append({"action": "CANCEL_FOR_SWAP_FAILED", "symbol": symbol_to_cancel})
-                    else:
-                        print(f"  - Sukses membatalkan order untuk {symbol_to_cancel}. Menunggu untuk likuidasi...")
-                        swapped_out_symbols.add(symbol_to_cancel)
-                        time.sleep(2)
-                        acc_info = client.get_account_info()
-                        base_asset = symbol_to_cancel.replace("USDT", "")
-                        asset_balance = next((float(b['free']) for b in acc_info.get('balances', []) if b['asset'] == base_asset), 0.0)
-
-                        if asset_balance > 0:
-                            sell_res = client.place_market_sell_order(symbol_to_cancel, asset_balance)
-                            if sell_res:
-                                print(f"  - SUKSES: Berhasil menjual {asset_balance:.4f} {base_asset}.")
-                                trade_logs.append({"action": "LIQUIDATE_FOR_SWAP_SUCCESS", "symbol": symbol_to_cancel, "result": sell_res})
+                    # Kunci simbol: manajemen posisi yang berjalan bersamaan tidak boleh mengubah OCO ini
+                    with _get_symbol_lock(symbol_to_cancel):
+                        stream_mark = account_stream.mark() if account_stream else 0
+                        cancel_res = client.cancel_all_open_orders_for_symbol(symbol_to_cancel)
+                        if not cancel_res:
+                            print(f"  - KRITIS: Gagal membatalkan order untuk {symbol_to_cancel}.")
+                            trade_logs.append({"action": "CANCEL_FOR_SWAP_FAILED", "symbol": symbol_to_cancel})
+                        else:
+                            print(f"  - Sukses membatalkan order untuk {symbol_to_cancel}. Menunggu untuk likuidasi...")
+                            swapped_out_symbols.add(symbol_to_cancel)
+                            base_asset = symbol_to_cancel.replace("USDT", "")
+                            # Saldo aktual setelah pembatalan (bisa berbeda dari snapshot, mis. TP terisi sebagian)
+                            asset_balance = trader.get_free_balance_after(base_asset, stream_mark) or 0.0
+                            context.record_cancel(symbol_to_cancel, base_asset, asset_balance)
+
+                            if asset_balance <= 0:
+                                print(f"  - SANGAT KRITIS: Saldo {base_asset} tidak ditemukan setelah order dibatalkan. Posisi tidak terlindungi.")
+                                trade_logs.append({"action": "LIQUIDATE_FOR_SWAP_FAILED", "symbol": symbol_to_cancel, "reason": "Saldo free 0 atau gagal dibaca setelah pembatalan."})
                             else:
-                                print(f"  - SANGAT KRITIS: Gagal menjual {base_asset} setelah order dibatalkan.")
-                                trade_logs.append({"action": "LIQUIDATE_FOR_SWAP_FAILED", "symbol": symbol_to_cancel})
-                        
-                        account_summary = manager.get_account_summary() # Refresh summary
+                                sell_res = client.place_market_sell_order(symbol_to_cancel, asset_balance)
+                                if sell_res:
+                                    context.record_sell(sell_res, base_asset)
+                                    print(f"  - SUKSES: Berhasil menjual {sell_res.executed_qty:.4f} {base_asset} @ ~${sell_res.avg_price:.4f}.")
+                                    trade_logs.append({"action": "LIQUIDATE_FOR_SWAP_SUCCESS", "symbol": symbol_to_cancel, "result": sell_res.raw})
+                                else:
+                                    print(f"  - SANGAT KRITIS: Gagal menjual {base_asset} setelah order dibatalkan.")
+                                    trade_logs.append({"action": "LIQUIDATE_FOR_SWAP_FAILED", "symbol": symbol_to_cancel})
 
                 # Eksekusi sinyal Normal yang sudah kita pastikan bisa dibeli
-                result = trader.execute_trade(decision, account_summary)
-                trade_logs.append({"decision_details": decision, "execution_result": result})
-                if result.get('status') == 'SUCCESS':
-                    time.sleep(2)
-                    account_summary = manager.get_account_summary()
+                result = trader.execute_trade(decision, context)
+                trade_logs.append({"decision_details": decision.to_dict(), "execution_result": result})
 
         if high_risk_buys:
             print("\n[PRIO] Memproses sinyal High Risk...")
             for decision in high_risk_buys:
-                if decision['coin_pair'] in swapped_out_symbols:
-                    print(f"  -> Melewatkan {decision['coin_pair']} karena baru saja dijual dalam proses swap.")
-                    trade_logs.append({"action": "SKIP_REBUY_AFTER_SWAP", "symbol": decision['coin_pair']})
+                if decision.coin_pair in swapped_out_symbols:
+                    print(f"  -> Melewatkan {decision.coin_pair} karena baru saja dijual dalam proses swap.")
+                    trade_logs.append({"action": "SKIP_REBUY_AFTER_SWAP", "symbol": decision.coin_pair})
                     continue
 
-                result = trader.execute_trade(decision, account_summary)
-                trade_logs.append({"decision_details": decision, "execution_result": result})
-                if result.get('status') == 'SUCCESS':
-                    time.sleep(2)
-                    account_summary = manager.get_account_summary()
+                result = trader.execute_trade(decision, context)
+                trade_logs.append({"decision_details": decision.to_dict(), "execution_result": result})
                     
-    if trade_logs: JsonWriter("trade_log.json").write(trade_logs)
-    mongo.close_connection()
+    if trade_logs:
+        logged_at = datetime.now(timezone.utc).isoformat()
+        _journal("trade_log.jsonl").append({"logged_at": logged_at, **entry} for entry in trade_logs)
     print("\n--- Rutinitas Eksekusi Trading (Mode Prioritas) Selesai ---")
+    return {entry["decision_details"]["coin_pair"]: entry["execution_result"] for entry in trade_logs if "execution_result" in entry}
 
 def run_status_routine():
     print("\n--- Memulai Rutinitas Pengecekan Status ---")
     if not config.BINANCE_API_KEY or not config.BINANCE_API_SECRET: return
 
     client = BinanceClient(config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
-    print("\n[1/2] Memeriksa Saldo Aset...")
+    print("\n[1/3] Memeriksa Saldo Aset...")
     manager = AccountManager(client)
     summary = manager.get_account_summary()
     if summary: 
         JsonWriter("account_status.json").write(summary)
         print(f"Total Estimasi Nilai Akun: ${summary.get('total_balance_usdt', 0)}")
     
-    print("\n[2/2] Memeriksa Transaksi Berjalan (Open Orders)...")
+    print("\n[2/3] Memeriksa Transaksi Berjalan (Open Orders)...")
     open_orders = client.get_open_orders()
     if not open_orders:
         print("Tidak ada transaksi berjalan (order aktif) yang ditemukan.")
@@ -225,15 +296,22 @@ def run_status_routine():
         for order in processed:
             if order['type'] == 'LIMIT_MAKER': print(f"  - TAKE PROFIT | {order['symbol']:<12} | Target: {order['price']}")
             elif order['type'] == 'STOP_LOSS_LIMIT': print(f"  - STOP LOSS   | {order['symbol']:<12} | Pemicu: {order['stopPrice']}")
+
+    print("\n[3/3] Metrik Request Binance (proses ini)...")
+    metrics = get_metrics_registry()
+    # File terpisah: binance_metrics.json milik autoloop/stream yang sedang berjalan
+    JsonWriter("binance_metrics_status.json").write(metrics.snapshot())
+    print(metrics.format_table())
     print("\n--- Rutinitas Pengecekan Status Selesai ---")
 
 # ==============================================================================
 # === FUNGSI YANG DIPERBAIKI ===
 # ==============================================================================
-async def run_manage_positions_routine():
+async def run_manage_positions_routine(ctx: RuntimeContext = None):
     """
     Memeriksa semua posisi OCO yang terbuka dan menerapkan strategi manajemen.
     Versi ini lebih tangguh terhadap error data.
+    `ctx` (opsional) memakai klien Binance dan MongoDB bersama.
     """
     print("\n--- [4] Memulai Rutinitas Manajemen Posisi ---")
     
@@ -241,189 +319,386 @@ async def run_manage_positions_routine():
         print("API Key/Secret Binance tidak ditemukan.")
         return
 
-    client = BinanceClient(config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
-    mongo = MongoManager(config.MONGO_URI, config.MONGO_DB_NAME)
+    client = ctx.trading_client if ctx else BinanceClient(config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
+    mongo = ctx.mongo if ctx else MongoManager(config.MONGO_URI, config.MONGO_DB_NAME)
+    try:
+        await _manage_open_positions(client, mongo, config.MANAGE_MAX_WORKERS)
+    finally:
+        if ctx is None:
+            mongo.close_connection()
+
+# Kunci per simbol (lintas thread & event loop) agar dua tindakan pada simbol yang sama tidak tumpang tindih
+_symbol_locks: Dict[str, threading.Lock] = {}
+_symbol_locks_guard = threading.Lock()
+
+def _get_symbol_lock(symbol: str) -> threading.Lock:
+    with _symbol_locks_guard:
+        return _symbol_locks.setdefault(symbol, threading.Lock())
+
+def _manage_position(client: BinanceClient, order_list_id: int, all_orders_in_oco: List[Dict[str, Any]], signal_data: Optional[Dict[str, Any]], current_price: Optional[float], log) -> str:
+    """Menerapkan cek posisi macet & trailing SL untuk satu OCO. Mengembalikan label hasil."""
+    order_sample = all_orders_in_oco[0]
+    symbol = order_sample.get('symbol', 'UNKNOWN_SYMBOL')
+    if not signal_data:
+        log(f"  Peringatan: Tidak ditemukan data sinyal untuk {symbol} di DB. Melewatkan.")
+        return "SKIP"
+        
+    if current_price is None:
+        log(f"  Gagal mendapatkan harga terkini untuk {symbol}. Melewatkan.")
+        return "SKIP"
+
+    sl_order = next((o for o in all_orders_in_oco if o['type'] == 'STOP_LOSS_LIMIT'), None)
+
+    if not sl_order:
+        log(f"  Tidak dapat menemukan order STOP_LOSS_LIMIT untuk {symbol}. Melewatkan.")
+        return "SKIP"
     
-    open_orders = client.get_open_orders()
+    current_sl_price = float(sl_order['stopPrice'])
+    quantity = sl_order['origQty']
+    
+    # --- Pengecekan Posisi Macet (Stuck Trade) ---
+    if config.STUCK_TRADE_ENABLED:
+        order_time_ms = order_sample.get('time', 0)
+        order_datetime = datetime.fromtimestamp(order_time_ms / 1000, tz=timezone.utc)
+        now_utc = datetime.now(timezone.utc)
+        elapsed_hours = (now_utc - order_datetime).total_seconds() / 3600
+
+        log(f"  Usia order: {elapsed_hours:.2f} jam.")
+
+        if elapsed_hours >= config.STUCK_TRADE_DURATION_HOURS:
+            targets = signal_data.get('targets', [])
+            if not targets:
+                log(f"  Info: Sinyal {symbol} tidak memiliki data target untuk cek posisi macet.")
+            else:
+                tp1_price = targets[0].get('price')
+                if tp1_price and current_price < tp1_price:
+                    log(f"  >> TINDAKAN: Posisi {symbol} dianggap macet (terbuka > {config.STUCK_TRADE_DURATION_HOURS} jam & di bawah TP1). Menutup posisi...")
+                    
+                    close_result = client.replace_oco(symbol, order_list_id, quantity)
+                    if close_result['status'] == 'CANCEL_FAILED':
+                        log(f"  >> KRITIS: Gagal membatalkan OCO untuk posisi macet {symbol}. Intervensi manual diperlukan.")
+                    elif close_result['status'] == 'PLACE_FAILED':
+                        log(f"  >> SANGAT KRITIS: Gagal menjual {symbol} setelah OCO dibatalkan. Aset tidak terproteksi!")
+                    else:
+                        log(f"  >> SUKSES: Posisi macet {symbol} berhasil ditutup.")
+                    
+                    return "STUCK_CLOSED" if close_result['status'] == 'SUCCESS' else "STUCK_FAILED"
+                else:
+                    log(f"  Posisi sudah berjalan lama, namun tidak memenuhi kriteria macet.")
+
+    # --- Pengecekan Trailing Stop Loss ---
+    if config.TRAILING_ENABLED:
+        log(f"  Memeriksa trailing SL. Harga: ${current_price:.4f}, SL: ${current_sl_price:.4f}")
+        new_sl_price = 0
+        
+        # Gunakan try-except di sini juga untuk keamanan ekstra saat looping target
+        try:
+            for target in signal_data.get('targets', []):
+                if target.get('level', 0) < config.MIN_TRAILING_TP_LEVEL:
+                    continue
+                
+                tp_price = target.get('price')
+                if not tp_price: continue
+
+                trigger_price = tp_price * (1 + config.TRAILING_TRIGGER_PERCENTAGE)
+                
+                if current_price >= trigger_price and tp_price > current_sl_price:
+                    log(f"  Kondisi trailing TERPENUHI pada TP{target.get('level')} (Harga: ${tp_price:.4f})")
+                    new_sl_price = max(new_sl_price, tp_price)
+        except Exception as e_loop:
+            log(f"  Error saat memproses target untuk trailing {symbol}: {e_loop}")
+
+        # Bandingkan dalam satuan tick: SL baru yang sama setelah dibulatkan tidak perlu mengganti OCO
+        quantizer = client.get_quantizer(symbol)
+        if quantizer and new_sl_price:
+            sl_moves_up = quantizer.quantize_price(new_sl_price) > quantizer.quantize_price(sl_order['stopPrice'])
+        else:
+            sl_moves_up = new_sl_price > current_sl_price
+
+        if sl_moves_up:
+            log(f"  >> TINDAKAN: Memindahkan SL untuk {symbol} dari ${current_sl_price:.4f} ke ${new_sl_price:.4f}")
+            final_tp_price = signal_data.get('targets', [{}])[-1].get('price')
+            
+            if not final_tp_price:
+                 log(f"  >> KRITIS: Tidak dapat menemukan harga TP final untuk {symbol}. Pembatalan trailing.")
+                 return "SKIP"
+
+            log(f"  Mengganti OCO: TP=${final_tp_price:.4f}, SL=${new_sl_price:.4f}")
+            replace_result = client.replace_oco(
+                symbol=symbol,
+                order_list_id=order_list_id,
+                quantity=quantity,
+                take_profit_price=final_tp_price,
+                stop_loss_price=new_sl_price
+            )
+            if replace_result['status'] == 'CANCEL_FAILED':
+                log(f"  >> KRITIS: Gagal membatalkan OCO lama untuk {symbol} saat trailing.")
+            elif replace_result['status'] == 'PLACE_FAILED':
+                log(f"  >> SANGAT KRITIS: Aset {symbol} tidak terproteksi setelah trailing!")
+            else:
+                log(f"  >> SUKSES: Trailing SL untuk {symbol} berhasil diterapkan.")
+            return "TRAILED" if replace_result['status'] == 'SUCCESS' else "TRAIL_FAILED"
+        else:
+            log("  Tidak ada tindakan trailing yang diperlukan.")
+
+    return "NO_ACTION"
+
+def _run_position_task(client: BinanceClient, order_list_id: int, all_orders_in_oco: List[Dict[str, Any]], signal_data: Optional[Dict[str, Any]], current_price: Optional[float]):
+    """
+    Dijalankan di thread worker. Log satu posisi dikumpulkan lalu dicetak
+    sekaligus agar tidak bercampur dengan posisi lain yang berjalan bersamaan.
+    """
+    symbol = all_orders_in_oco[0].get('symbol', 'UNKNOWN_SYMBOL')
+    lines = [f"\n- Memeriksa {symbol} (OrderListId: {order_list_id})"]
+    started = time.perf_counter()
+    with _get_symbol_lock(symbol):
+        try:
+            outcome = _manage_position(client, order_list_id, all_orders_in_oco, signal_data, current_price, lines.append)
+        except Exception as e:
+            # Ini akan menangkap semua error tak terduga saat memproses satu order
+            lines.append(f"  LOG ERROR: Terjadi kesalahan tak terduga saat memproses order {symbol} (ID: {order_list_id}). Error: {e}. Melanjutkan ke order berikutnya.")
+            outcome = "ERROR"
+    elapsed = time.perf_counter() - started
+    # Satu kali tulis (termasuk baris baru) agar blok log antar thread tidak saling menyisip
+    print("\n".join(lines) + "\n", end="")
+    return symbol, order_list_id, outcome, elapsed
+
+async def _manage_open_positions(client: BinanceClient, mongo: MongoManager, max_workers: int) -> List[Tuple[str, int, str, float]]:
+    """Satu pass manajemen posisi. Mengembalikan (simbol, orderListId, hasil, durasi) per OCO yang diperiksa."""
+    open_orders = await asyncio.to_thread(client.get_open_orders)
     if not open_orders:
         print("Tidak ada order terbuka yang ditemukan untuk dikelola.")
-        mongo.close_connection()
-        return
+        return []
 
+    # orderListId -> semua order di OCO tersebut (urutan dari Binance dipertahankan)
     oco_orders = {}
     for order in open_orders:
         if order.get('orderListId', -1) != -1:
-            if order['orderListId'] not in oco_orders:
-                 oco_orders[order['orderListId']] = order
+            oco_orders.setdefault(order['orderListId'], []).append(order)
     
     if not oco_orders:
         print("Tidak ada order OCO aktif yang ditemukan.")
-        mongo.close_connection()
-        return
+        return []
         
-    print(f"Ditemukan {len(oco_orders)} OCO order aktif. Memeriksa setiap posisi...")
+    print(f"Ditemukan {len(oco_orders)} OCO order aktif. Memeriksa setiap posisi (maks {max_workers} bersamaan)...")
 
-    for order_list_id, order_sample in oco_orders.items():
-        symbol = order_sample.get('symbol', 'UNKNOWN_SYMBOL')
-        try:
-            print(f"\n- Memeriksa {symbol} (OrderListId: {order_list_id})")
+    # Satu query sinyal dan satu batch harga untuk semua posisi, sebelum ada tindakan
+    symbols = list(dict.fromkeys(orders[0].get('symbol') for orders in oco_orders.values()))
+    signals_by_pair = await asyncio.to_thread(mongo.get_signals_by_pairs, symbols)
+    prices = await asyncio.to_thread(client.get_prices, [s for s in symbols if s in signals_by_pair])
 
-            signal_data = mongo.get_signal_by_pair(symbol)
-            if not signal_data:
-                print(f"  Peringatan: Tidak ditemukan data sinyal untuk {symbol} di DB. Melewatkan.")
-                continue
-                
-            current_price = client.get_current_price(symbol)
-            if current_price is None:
-                print(f"  Gagal mendapatkan harga terkini untuk {symbol}. Melewatkan.")
-                continue
+    semaphore = asyncio.Semaphore(max_workers)
 
-            all_orders_in_oco = [o for o in open_orders if o.get('orderListId') == order_list_id]
-            sl_order = next((o for o in all_orders_in_oco if o['type'] == 'STOP_LOSS_LIMIT'), None)
+    async def _worker(order_list_id, all_orders_in_oco):
+        symbol = all_orders_in_oco[0].get('symbol')
+        async with semaphore:
+            return await asyncio.to_thread(_run_position_task, client, order_list_id, all_orders_in_oco, signals_by_pair.get(symbol), prices.get(symbol))
 
-            if not sl_order:
-                print(f"  Tidak dapat menemukan order STOP_LOSS_LIMIT untuk {symbol}. Melewatkan.")
-                continue
-            
-            current_sl_price = float(sl_order['stopPrice'])
-            quantity = sl_order['origQty']
-            
-            # --- Pengecekan Posisi Macet (Stuck Trade) ---
-            if config.STUCK_TRADE_ENABLED:
-                order_time_ms = order_sample.get('time', 0)
-                order_datetime = datetime.fromtimestamp(order_time_ms / 1000, tz=timezone.utc)
-                now_utc = datetime.now(timezone.utc)
-                elapsed_hours = (now_utc - order_datetime).total_seconds() / 3600
-
-                print(f"  Usia order: {elapsed_hours:.2f} jam.")
-
-                if elapsed_hours >= config.STUCK_TRADE_DURATION_HOURS:
-                    targets = signal_data.get('targets', [])
-                    if not targets:
-                        print(f"  Info: Sinyal {symbol} tidak memiliki data target untuk cek posisi macet.")
-                    else:
-                        tp1_price = targets[0].get('price')
-                        if tp1_price and current_price < tp1_price:
-                            print(f"  >> TINDAKAN: Posisi {symbol} dianggap macet (terbuka > {config.STUCK_TRADE_DURATION_HOURS} jam & di bawah TP1). Menutup posisi...")
-                            
-                            cancel_result = client.cancel_oco_order(symbol, order_list_id)
-                            if not cancel_result:
-                                print(f"  >> KRITIS: Gagal membatalkan OCO untuk posisi macet {symbol}. Intervensi manual diperlukan.")
-                                continue
-                            
-                            print("  Sukses membatalkan OCO. Menunggu 2 detik...")
-                            await asyncio.sleep(2)
-                            
-                            sell_result = client.place_market_sell_order(symbol, float(quantity))
-                            if not sell_result:
-                                print(f"  >> SANGAT KRITIS: Gagal menjual {symbol} setelah OCO dibatalkan. Aset tidak terproteksi!")
-                            else:
-                                print(f"  >> SUKSES: Posisi macet {symbol} berhasil ditutup.")
-                            
-                            continue # Lanjut ke order berikutnya setelah menutup posisi
-                        else:
-                            print(f"  Posisi sudah berjalan lama, namun tidak memenuhi kriteria macet.")
+    pass_started = time.perf_counter()
+    results = await asyncio.gather(*(_worker(order_list_id, orders) for order_list_id, orders in oco_orders.items()))
+    pass_elapsed = time.perf_counter() - pass_started
 
-            # --- Pengecekan Trailing Stop Loss ---
-            if config.TRAILING_ENABLED:
-                print(f"  Memeriksa trailing SL. Harga: ${current_price:.4f}, SL: ${current_sl_price:.4f}")
-                new_sl_price = 0
-                
-                # Gunakan try-except di sini juga untuk keamanan ekstra saat looping target
-                try:
-                    for target in signal_data.get('targets', []):
-                        if target.get('level', 0) < config.MIN_TRAILING_TP_LEVEL:
-                            continue
-                        
-                        tp_price = target.get('price')
-                        if not tp_price: continue
-
-                        trigger_price = tp_price * (1 + config.TRAILING_TRIGGER_PERCENTAGE)
-                        
-                        if current_price >= trigger_price and tp_price > current_sl_price:
-                            print(f"  Kondisi trailing TERPENUHI pada TP{target.get('level')} (Harga: ${tp_price:.4f})")
-                            new_sl_price = max(new_sl_price, tp_price)
-                except Exception as e_loop:
-                    print(f"  Error saat memproses target untuk trailing {symbol}: {e_loop}")
-
-                if new_sl_price > current_sl_price:
-                    print(f"  >> TINDAKAN: Memindahkan SL untuk {symbol} dari ${current_sl_price:.4f} ke ${new_sl_price:.4f}")
-                    final_tp_price = signal_data.get('targets', [{}])[-1].get('price')
-                    
-                    if not final_tp_price:
-                         print(f"  >> KRITIS: Tidak dapat menemukan harga TP final untuk {symbol}. Pembatalan trailing.")
-                         continue
-
-                    cancel_result = client.cancel_oco_order(symbol, order_list_id)
-                    if not cancel_result:
-                        print(f"  >> KRITIS: Gagal membatalkan OCO lama untuk {symbol} saat trailing.")
-                        continue
-                    
-                    print("  Sukses membatalkan OCO lama. Menunggu 2 detik...")
-                    await asyncio.sleep(2)
-
-                    print(f"  Menempatkan OCO baru: TP=${final_tp_price:.4f}, SL=${new_sl_price:.4f}")
-                    new_oco_result = client.place_oco_sell_order(
-                        symbol=symbol,
-                        quantity=quantity,
-                        take_profit_price=final_tp_price,
-                        stop_loss_price=new_sl_price
-                    )
-                    if not new_oco_result:
-                        print(f"  >> SANGAT KRITIS: Aset {symbol} tidak terproteksi setelah trailing!")
-                    else:
-                        print(f"  >> SUKSES: Trailing SL untuk {symbol} berhasil diterapkan.")
-                else:
-                    print("  Tidak ada tindakan trailing yang diperlukan.")
+    print("\nWaktu per posisi:")
+    for symbol, order_list_id, outcome, elapsed in sorted(results, key=lambda result: result[3], reverse=True):
+        print(f"  {symbol:<12} #{order_list_id:<10} {outcome:<13} {elapsed * 1000:8.0f} ms")
+    print(f"Total pass: {pass_elapsed * 1000:.0f} ms (jumlah waktu semua posisi: {sum(r[3] for r in results) * 1000:.0f} ms)")
+    print("\n--- Rutinitas Manajemen Posisi Selesai ---")
+    return results
 
+async def _ingestion_stage(ctx: RuntimeContext, decide_queue: asyncio.Queue, interval_seconds: int, message_limit: int, initial_fetch_limit: int):
+    """Tahap 1: mengambil pesan Telegram setiap `interval_seconds` dan meneruskannya ke tahap keputusan."""
+    fetch_limit = initial_fetch_limit
+    while True:
+        started = time.monotonic()
+        try:
+            fetch_result = await run_fetch_routine(message_limit=fetch_limit, ctx=ctx)
+            fetch_limit = message_limit
+            if decide_queue.full():
+                print("[PIPELINE] Tahap keputusan tertinggal. Ingestion menunggu antrean berkurang...")
+            # Backpressure: put() menahan ingestion selama antrean keputusan penuh
+            await decide_queue.put(fetch_result)
         except Exception as e:
-            # Ini akan menangkap semua error tak terduga (termasuk yg sebelumnya) saat memproses satu order
-            print(f"  LOG ERROR: Terjadi kesalahan tak terduga saat memproses order {symbol} (ID: {order_list_id}). Error: {e}. Melanjutkan ke order berikutnya.")
-            continue # Lanjutkan loop ke order berikutnya
-        
-    mongo.close_connection()
-    print("\n--- Rutinitas Manajemen Posisi Selesai ---")
+            print(f"[PIPELINE] Error pada tahap ingestion: {e}. Mencoba lagi pada jadwal berikutnya.")
+            await ctx.recover()
+        await asyncio.sleep(max(0, interval_seconds - (time.monotonic() - started)))
+
+async def _decision_stage(ctx: RuntimeContext, decide_queue: asyncio.Queue, execute_queue: asyncio.Queue):
+    """Tahap 2: mengevaluasi setiap hasil fetch segera setelah masuk antrean."""
+    while True:
+        fetch_result = await decide_queue.get()
+        # Hasil fetch yang menumpuk cukup dievaluasi sekali: jendela sinyal terbaru sudah mencakup yang lebih lama
+        while not decide_queue.empty():
+            fetch_result = decide_queue.get_nowait()
+        try:
+            decisions = await asyncio.to_thread(run_decide_routine, fetch_result=fetch_result, ctx=ctx)
+            if execute_queue.full():
+                print("[PIPELINE] Tahap eksekusi tertinggal. Tahap keputusan menunggu antrean berkurang...")
+            await execute_queue.put(decisions)
+        except Exception as e:
+            print(f"[PIPELINE] Error pada tahap keputusan: {e}.")
 
-async def run_autoloop_routine(duration_minutes: int, message_limit: int, cycle_delay_seconds: int, initial_fetch_limit: int): # <-- Tambah argumen baru
-    end_time = None
+async def _execution_stage(ctx: RuntimeContext, execute_queue: asyncio.Queue):
+    """Tahap 3: mengeksekusi keputusan 'BUY' dari tahap keputusan."""
+    while True:
+        decisions = await execute_queue.get()
+        # Setiap batch keputusan mencakup seluruh jendela sinyal, jadi hanya yang terbaru yang dieksekusi
+        while not execute_queue.empty():
+            decisions = execute_queue.get_nowait()
+        execution = asyncio.ensure_future(asyncio.to_thread(run_execute_routine, decisions=decisions, ctx=ctx))
+        try:
+            await asyncio.shield(execution)
+        except asyncio.CancelledError:
+            # Order yang sedang ditempatkan diselesaikan dulu sebelum koneksi ditutup
+            await asyncio.gather(execution, return_exceptions=True)
+            raise
+        except Exception as e:
+            print(f"[PIPELINE] Error pada tahap eksekusi: {e}.")
+
+async def run_autoloop_routine(duration_minutes: int, message_limit: int, cycle_delay_seconds: int, initial_fetch_limit: int, manage_interval_seconds: Optional[int] = None):
+    """
+    Autoloop sebagai pipeline: ingestion -> keputusan -> eksekusi dihubungkan
+    antrean asyncio berukuran terbatas (PIPELINE_QUEUE_SIZE), sementara
+    manajemen posisi berjalan dengan timer sendiri. Ingestion mengikuti
+    `cycle_delay_seconds`; trailing SL diperiksa tiap `manage_interval_seconds`.
+    """
+    manage_interval_seconds = manage_interval_seconds or config.MANAGE_INTERVAL_SECONDS
     if duration_minutes > 0:
         print(f"--- Memulai Mode Autoloop selama {duration_minutes} menit ---")
-        end_time = time.time() + duration_minutes * 60
     else:
         print("--- Memulai Mode Autoloop (Berjalan Selamanya, tekan CTRL+C untuk berhenti) ---")
     
-    print(f"(Fetch awal: {initial_fetch_limit} pesan, per siklus: {message_limit} pesan, jeda: {cycle_delay_seconds} detik)") # <-- Log diperjelas
+    print(f"(Fetch awal: {initial_fetch_limit} pesan, per siklus: {message_limit} pesan, fetch tiap {cycle_delay_seconds} detik, manajemen posisi tiap {manage_interval_seconds} detik)")
+
+    ctx = RuntimeContext()
+    ctx.start_streams()
+    decide_queue = asyncio.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+    execute_queue = asyncio.Queue(maxsize=config.PIPELINE_QUEUE_SIZE)
+    tasks = [
+        asyncio.create_task(_ingestion_stage(ctx, decide_queue, cycle_delay_seconds, message_limit, initial_fetch_limit)),
+        asyncio.create_task(_decision_stage(ctx, decide_queue, execute_queue)),
+        asyncio.create_task(_execution_stage(ctx, execute_queue)),
+        asyncio.create_task(_periodic_manage_positions(manage_interval_seconds, ctx)),
+    ]
 
-    cycle_count = 0
-    while True:
-        if end_time and time.time() >= end_time:
-            break
+    try:
+        if duration_minutes > 0:
+            await asyncio.sleep(duration_minutes * 60)
+        else:
+            await asyncio.gather(*tasks)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nCTRL+C terdeteksi. Menghentikan autoloop...")
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await ctx.close()
+        print("\n--- Mode Autoloop Dihentikan ---")
 
-        cycle_count += 1
-        sisa_waktu_str = f"~{int((end_time - time.time()) / 60)} menit" if end_time else "selamanya"
-        print(f"\n{'='*15} Memulai Siklus #{cycle_count} (Sisa waktu: {sisa_waktu_str}) {'='*15}")
-        
+def _process_streamed_signals(signals, strategy: TradingStrategy, ctx: RuntimeContext) -> Tuple[List[TradeDecision], Dict[str, Dict[str, Any]]]:
+    """
+    Menyimpan, memutuskan dan mengeksekusi satu batch sinyal dari stream.
+    Mengembalikan daftar keputusan dan hasil eksekusi per coin_pair.
+    """
+    ctx.mongo.save_new_signals(signals)
+    decisions = strategy.evaluate_new_signals(signals)
+    for decision in decisions:
+        print(f"  Keputusan {decision.coin_pair}: {decision.decision} - {decision.reason}")
+
+    execution_results = {}
+    if any(d.decision == 'BUY' for d in decisions):
+        _snapshot("trade_decisions.json", decisions)
+        execution_results = run_execute_routine(decisions=decisions, ctx=ctx)
+    return decisions, execution_results
+
+async def _consume_signal_queue(queue: asyncio.Queue, ctx: RuntimeContext):
+    """Tahap keputusan mode stream: memproses sinyal segera setelah masuk antrean."""
+    strategy = TradingStrategy(ctx.client)
+    bought_pairs = set()
+    while True:
+        batch = [await queue.get()]
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+
+        signals, received_at = [], {}
+        for item in batch:
+            signal = item.message.to_dict()
+            if signal.get("message_type") != "NewSignal":
+                continue
+            if item.is_edit and signal.get("coin_pair") in bought_pairs:
+                print(f"Sinyal {signal.get('coin_pair')} diedit setelah dibeli. Hanya memperbarui data di DB.")
+                await asyncio.to_thread(ctx.mongo.save_new_signals, [signal])
+                continue
+            signals.append(signal)
+            received_at[signal.get("coin_pair")] = item.received_at
+
+        processed = True
+        if signals:
+            print(f"\n>>> {len(signals)} sinyal baru diterima dari stream Telegram.")
+            try:
+                decisions, execution_results = await asyncio.to_thread(_process_streamed_signals, signals, strategy, ctx)
+            except Exception as e:
+                print(f"Terjadi error saat memproses sinyal dari stream: {e}. Watermark tidak dimajukan agar 'fetch'/'autoloop' mengambilnya ulang.")
+                decisions, execution_results = [], {}
+                processed = False
+            decided_at = time.monotonic()
+            for decision in decisions:
+                coin_pair = decision.coin_pair
+                # Hanya pair yang benar-benar terbeli; BUY yang di-SKIP/gagal tetap dievaluasi ulang saat sinyalnya diedit
+                if execution_results.get(coin_pair, {}).get('status') == 'SUCCESS':
+                    bought_pairs.add(coin_pair)
+                if coin_pair in received_at:
+                    print(f"  Latensi sinyal -> keputusan {coin_pair}: {(decided_at - received_at[coin_pair]) * 1000:.0f} ms")
+
+        # Pesan yang sudah diterima lewat stream tidak perlu diambil ulang oleh 'fetch'/'autoloop'
+        latest_id = max((item.message.message_id or 0 for item in batch if not item.is_edit), default=0)
+        if latest_id and processed:
+            await asyncio.to_thread(ctx.mongo.save_telegram_watermark, config.TARGET_CHAT_ID, latest_id)
+
+async def _periodic_manage_positions(interval_seconds: int, ctx: RuntimeContext):
+    """
+    Menjalankan manajemen posisi tiap `interval_seconds` (dihitung dari awal
+    pass, bukan dari akhirnya); panggilan blocking-nya berjalan di thread worker.
+    """
+    while True:
+        started = time.monotonic()
         try:
-            # --- LOGIKA BARU UNTUK FETCH AWAL ---
-            current_fetch_limit = initial_fetch_limit if cycle_count == 1 else message_limit
-            
-            parsed_data = await run_fetch_routine(message_limit=current_fetch_limit)
-            decisions = run_decide_routine(parsed_data=parsed_data)
-            run_execute_routine(decisions_data=decisions)
-            
-            await run_manage_positions_routine()
-
+            await run_manage_positions_routine(ctx=ctx)
+            _snapshot("binance_metrics.json", get_metrics_registry().snapshot())
         except Exception as e:
-            print(f"Terjadi error pada siklus ini: {e}. Melanjutkan ke siklus berikutnya.")
-        
-        if end_time and time.time() >= end_time:
-            break
-        
-        print(f"\nSiklus selesai. Menunggu {cycle_delay_seconds} detik sebelum siklus berikutnya...")
-        try:
-            time.sleep(cycle_delay_seconds)
-        except KeyboardInterrupt:
-            print("\nCTRL+C terdeteksi. Menghentikan autoloop...")
-            break
-    
-    print("\n--- Mode Autoloop Dihentikan ---")
\ No newline at end of file
+            print(f"Terjadi error pada manajemen posisi berkala: {e}.")
+        await asyncio.sleep(max(0, interval_seconds - (time.monotonic() - started)))
+
+async def run_stream_routine(duration_minutes: int = 0, manage_interval_seconds: int = 300):
+    """
+    Mode real-time: satu koneksi Telegram yang tetap hidup, pesan baru/diedit
+    masuk lewat event handler ke antrean dan langsung diproses oleh tahap
+    keputusan. Manajemen posisi berjalan berkala setiap `manage_interval_seconds`.
+    """
+    if duration_minutes > 0:
+        print(f"--- Memulai Mode Stream selama {duration_minutes} menit ---")
+    else:
+        print("--- Memulai Mode Stream (Berjalan Selamanya, tekan CTRL+C untuk berhenti) ---")
+
+    ctx = RuntimeContext()
+    ctx.start_streams()
+    parser = TelegramMessageParser()
+    queue = asyncio.Queue()
+    client_wrapper = None
+    tasks = []
+
+    try:
+        client_wrapper = await ctx.get_telegram()
+        if not await client_wrapper.start_streaming(config.TARGET_CHAT_ID, queue, parser):
+            return
+
+        tasks.append(asyncio.create_task(_consume_signal_queue(queue, ctx)))
+        tasks.append(asyncio.create_task(_periodic_manage_positions(manage_interval_seconds, ctx)))
+        print(f"Mendengarkan pesan baru dari chat {config.TARGET_CHAT_ID}... (manajemen posisi tiap {manage_interval_seconds} detik)")
+        await client_wrapper.run_until_disconnected(timeout=duration_minutes * 60 if duration_minutes > 0 else None)
+    finally:
+        if client_wrapper: client_wrapper.stop_streaming()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await ctx.close()
+        print("\n--- Mode Stream Dihentikan ---")
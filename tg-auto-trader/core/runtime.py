@@ -0,0 +1,88 @@
+# Auto Trade Bot/core/runtime.py
+from typing import Any, Dict, List, Optional
+
+import config
+from telegram.client import TelegramClientWrapper
+from binance.client import BinanceClient
+from binance.price_cache import get_price_cache
+from binance.user_stream import UserDataStream
+from db.mongo_client import MongoManager
+
+
+class RuntimeContext:
+    """
+    Koneksi yang hidup selama satu sesi autoloop/stream: klien Telegram,
+    MongoManager, klien Binance (publik & bertanda tangan) dan stream latar
+    belakang. Dibuat sekali lalu diteruskan ke setiap rutinitas, sehingga
+    siklus tidak lagi membuka koneksi, auth check dan ping baru.
+    """
+
+    def __init__(self):
+        self._telegram: Optional[TelegramClientWrapper] = None
+        self._mongo: Optional[MongoManager] = None
+        self.client = BinanceClient()
+        self.trading_client: Optional[BinanceClient] = None
+        if config.BINANCE_API_KEY and config.BINANCE_API_SECRET:
+            self.trading_client = BinanceClient(config.BINANCE_API_KEY, config.BINANCE_API_SECRET)
+        self.price_cache = get_price_cache()
+        self.account_stream: Optional[UserDataStream] = None
+        # Jendela sinyal terbaru yang dievaluasi ulang tiap siklus; diisi dari snapshot pada fetch pertama
+        self.signal_window: Optional[List[Dict[str, Any]]] = None
+
+    def start_streams(self):
+        """Menyalakan stream harga dan user data Binance sesuai konfigurasi."""
+        if config.PRICE_STREAM_ENABLED:
+            print("Memulai stream harga mini-ticker di latar belakang...")
+            self.price_cache.start()
+        if config.USER_STREAM_ENABLED and self.trading_client:
+            print("Memulai user data stream (saldo & status order) di latar belakang...")
+            self.account_stream = UserDataStream(self.trading_client)
+            self.account_stream.start()
+
+    async def get_telegram(self) -> TelegramClientWrapper:
+        """Klien Telegram yang sudah terhubung; terhubung ulang jika koneksi sebelumnya putus."""
+        if self._telegram is None:
+            self._telegram = TelegramClientWrapper(config.SESSION_NAME, config.API_ID, config.API_HASH, config.PHONE_NUMBER)
+        if not self._telegram.client.is_connected():
+            await self._telegram.connect()
+        return self._telegram
+
+    @property
+    def mongo(self) -> MongoManager:
+        """MongoManager bersama; dibuat ulang jika koneksi awal gagal."""
+        if self._mongo is None or self._mongo.db is None:
+            if self._mongo is not None:
+                self._mongo.close_connection()
+            self._mongo = MongoManager(config.MONGO_URI, config.MONGO_DB_NAME)
+        return self._mongo
+
+    async def recover(self):
+        """
+        Dipanggil setelah siklus gagal: membuang koneksi Telegram yang putus dan
+        MongoManager yang tidak lagi merespons, agar siklus berikutnya
+        membuatnya ulang.
+        """
+        if self._telegram is not None and not self._telegram.client.is_connected():
+            self._telegram = None
+        if self._mongo is not None and self._mongo.db is not None:
+            try:
+                self._mongo.client.admin.command('ping')
+            except Exception as e:
+                print(f"Koneksi MongoDB tidak merespons ({e}). Akan dibuat ulang pada siklus berikutnya.")
+                self._mongo.close_connection()
+                self._mongo = None
+
+    async def close(self):
+        self.price_cache.stop()
+        if self.account_stream:
+            self.account_stream.stop()
+        if self._telegram is not None and self._telegram.client.is_connected():
+            await self._telegram.disconnect()
+        if self._mongo is not None:
+            self._mongo.close_connection()
+
+    async def __aenter__(self) -> "RuntimeContext":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
@@ -5,6 +5,7 @@ import pandas as pd
 from pathlib import Path
 from datetime import datetime
 from streamlit_autorefresh import st_autorefresh
+from telegram.utils import tail_jsonl
 
 # --- Konfigurasi Halaman Streamlit ---
 st.set_page_config(
@@ -14,11 +15,16 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Jumlah record terakhir yang ditampilkan dari journal .jsonl
+JOURNAL_TAIL_LIMIT = 500
+
 # --- Fungsi Helper untuk Memuat Data ---
 def load_json_data(file_path: Path):
-    """Memuat data dari file JSON dengan penanganan error."""
+    """Memuat data dari file JSON (atau record terakhir dari journal .jsonl) dengan penanganan error."""
     if file_path.exists():
         try:
+            if file_path.suffix == ".jsonl":
+                return tail_jsonl(str(file_path), JOURNAL_TAIL_LIMIT) or None
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
                 if not content:
@@ -39,7 +45,8 @@ TRADE_DECISIONS_FILE = DATA_DIR / "trade_decisions.json"
 NEW_SIGNALS_FILE = DATA_DIR / "new_signals.json"
 SIGNAL_UPDATES_FILE = DATA_DIR / "signal_updates.json"
 MARKET_ALERTS_FILE = DATA_DIR / "market_alerts.json"
-PARSED_MESSAGES_FILE = DATA_DIR / "parsed_messages.json"
+PARSED_MESSAGES_FILE = DATA_DIR / "parsed_messages.jsonl"
+TRADE_LOG_FILE = DATA_DIR / "trade_log.jsonl"
 
 ALL_JSON_FILES = {
     "Status Akun": ACCOUNT_STATUS_FILE,
@@ -48,6 +55,7 @@ ALL_JSON_FILES = {
     "Pembaruan Sinyal": SIGNAL_UPDATES_FILE,
     "Peringatan Pasar": MARKET_ALERTS_FILE,
     "Semua Pesan Ter-parse": PARSED_MESSAGES_FILE,
+    "Log Eksekusi Trade": TRADE_LOG_FILE,
 }
 
 # --- Sidebar dan Auto-Refresh ---
@@ -1,7 +1,10 @@
 # Auto Trade Bot/db/mongo_client.py
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure
+import json
+import hashlib
+from pymongo import MongoClient, ReplaceOne
+from pymongo.errors import ConnectionFailure, BulkWriteError
 from typing import List, Dict, Any, Optional
+from datetime import datetime, timezone
 
 class MongoManager:
     """Mengelola koneksi dan operasi ke database MongoDB."""
@@ -25,39 +28,113 @@ class MongoManager:
         
         return self.db.new_signals.find_one({'_id': coin_pair})
 
-    def save_new_signals(self, signals: List[Dict[str, Any]]):
+    @staticmethod
+    def signal_content_hash(signal: Dict[str, Any]) -> str:
+        """Hash stabil isi sinyal (tanpa _id & content_hash) untuk mendeteksi perubahan."""
+        content = {key: value for key, value in signal.items() if key not in ('_id', 'content_hash')}
+        return hashlib.sha1(json.dumps(content, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+    # Field sinyal yang dibutuhkan manajemen posisi & pemindaian swap
+    MANAGEMENT_PROJECTION = {'targets': 1, 'stop_losses': 1, 'risk_level': 1}
+
+    def get_signals_by_pairs(self, coin_pairs: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Mengambil data sinyal untuk banyak coin_pair dalam satu query `$in`,
+        hanya dengan field MANAGEMENT_PROJECTION. Mengembalikan dict coin_pair -> sinyal;
+        pair tanpa sinyal tidak ada di hasil.
+        """
+        if self.db is None or not coin_pairs:
+            return {}
+        cursor = self.db.new_signals.find({'_id': {'$in': list(dict.fromkeys(coin_pairs))}}, self.MANAGEMENT_PROJECTION)
+        return {doc['_id']: doc for doc in cursor}
+
+    def save_new_signals(self, signals: List[Dict[str, Any]]) -> Dict[str, int]:
         """
         Menyimpan atau memperbarui sinyal baru ke koleksi 'new_signals'.
-        Menggunakan 'coin_pair' sebagai _id untuk operasi upsert.
+        Menggunakan 'coin_pair' sebagai _id. Sinyal yang isinya sama dengan
+        dokumen di DB (dibandingkan lewat content_hash) dilewati; sisanya dikirim
+        dalam satu bulk_write tidak berurutan.
+        Mengembalikan jumlah sinyal baru, diperbarui, dan dilewati.
         """
+        counts = {"inserted": 0, "modified": 0, "skipped": 0}
         if self.db is None or not signals:
             if not signals:
                 print("Tidak ada sinyal baru untuk disimpan ke MongoDB.")
             elif self.db is None:
                 print("Tidak dapat menyimpan sinyal karena koneksi DB tidak ada.")
-            return
+            return counts
 
         collection = self.db.new_signals
-        
-        upserted_count = 0
-        modified_count = 0
 
+        # Satu dokumen per coin_pair: sinyal terbaru (message_id terbesar) yang disimpan
+        latest_by_pair: Dict[str, Dict[str, Any]] = {}
         for signal in signals:
             coin_pair = signal.get("coin_pair")
             if not coin_pair:
                 continue
+            current = latest_by_pair.get(coin_pair)
+            if current is None or (signal.get("message_id") or 0) >= (current.get("message_id") or 0):
+                latest_by_pair[coin_pair] = signal
+        counts["skipped"] = len(signals) - len(latest_by_pair)
 
-            signal['_id'] = coin_pair
-            filter_query = {'_id': coin_pair}
-            result = collection.replace_one(filter_query, signal, upsert=True)
-            
-            if result.upserted_id:
-                upserted_count += 1
-            elif result.modified_count > 0:
-                modified_count += 1
-        
-        print(f"Proses penyimpanan MongoDB selesai. Sinyal Baru: {upserted_count}, Sinyal Diperbarui: {modified_count}.")
+        documents = {
+            coin_pair: {**signal, '_id': coin_pair, 'content_hash': self.signal_content_hash(signal)}
+            for coin_pair, signal in latest_by_pair.items()
+        }
+        stored_hashes = {
+            doc['_id']: doc.get('content_hash')
+            for doc in collection.find({'_id': {'$in': list(documents)}}, {'content_hash': 1})
+        }
+
+        operations = []
+        for coin_pair, document in documents.items():
+            if stored_hashes.get(coin_pair) == document['content_hash']:
+                counts["skipped"] += 1
+                continue
+            operations.append(ReplaceOne({'_id': coin_pair}, document, upsert=True))
+
+        if operations:
+            result = collection.bulk_write(operations, ordered=False)
+            counts["inserted"] = result.upserted_count
+            counts["modified"] = result.modified_count
 
+        print(f"Proses penyimpanan MongoDB selesai. Sinyal Baru: {counts['inserted']}, Sinyal Diperbarui: {counts['modified']}, Dilewati (tidak berubah): {counts['skipped']}.")
+        return counts
+
+    def insert_telegram_messages(self, messages: List[Dict[str, Any]]) -> int:
+        """
+        Menyisipkan pesan ter-parse ke koleksi 'telegram_messages' secara bulk
+        dengan message_id sebagai _id. Pesan yang sudah ada dilewati, sehingga
+        aman diulang saat backfill dilanjutkan. Mengembalikan jumlah yang disisipkan.
+        """
+        if self.db is None or not messages:
+            return 0
+        documents = [{**message, '_id': message['message_id']} for message in messages if message.get('message_id') is not None]
+        try:
+            return len(self.db.telegram_messages.insert_many(documents, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            duplicates = sum(1 for error in e.details.get('writeErrors', []) if error.get('code') == 11000)
+            if duplicates != len(e.details.get('writeErrors', [])):
+                raise
+            return e.details.get('nInserted', 0)
+
+    def get_telegram_watermark(self, chat_id: int) -> Optional[int]:
+        """Mengambil ID pesan Telegram terakhir yang sudah diproses untuk chat tertentu."""
+        if self.db is None:
+            return None
+        state = self.db.bot_state.find_one({'_id': f"telegram_watermark:{chat_id}"})
+        return state.get('last_message_id') if state else None
+
+    def save_telegram_watermark(self, chat_id: int, message_id: int):
+        """Menyimpan ID pesan Telegram terakhir yang sudah diproses. Watermark tidak pernah mundur."""
+        if self.db is None:
+            print("Tidak dapat menyimpan watermark Telegram karena koneksi DB tidak ada.")
+            return
+        self.db.bot_state.update_one(
+            {'_id': f"telegram_watermark:{chat_id}"},
+            {'$max': {'last_message_id': message_id}, '$set': {'updated_at': datetime.now(timezone.utc)}},
+            upsert=True
+        )
 
     def close_connection(self):
         """Menutup koneksi ke database."""
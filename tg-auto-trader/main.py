@@ -2,13 +2,16 @@
 import argparse
 import asyncio
 import os
+from datetime import datetime, timezone
+from core.backfill import run_backfill_routine
 from core.routines import (
     run_fetch_routine,
     run_decide_routine,
     run_execute_routine,
     run_status_routine,
     run_autoloop_routine,
-    run_manage_positions_routine
+    run_manage_positions_routine,
+    run_stream_routine
 )
 
 async def main():
@@ -20,7 +23,7 @@ async def main():
 
     parser.add_argument(
         'action',
-        choices=['fetch', 'decide', 'execute', 'status', 'run-all', 'autoloop', 'manage'],
+        choices=['fetch', 'decide', 'execute', 'status', 'run-all', 'autoloop', 'manage', 'stream', 'backfill'],
         help="""Pilih aksi yang ingin dijalankan:
 'fetch'    : Mengambil pesan baru dari Telegram.
 'decide'   : Membuat keputusan trading dari sinyal yang ada.
@@ -28,14 +31,20 @@ async def main():
 'status'   : Memeriksa status akun Binance dan transaksi berjalan.
 'manage'   : Menjalankan rutinitas manajemen posisi (trailing SL) satu kali.
 'run-all'  : Menjalankan 'fetch' > 'decide' > 'execute' satu kali.
-'autoloop' : Menjalankan bot secara otomatis dalam siklus berulang.
+'autoloop' : Menjalankan bot secara otomatis (fetch/keputusan/eksekusi & manajemen posisi dengan jadwal masing-masing).
+'stream'   : Mendengarkan sinyal Telegram secara real-time dan langsung memprosesnya.
+'backfill' : Mengambil seluruh riwayat channel ke data/backfill_messages.jsonl & MongoDB (bisa dilanjutkan).
 """
     )
     # Argumen Tambahan untuk Kustomisasi
     parser.add_argument('-l', '--limit', type=int, default=50, help="Jumlah pesan yang di-fetch per siklus (default: 50).")
     parser.add_argument('--initial-limit', type=int, default=100, help="Jumlah pesan yang di-fetch pada siklus pertama kali (default: 100).") # <-- BARU
-    parser.add_argument('-d', '--duration', type=int, default=0, help="Durasi (menit) untuk mode 'autoloop'. Set 0 untuk berjalan selamanya (default: selamanya).")
-    parser.add_argument('--delay', type=int, default=300, help="Jeda waktu (detik) antar siklus di mode 'autoloop' (default: 300).")
+    parser.add_argument('-d', '--duration', type=int, default=0, help="Durasi (menit) untuk mode 'autoloop'/'stream'. Set 0 untuk berjalan selamanya (default: selamanya).")
+    parser.add_argument('--delay', type=int, default=300, help="Jeda waktu (detik) antar fetch di mode 'autoloop', atau antar manajemen posisi di mode 'stream' (default: 300).")
+    parser.add_argument('--manage-interval', type=int, default=None, help="Jeda waktu (detik) antar manajemen posisi di mode 'autoloop' (default: MANAGE_INTERVAL_SECONDS, 15).")
+    parser.add_argument('--chunk-size', type=int, default=500, help="Jumlah pesan per potongan di mode 'backfill' (default: 500).")
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses parser di mode 'backfill' (default: jumlah CPU).")
+    parser.add_argument('--since', type=lambda value: datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc), default=None, help="Tanggal awal (YYYY-MM-DD) untuk backfill pertama kali (default: dari pesan pertama).")
     
     args = parser.parse_args()
     
@@ -53,17 +62,22 @@ async def main():
         await run_manage_positions_routine()
     elif args.action == 'run-all':
         print("=== Memulai Alur Kerja Lengkap (run-all) ===")
-        parsed_data = await run_fetch_routine(message_limit=args.limit)
-        decisions = run_decide_routine(parsed_data=parsed_data)
-        run_execute_routine(decisions_data=decisions)
+        fetch_result = await run_fetch_routine(message_limit=args.limit)
+        decisions = run_decide_routine(fetch_result=fetch_result)
+        run_execute_routine(decisions=decisions)
         print("\n=== Alur Kerja Lengkap Selesai ===")
     elif args.action == 'autoloop':
         await run_autoloop_routine(
             duration_minutes=args.duration,
             message_limit=args.limit,
             cycle_delay_seconds=args.delay,
-            initial_fetch_limit=args.initial_limit # <-- BARU
+            initial_fetch_limit=args.initial_limit, # <-- BARU
+            manage_interval_seconds=args.manage_interval
         )
+    elif args.action == 'stream':
+        await run_stream_routine(duration_minutes=args.duration, manage_interval_seconds=args.delay)
+    elif args.action == 'backfill':
+        await run_backfill_routine(chunk_size=args.chunk_size, workers=args.workers, since=args.since)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
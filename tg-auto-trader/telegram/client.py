@@ -1,14 +1,26 @@
 # telegram/client.py
-from telethon import TelegramClient
+import time
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, List, NamedTuple, Optional
+from telethon import TelegramClient, events
 from telethon.tl.types import PeerChannel
 from telethon.errors import ChatAdminRequiredError, ChannelPrivateError, UserNotParticipantError
 
+class StreamedMessage(NamedTuple):
+    """Pesan yang diterima secara real-time dan sudah di-parse."""
+    message: Any
+    is_edit: bool
+    received_at: float
+
+
 class TelegramClientWrapper:
     """Wrapper untuk klien Telethon untuk menangani koneksi dan pengambilan pesan."""
 
     def __init__(self, session_name: str, api_id: int, api_hash: str, phone_number: str):
         self.client = TelegramClient(session_name, api_id, api_hash, system_version="4.16.30-vxCUSTOM")
         self.phone_number = phone_number
+        self._stream_handlers = []
 
     async def connect(self):
         """Menghubungkan ke Telegram dan menangani otorisasi."""
@@ -27,14 +39,82 @@ class TelegramClientWrapper:
         """Memutuskan koneksi klien."""
         await self.client.disconnect()
 
-    async def fetch_historical_messages(self, chat_id: int, limit: int = 10):
-        """Mengambil pesan historis dari chat tertentu."""
+    async def _get_entity(self, chat_id: int):
+        return await self.client.get_entity(PeerChannel(abs(chat_id))) if chat_id < 0 else await self.client.get_entity(chat_id)
+
+    async def fetch_historical_messages(self, chat_id: int, limit: int = 10, min_id: int = 0):
+        """
+        Mengambil pesan historis dari chat tertentu (terbaru lebih dulu).
+        Jika `min_id` diisi, hanya pesan dengan ID lebih besar yang diambil.
+        """
         try:
-            entity = await self.client.get_entity(PeerChannel(abs(chat_id))) if chat_id < 0 else await self.client.get_entity(chat_id)
-            messages = await self.client.get_messages(entity, limit=limit)
+            entity = await self._get_entity(chat_id)
+            messages = await self.client.get_messages(entity, limit=limit, min_id=min_id)
             return messages
         except (ChatAdminRequiredError, ChannelPrivateError, UserNotParticipantError) as e:
             print(f"Tidak dapat mengakses chat {chat_id}. Masalah izin atau channel pribadi: {e}")
         except Exception as e:
             print(f"Error saat mengambil pesan historis dari {chat_id}: {e}")
-        return []
\ No newline at end of file
+        return []
+
+    async def iter_message_chunks(self, chat_id: int, chunk_size: int = 500, min_id: int = 0, offset_date: Optional[datetime] = None) -> AsyncIterator[List[Any]]:
+        """
+        Menelusuri riwayat chat dari pesan terlama ke terbaru (setelah `min_id`
+        atau `offset_date`) dan menghasilkan pesan per potongan `chunk_size`.
+        """
+        try:
+            entity = await self._get_entity(chat_id)
+        except (ChatAdminRequiredError, ChannelPrivateError, UserNotParticipantError) as e:
+            print(f"Tidak dapat mengakses chat {chat_id}. Masalah izin atau channel pribadi: {e}")
+            return
+
+        chunk = []
+        async for message in self.client.iter_messages(entity, reverse=True, min_id=min_id, offset_date=offset_date):
+            chunk.append(message)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    async def start_streaming(self, chat_id: int, queue: asyncio.Queue, parser) -> bool:
+        """
+        Mendaftarkan handler `NewMessage` dan `MessageEdited` untuk chat tertentu.
+        Setiap pesan di-parse dengan `parser` lalu dimasukkan ke `queue` sebagai
+        StreamedMessage, selama klien tetap terhubung.
+        """
+        try:
+            entity = await self._get_entity(chat_id)
+        except (ChatAdminRequiredError, ChannelPrivateError, UserNotParticipantError) as e:
+            print(f"Tidak dapat mengakses chat {chat_id}. Masalah izin atau channel pribadi: {e}")
+            return False
+        except Exception as e:
+            print(f"Error saat menyiapkan stream pesan dari {chat_id}: {e}")
+            return False
+
+        async def _on_message(event):
+            try:
+                parsed = parser.parse_message(event.message)
+            except Exception as e:
+                print(f"Gagal mem-parsing pesan {getattr(event.message, 'id', None)}: {e}")
+                return
+            await queue.put(StreamedMessage(parsed, isinstance(event, events.MessageEdited.Event), time.monotonic()))
+
+        self.stop_streaming()
+        for event_builder in (events.NewMessage(chats=entity), events.MessageEdited(chats=entity)):
+            self.client.add_event_handler(_on_message, event_builder)
+            self._stream_handlers.append((_on_message, event_builder))
+        return True
+
+    def stop_streaming(self):
+        """Melepas handler yang didaftarkan oleh `start_streaming`."""
+        for callback, event_builder in self._stream_handlers:
+            self.client.remove_event_handler(callback, event_builder)
+        self._stream_handlers.clear()
+
+    async def run_until_disconnected(self, timeout: Optional[float] = None):
+        """Menjaga koneksi (dan handler stream) tetap hidup hingga terputus atau `timeout` detik."""
+        try:
+            await asyncio.wait_for(asyncio.shield(self.client.disconnected), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
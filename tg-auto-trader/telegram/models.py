@@ -1,9 +1,11 @@
 # telegram/models.py
-from dataclasses import dataclass, field, asdict
+from dataclasses import field
 from typing import List, Optional, Any, Dict
 from datetime import datetime
 
-@dataclass
+from binance.codec import model
+
+@model
 class BaseMessage:
     """Kelas dasar untuk semua tipe pesan."""
     raw_text: str
@@ -11,27 +13,21 @@ class BaseMessage:
     sender_id: Optional[int] = None
     message_id: Optional[int] = None
 
-    def to_dict(self):
-        """Mengonversi dataclass menjadi dictionary."""
-        d = asdict(self)
-        d['timestamp'] = self.timestamp.isoformat()
-        return d
-
-@dataclass
+@model
 class TargetInfo:
     level: int
     price: float
     percentage_change: Optional[float] = None
     status: Optional[str] = None
 
-@dataclass
+@model
 class StopLossInfo:
     level: int
     price: float
     percentage_change: Optional[float] = None
     status: Optional[str] = None
 
-@dataclass
+@model
 class SignalUpdate(BaseMessage):
     """Mewakili pembaruan pada sinyal yang ada."""
     coin_pair: str = ""
@@ -40,7 +36,7 @@ class SignalUpdate(BaseMessage):
     update_type: str = ""
     message_type: str = "SignalUpdate"
 
-@dataclass
+@model
 class NewSignal(BaseMessage):
     """Mewakili sinyal trading baru."""
     coin_pair: str = ""
@@ -53,7 +49,7 @@ class NewSignal(BaseMessage):
     data_analysis_link: Optional[str] = None
     message_type: str = "NewSignal"
 
-@dataclass
+@model
 class MarketAlert(BaseMessage):
     """Mewakili pesan peringatan pasar."""
     coin: str = ""
@@ -62,7 +58,7 @@ class MarketAlert(BaseMessage):
     alert_message: str = ""
     message_type: str = "MarketAlert"
 
-@dataclass
+@model
 class DailyRecap(BaseMessage):
     """Mewakili rangkuman harian sinyal trading."""
     date_range: Optional[str] = None
@@ -74,7 +70,7 @@ class DailyRecap(BaseMessage):
     total_stop_losses: Optional[int] = None
     message_type: str = "DailyRecap"
 
-@dataclass
+@model
 class UnstructuredMessage(BaseMessage):
     """Mewakili pesan yang tidak cocok dengan model lain."""
     content: str = ""
@@ -8,12 +8,54 @@ from .models import (
     TargetInfo, StopLossInfo, BaseMessage, DailyRecap
 )
 
+# --- Pola yang dikompilasi sekali saat modul dimuat ---
+NEW_SIGNAL_ALERT_HEADER = "🆕 NEW SIGNAL 🆕"
+NEW_SIGNAL_HEADER_RE = re.compile(r"🆕\s*NEW SIGNAL:\s*([A-Z0-9]+USDT)\s*🆕")
+SIGNAL_UPDATE_HEADER_RE = re.compile(r"(✅|🔴)\s*SIGNAL UPDATE:\s*([A-Z0-9]+USDT)\s*(✅|🔴)")
+MARKET_ALERT_HEADER_RE = re.compile(r"⚡⚡⚡\s*([A-Z]+)\s*price\s*(?:increased|decreased)\s*([+-]?[\d.]+)%\s*in the last\s*(\d+)\s*minutes")
+NEW_SIGNAL_ALERT_BODY_RE = re.compile(r"(?:❗❗❗|⚡⚡⚡)\s*([A-Z]+)\s*price\s*(?:amplitude is|decreased)\s*([+-]?[\d.]+)%\s*in the last\s*(\d+)\s*minutes")
+
+RISK_RANK_RE = re.compile(r"Volume\(24H\) Ranked:\s*(\S+)")
+RISK_LEVEL_RE = re.compile(r"Risk Level:\s*(?:🟢|⚠️)\s*(\w+)")
+ENTRY_RE = re.compile(r"Entry:\s*([\d.]+)")
+# Pola level dijalankan sekali (finditer) atas blok teks; [^\S\n] = spasi tanpa pindah baris
+NEW_SIGNAL_LEVEL_RE = re.compile(r"(Target|Stop Loss)[^\S\n]+(\d+)[^\S\n]+([\d.]+)[^\S\n]+([+-]?[\d.]+)%")
+# Akhiran terikat pada cabangnya: target hanya "HIT!", stop loss hanya "TRIGGERED!"
+UPDATE_LEVEL_RE = re.compile(
+    r"🎯[^\S\n]*Target[^\S\n]*(\d+)[^\S\n]*\((\d+\.?\d*)\)[^\S\n]*HIT!"
+    r"|⚠️[^\S\n]*Stop Loss[^\S\n]*(\d+)[^\S\n]*\((\d+\.?\d*)\)[^\S\n]*TRIGGERED!"
+)
+
+RECAP_DATE_RANGE_RE = re.compile(r"(\d{2}/\d{2}-\d{2}/\d{2})")
+# Satu pola per baris rekap: grup 1 = level target, grup 2/3 = penanda running/stop loss
+RECAP_LINE_RE = re.compile(r"(?:✅ Hitted target ([1-4]):|(➡️) Running:|(🛑) Hitted stop loss:)\s*(.*)")
+RECAP_TOTAL_SIGNALS_RE = re.compile(r"Total Signals:\s*(\d+)")
+RECAP_TOTAL_TP_RE = re.compile(r"Hitted Take-Profits:\s*(\d+)")
+RECAP_TOTAL_SL_RE = re.compile(r"Hitted Stop-Losses:\s*(\d+)")
+
+SOURCE_RE = re.compile(r"Source:\s*(.*)", re.IGNORECASE)
+
+
+def _split_coins(value: str) -> List[str]:
+    return [coin.strip() for coin in value.split(',')]
+
+
 class TelegramMessageParser:
     """Menganalisis objek pesan Telethon dan mengembalikannya sebagai model data terstruktur."""
 
+    def __init__(self):
+        # Karakter pertama baris pertama -> parser yang relevan (dicoba berurutan)
+        self._dispatch = {
+            "🆕": (self._try_parse_new_signal_alert, self._try_parse_new_signal),
+            "✅": (self._try_parse_signal_update,),
+            "🔴": (self._try_parse_signal_update,),
+            "⚡": (self._try_parse_market_alert,),
+        }
+
     def _extract_common_attributes(self, message_obj: Any) -> dict:
+        date = getattr(message_obj, 'date', None)
         return {
-            "timestamp": getattr(message_obj, 'date', datetime.now()),
+            "timestamp": date if date is not None else datetime.now(),
             "sender_id": getattr(message_obj, 'sender_id', None),
             "message_id": getattr(message_obj, 'id', None),
             "raw_text": getattr(message_obj, 'raw_text', ''),
@@ -34,82 +76,68 @@ class TelegramMessageParser:
         lines = text.splitlines()
         first_line = lines[0].strip() if lines else ""
 
-        parsers = [
-            self._try_parse_daily_recap,
-            self._try_parse_new_signal_alert,
-            self._try_parse_new_signal,
-            self._try_parse_signal_update,
-            self._try_parse_market_alert
-        ]
-        for parser_func in parsers:
+        if "DAILY RECAP" in first_line:
+            return self._parse_daily_recap(first_line, text, lines, common_attrs)
+
+        for parser_func in self._dispatch.get(first_line[:1], ()):
             if parsed_message := parser_func(first_line, text, lines, common_attrs):
                 return parsed_message
 
-        source_match = re.search(r"Source:\s*(.*)", text, re.IGNORECASE)
+        source_match = SOURCE_RE.search(text)
         source = source_match.group(1).strip() if source_match else None
         return UnstructuredMessage(**common_attrs, content=text, original_sender=source)
 
-    # --- METODE HELPER YANG HILANG DITAMBAHKAN KEMBALI ---
+    # --- METODE HELPER ---
     def _parse_targets_and_sl_from_update(self, lines: List[str]) -> Tuple[List[TargetInfo], List[StopLossInfo]]:
         """Mem-parsing target dan stop-loss dari pesan pembaruan sinyal."""
         targets, stop_losses = [], []
-        target_pattern = re.compile(r"🎯\s*Target\s*(\d+)\s*\((\d+\.?\d*)\)\s*HIT!")
-        sl_pattern = re.compile(r"⚠️\s*Stop Loss\s*(\d+)\s*\((\d+\.?\d*)\)\s*TRIGGERED!")
-        for line in lines:
-            if t_match := target_pattern.search(line):
-                targets.append(TargetInfo(level=int(t_match.group(1)), price=float(t_match.group(2)), status="HIT"))
-            if sl_match := sl_pattern.search(line):
-                stop_losses.append(StopLossInfo(level=int(sl_match.group(1)), price=float(sl_match.group(2)), status="TRIGGERED"))
+        for target_level, target_price, sl_level, sl_price in UPDATE_LEVEL_RE.findall("\n".join(lines)):
+            if target_level:
+                targets.append(TargetInfo(level=int(target_level), price=float(target_price), status="HIT"))
+            else:
+                stop_losses.append(StopLossInfo(level=int(sl_level), price=float(sl_price), status="TRIGGERED"))
         return targets, stop_losses
 
     def _parse_targets_and_sl_from_new_signal(self, lines: List[str]) -> Tuple[List[TargetInfo], List[StopLossInfo]]:
         """Mem-parsing target dan stop-loss dari pesan sinyal baru."""
         targets, stop_losses = [], []
-        target_pattern = re.compile(r"Target\s+(\d+)\s+([\d.]+)\s+([+-]?[\d.]+)%")
-        sl_pattern = re.compile(r"Stop Loss\s+(\d+)\s+([\d.]+)\s+([+-]?[\d.]+)%")
-        for line in lines:
-            if t_match := target_pattern.search(line):
-                targets.append(TargetInfo(level=int(t_match.group(1)), price=float(t_match.group(2)), percentage_change=float(t_match.group(3))))
-            elif sl_match := sl_pattern.search(line):
-                stop_losses.append(StopLossInfo(level=int(sl_match.group(1)), price=float(sl_match.group(2)), percentage_change=float(sl_match.group(3))))
+        for kind, level, price, percentage in NEW_SIGNAL_LEVEL_RE.findall("\n".join(lines)):
+            if kind == "Target":
+                targets.append(TargetInfo(level=int(level), price=float(price), percentage_change=float(percentage)))
+            else:
+                stop_losses.append(StopLossInfo(level=int(level), price=float(price), percentage_change=float(percentage)))
         return targets, stop_losses
 
     # --- FUNGSI PARSER UTAMA ---
-    def _try_parse_daily_recap(self, first_line, text, lines, common_attrs):
-        if "DAILY RECAP" in first_line:
-            date_range_match = re.search(r'(\d{2}/\d{2}-\d{2}/\d{2})', first_line)
-            recap = DailyRecap(**common_attrs, date_range=date_range_match.group(1) if date_range_match else None)
-            patterns = {
-                "target_1": r"✅ Hitted target 1:\s*(.*)", "target_2": r"✅ Hitted target 2:\s*(.*)",
-                "target_3": r"✅ Hitted target 3:\s*(.*)", "target_4": r"✅ Hitted target 4:\s*(.*)",
-            }
-            for line in lines:
-                for key, pattern in patterns.items():
-                    if match := re.match(pattern, line.strip()):
-                        recap.targets_hit[key] = [coin.strip() for coin in match.group(1).split(',')]
-                        break
-                if match := re.match(r"➡️ Running:\s*(.*)", line.strip()):
-                    recap.running_signals = [coin.strip() for coin in match.group(1).split(',')]
-                elif match := re.match(r"🛑 Hitted stop loss:\s*(.*)", line.strip()):
-                    recap.stop_losses_hit = [coin.strip() for coin in match.group(1).split(',')]
-            if total_match := re.search(r"Total Signals:\s*(\d+)", text): recap.total_signals = int(total_match.group(1))
-            if tp_match := re.search(r"Hitted Take-Profits:\s*(\d+)", text): recap.total_take_profits = int(tp_match.group(1))
-            if sl_match := re.search(r"Hitted Stop-Losses:\s*(\d+)", text): recap.total_stop_losses = int(sl_match.group(1))
-            return recap
-        return None
+    def _parse_daily_recap(self, first_line, text, lines, common_attrs):
+        date_range_match = RECAP_DATE_RANGE_RE.search(first_line)
+        recap = DailyRecap(**common_attrs, date_range=date_range_match.group(1) if date_range_match else None)
+        for line in lines:
+            if not (match := RECAP_LINE_RE.match(line.strip())):
+                continue
+            target_level, running, stop_loss, coins = match.groups()
+            if target_level:
+                recap.targets_hit[f"target_{target_level}"] = _split_coins(coins)
+            elif running:
+                recap.running_signals = _split_coins(coins)
+            elif stop_loss:
+                recap.stop_losses_hit = _split_coins(coins)
+        if total_match := RECAP_TOTAL_SIGNALS_RE.search(text): recap.total_signals = int(total_match.group(1))
+        if tp_match := RECAP_TOTAL_TP_RE.search(text): recap.total_take_profits = int(tp_match.group(1))
+        if sl_match := RECAP_TOTAL_SL_RE.search(text): recap.total_stop_losses = int(sl_match.group(1))
+        return recap
 
     def _try_parse_new_signal_alert(self, first_line, text, lines, common_attrs):
-        if first_line == "🆕 NEW SIGNAL 🆕":
-            pattern = re.compile(r"(?:❗❗❗|⚡⚡⚡)\s*([A-Z]+)\s*price\s*(?:amplitude is|decreased)\s*([+-]?[\d.]+)%\s*in the last\s*(\d+)\s*minutes")
-            if match := pattern.search(text):
+        if first_line == NEW_SIGNAL_ALERT_HEADER:
+            if match := NEW_SIGNAL_ALERT_BODY_RE.search(text):
                 return MarketAlert(**common_attrs, coin=match.group(1), price_change_percentage=float(match.group(2)), timeframe_minutes=int(match.group(3)), alert_message=text.strip())
         return None
 
     def _try_parse_new_signal(self, first_line, text, lines, common_attrs):
-        if match := re.match(r"🆕\s*NEW SIGNAL:\s*([A-Z0-9]+USDT)\s*🆕", first_line):
-            risk_rank = (re.search(r"Volume\(24H\) Ranked:\s*(\S+)", text) or [None, None])[1]
-            risk_level = (re.search(r"Risk Level:\s*(?:🟢|⚠️)\s*(\w+)", text) or [None, None])[1]
-            entry_price = float((re.search(r"Entry:\s*([\d.]+)", text) or [None, 0])[1])
+        if match := NEW_SIGNAL_HEADER_RE.match(first_line):
+            risk_rank = (RISK_RANK_RE.search(text) or [None, None])[1]
+            risk_level = (RISK_LEVEL_RE.search(text) or [None, None])[1]
+            entry_price = float((ENTRY_RE.search(text) or [None, 0])[1])
             signal = NewSignal(**common_attrs, coin_pair=match.group(1), risk_rank=risk_rank, risk_level=risk_level, entry_price=entry_price)
             try:
                 indices = [i for i, line in enumerate(lines) if "---" in line]
@@ -120,12 +148,12 @@ class TelegramMessageParser:
         return None
 
     def _try_parse_signal_update(self, first_line, text, lines, common_attrs):
-        if match := re.match(r"^(✅|🔴)\s*SIGNAL UPDATE:\s*([A-Z0-9]+USDT)\s*(✅|🔴)", first_line):
+        if match := SIGNAL_UPDATE_HEADER_RE.match(first_line):
             targets_hit, sl_triggered = self._parse_targets_and_sl_from_update(lines)
             return SignalUpdate(**common_attrs, coin_pair=match.group(2), targets_hit=targets_hit, stop_losses_triggered=sl_triggered, update_type="TARGET_HIT" if targets_hit else "STOP_LOSS_TRIGGERED")
         return None
 
     def _try_parse_market_alert(self, first_line, text, lines, common_attrs):
-        if match := re.match(r"⚡⚡⚡\s*([A-Z]+)\s*price\s*(?:increased|decreased)\s*([+-]?[\d.]+)%\s*in the last\s*(\d+)\s*minutes", first_line):
-            return MarketAlert(**common_attrs, coin=match.group(1), price_change_percentage=float(match.group(3)), timeframe_minutes=int(match.group(4)), alert_message="\n".join(lines).strip())
-        return None
\ No newline at end of file
+        if match := MARKET_ALERT_HEADER_RE.match(first_line):
+            return MarketAlert(**common_attrs, coin=match.group(1), price_change_percentage=float(match.group(2)), timeframe_minutes=int(match.group(3)), alert_message="\n".join(lines).strip())
+        return None
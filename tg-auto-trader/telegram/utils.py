@@ -1,7 +1,10 @@
 # Auto Trade Bot/telegram/utils.py
 import json
 import os
-from typing import List, Dict, Any
+import time
+import atexit
+import threading
+from typing import List, Dict, Any, Iterable, Optional
 
 class JsonWriter:
     """Menangani penulisan data ke file JSON di dalam direktori tertentu."""
@@ -24,12 +27,220 @@ class JsonWriter:
             print(f"Error saat membuat direktori {self.directory}: {e}")
 
     def write(self, data: any):
-        """Menulis data (list atau dict) ke file JSON."""
+        """
+        Menulis data (list atau dict) ke file JSON. Data ditulis ke file sementara
+        lalu di-rename, sehingga pembaca (mis. dashboard) tidak pernah melihat file setengah jadi.
+        """
+        tmp_path = f"{self.file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
             
             item_count = len(data) if isinstance(data, list) else 1
             print(f"Berhasil menulis {item_count} item ke {self.file_path}")
-        except IOError as e:
-            print(f"Error saat menulis ke file {self.file_path}: {e}")
\ No newline at end of file
+        except (OSError, TypeError, ValueError) as e:
+            # TypeError/ValueError: data tidak bisa diserialisasi ke JSON
+            print(f"Error saat menulis ke file {self.file_path}: {e}")
+        finally:
+            # Setelah os.replace berhasil file sementara sudah tidak ada; selain itu buang sisanya
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+
+class JsonlJournal:
+    """
+    Journal JSON Lines append-only: setiap append hanya menulis record baru
+    (satu baris JSON ringkas per record), sehingga biayanya sebanding dengan
+    jumlah record baru, bukan panjang riwayat. fsync dikumpulkan per
+    `fsync_batch` record atau `fsync_interval` detik, dan file dirotasi ke
+    `<nama>.1`, `<nama>.2`, ... saat melewati `max_bytes`.
+    """
+
+    def __init__(self, file_name: str, directory: str = "data", max_bytes: int = 20 * 1024 * 1024, backup_count: int = 5, fsync_batch: int = 50, fsync_interval: float = 1.0):
+        os.makedirs(directory, exist_ok=True)
+        self.file_path = os.path.join(directory, file_name)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _open(self):
+        if self._file is not None:
+            return
+        self._file = open(self.file_path, 'ab')
+        # Baris terakhir yang terpotong (crash saat menulis) ditutup agar record berikutnya tidak ikut rusak
+        if self._file.tell():
+            with open(self.file_path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write(b"\n")
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _rotate(self):
+        self._sync()
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                older = f"{self.file_path}.{index}"
+                if os.path.exists(older):
+                    os.replace(older, f"{self.file_path}.{index + 1}")
+            os.replace(self.file_path, f"{self.file_path}.1")
+        else:
+            os.remove(self.file_path)
+        self._open()
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Menambahkan record ke akhir journal. Mengembalikan jumlah record yang ditulis."""
+        lines = [json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str) for record in records]
+        if not lines:
+            return 0
+        data = ("\n".join(lines) + "\n").encode('utf-8')
+        with self._lock:
+            self._open()
+            if self._file.tell() and self._file.tell() + len(data) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._unsynced += len(lines)
+            if self._unsynced >= self.fsync_batch or time.monotonic() - self._last_sync >= self.fsync_interval:
+                self._sync()
+        return len(lines)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+
+def _tail_file(file_path: str, limit: int, block_size: int) -> List[Dict[str, Any]]:
+    try:
+        f = open(file_path, 'rb')
+    except FileNotFoundError:
+        return []
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        buffer = b""
+        # Baca mundur per blok sampai ada cukup baris utuh
+        while position > 0 and buffer.count(b"\n") <= limit:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+
+    lines = buffer.split(b"\n")
+    if position > 0:
+        lines = lines[1:]  # baris pertama blok kemungkinan terpotong
+    records = []
+    for line in reversed(lines):
+        if len(records) >= limit:
+            break
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue  # baris yang sedang/gagal ditulis dilewati
+    records.reverse()
+    return records
+
+
+def tail_jsonl(file_path: str, limit: int, block_size: int = 64 * 1024) -> List[Dict[str, Any]]:
+    """
+    Membaca `limit` record terakhir dari journal JSONL (dari lama ke baru) tanpa
+    membaca seluruh file. Jika belum cukup, dilanjutkan ke file rotasi `.1`.
+    """
+    records = _tail_file(file_path, limit, block_size)
+    if len(records) < limit:
+        records = _tail_file(f"{file_path}.1", limit - len(records), block_size) + records
+    return records
+
+
+_journals: Dict[str, JsonlJournal] = {}
+_journals_lock = threading.Lock()
+
+def get_journal(file_name: str, **options) -> JsonlJournal:
+    """Journal bersama per file (satu handle & satu lock per proses); di-fsync dan ditutup saat proses selesai."""
+    with _journals_lock:
+        journal = _journals.get(file_name)
+        if journal is None:
+            journal = _journals[file_name] = JsonlJournal(file_name, **options)
+            atexit.register(journal.close)
+        return journal
+
+
+class SnapshotWriter:
+    """
+    Menulis snapshot JSON di thread latar belakang agar serialisasi dan I/O
+    disk tidak berada di jalur kritis antara sinyal dan order. Jika file yang
+    sama dikirim beberapa kali sebelum sempat ditulis, hanya versi terbaru
+    yang ditulis. Item yang memiliki `to_dict()` dikonversi di thread penulis.
+    """
+
+    def __init__(self, directory: str = "data"):
+        self.directory = directory
+        self._pending: Dict[str, Any] = {}
+        self._writing = False
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, file_name: str, data: Any):
+        with self._condition:
+            self._pending[file_name] = data
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="json-snapshots", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Menunggu sampai semua snapshot yang tertunda selesai ditulis."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                batch, self._pending = self._pending, {}
+                self._writing = True
+            try:
+                # Setiap file ditulis terpisah: satu snapshot gagal tidak membatalkan sisa batch
+                for file_name, data in batch.items():
+                    try:
+                        if isinstance(data, list):
+                            data = [item.to_dict() if hasattr(item, 'to_dict') else item for item in data]
+                        JsonWriter(file_name, self.directory).write(data)
+                    except Exception as e:
+                        print(f"Error saat menulis snapshot {file_name}: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+
+_snapshot_writer: Optional[SnapshotWriter] = None
+
+def get_snapshot_writer() -> SnapshotWriter:
+    """Mengembalikan SnapshotWriter bersama; snapshot tertunda di-flush saat proses selesai."""
+    global _snapshot_writer
+    if _snapshot_writer is None:
+        _snapshot_writer = SnapshotWriter()
+        atexit.register(_snapshot_writer.flush, 10)
+    return _snapshot_writer